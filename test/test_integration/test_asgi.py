@@ -0,0 +1,308 @@
+"""Tests de l'application ASGI et de son serveur."""
+import asyncio
+import json
+import struct
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from requests import HTTPError
+
+from triangulator.asgi import TriangulatorASGI, serve
+from triangulator.serialization import deserialize_triangles, serialize_pointset
+
+POINTSET_ID = '123e4567-e89b-12d3-a456-426614174000'
+
+
+@pytest.fixture
+def asgi_app():
+    """Application ASGI avec un PointSetManager simule et un processus de calcul."""
+    client = Mock()
+    client.get_pointset_payload = AsyncMock()
+    client.close = AsyncMock()
+    application = TriangulatorASGI(client, workers=1)
+    yield application
+    asyncio.run(application.close())
+
+
+def requete(application, path, query=b'', method='GET'):
+    """Passe une requete a l'application ASGI et retourne (statut, en-tetes, corps)."""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query,
+        'headers': [],
+    }
+    asyncio.run(application(scope, receive, send))
+    debut, corps = messages
+    return debut['status'], dict(debut['headers']), corps['body']
+
+
+def test_asgi_triangulate_success(asgi_app):
+    """Meme format binaire que l'application Flask."""
+    asgi_app.pointset_client.get_pointset_payload.return_value = serialize_pointset(
+        [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.5, 0.4)])
+
+    statut, entetes, corps = requete(asgi_app, f'/triangulation/{POINTSET_ID}')
+
+    assert statut == 200
+    assert entetes[b'content-type'] == b'application/octet-stream'
+    assert int(entetes[b'content-length']) == len(corps)
+    sommets, triangles = deserialize_triangles(corps)
+    assert len(sommets) == 4
+    assert len(triangles) == 3
+
+
+def test_asgi_cache_hit(asgi_app):
+    """Le second appel est servi par le cache."""
+    asgi_app.pointset_client.get_pointset_payload.return_value = serialize_pointset(
+        [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+
+    premier = requete(asgi_app, f'/triangulation/{POINTSET_ID}')
+    second = requete(asgi_app, f'/triangulation/{POINTSET_ID}')
+
+    assert premier[1][b'x-cache'] == b'MISS'
+    assert second[1][b'x-cache'] == b'HIT'
+    assert second[2] == premier[2]
+    assert asgi_app.pointset_client.get_pointset_payload.await_count == 1
+
+
+@pytest.mark.parametrize("path, query, statut, code", [
+    ('/triangulation/invalid-id', b'', 400, 'INVALID_ID'),
+    (f'/triangulation/{POINTSET_ID}', b'method=bogus', 400, 'INVALID_METHOD'),
+    ('/triangulation/', b'', 404, 'NOT_FOUND'),
+    ('/inconnu', b'', 404, 'NOT_FOUND'),
+])
+def test_asgi_request_errors(asgi_app, path, query, statut, code):
+    """Memes codes d'erreur que l'application Flask pour les requetes invalides."""
+    reponse = requete(asgi_app, path, query)
+
+    assert reponse[0] == statut
+    assert json.loads(reponse[2])['code'] == code
+
+
+@pytest.mark.parametrize("points, statut, code", [
+    ([(0.0, 0.0), (1.0, 0.0)], 400, 'INSUFFICIENT_POINTS'),
+    ([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)], 500, 'TRIANGULATION_FAILED'),
+])
+def test_asgi_triangulation_errors(asgi_app, points, statut, code):
+    """Les erreurs levees dans le processus de calcul sont transmises avec leur code."""
+    asgi_app.pointset_client.get_pointset_payload.return_value = serialize_pointset(
+        points
+    )
+
+    reponse = requete(asgi_app, f'/triangulation/{POINTSET_ID}')
+
+    assert reponse[0] == statut
+    assert json.loads(reponse[2])['code'] == code
+
+
+def test_asgi_invalid_data(asgi_app):
+    """Un PointSet corrompu donne INVALID_DATA."""
+    asgi_app.pointset_client.get_pointset_payload.return_value = (
+        struct.pack('<I', 5) + b'corrupted'
+    )
+
+    reponse = requete(asgi_app, f'/triangulation/{POINTSET_ID}')
+
+    assert reponse[0] == 500
+    assert json.loads(reponse[2])['code'] == 'INVALID_DATA'
+
+
+@pytest.mark.parametrize("status_code, statut, code", [
+    (404, 404, 'NOT_FOUND'),
+    (400, 400, 'BAD_REQUEST'),
+    (None, 503, 'SERVICE_UNAVAILABLE'),
+])
+def test_asgi_pointset_manager_errors(asgi_app, status_code, statut, code):
+    """Les erreurs du PointSetManager sont traduites comme dans l'application Flask."""
+    response = None
+    if status_code is not None:
+        response = Mock()
+        response.status_code = status_code
+    asgi_app.pointset_client.get_pointset_payload.side_effect = HTTPError(
+        "erreur", response=response
+    )
+
+    reponse = requete(asgi_app, f'/triangulation/{POINTSET_ID}')
+
+    assert reponse[0] == statut
+    assert json.loads(reponse[2])['code'] == code
+
+
+def test_asgi_single_flight(asgi_app):
+    """Les requetes simultanees pour un meme identifiant partagent un seul calcul."""
+    async def lecture_lente(pointset_id):
+        await asyncio.sleep(0.05)
+        return serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+
+    asgi_app.pointset_client.get_pointset_payload.side_effect = lecture_lente
+
+    async def simultanees():
+        return await asyncio.gather(
+            *(asgi_app.get_triangulation(POINTSET_ID, 'incremental') for _ in range(10))
+        )
+
+    resultats = asyncio.run(simultanees())
+
+    assert len({corps for corps, _ in resultats}) == 1
+    assert asgi_app.pointset_client.get_pointset_payload.await_count == 1
+    assert asgi_app.stats() == {'calls': 10, 'shared': 9, 'in_flight': 0}
+
+
+def test_asgi_etag_not_modified(asgi_app):
+    """Memes ETags que l'application Flask : If-None-Match donne 304 sans appel."""
+    asgi_app.pointset_client.get_pointset_payload.return_value = serialize_pointset(
+        [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+
+    statut, entetes, _ = requete(asgi_app, f'/triangulation/{POINTSET_ID}')
+    etag = entetes[b'etag']
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': f'/triangulation/{POINTSET_ID}',
+        'query_string': b'',
+        'headers': [(b'if-none-match', etag)],
+    }
+    asyncio.run(asgi_app(scope, receive, send))
+
+    assert statut == 200
+    assert messages[0]['status'] == 304
+    assert dict(messages[0]['headers'])[b'etag'] == etag
+    assert messages[1]['body'] == b''
+    assert asgi_app.pointset_client.get_pointset_payload.await_count == 1
+
+
+def test_asgi_erreur_apres_debut_de_reponse(asgi_app):
+    """Une erreur apres http.response.start n'envoie pas un second debut de reponse."""
+    async def reponse_interrompue(scope, send):
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        raise RuntimeError("coupure")
+
+    asgi_app._http = reponse_interrompue
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': f'/triangulation/{POINTSET_ID}',
+        'query_string': b'',
+        'headers': [],
+    }
+    with pytest.raises(RuntimeError):
+        asyncio.run(asgi_app(scope, receive, send))
+    assert [message['type'] for message in messages] == ['http.response.start']
+
+
+async def application_echo(scope, receive, send):
+    """Application ASGI qui renvoie le chemin decode.
+
+    Pour /erreur, elle echoue apres le debut de sa reponse.
+    """
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            await send({'type': message['type'] + '.complete'})
+            if message['type'] == 'lifespan.shutdown':
+                return
+    corps = scope['path'].encode()
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': [(b'content-length', str(len(corps)).encode())]})
+    if scope['path'] == '/erreur':
+        raise RuntimeError("coupure")
+    await send({'type': 'http.response.body', 'body': corps})
+
+
+def avec_serveur_asgi(scenario):
+    """Lance serve(application_echo) sur un port libre, puis execute scenario(port)."""
+    async def principal():
+        pret = asyncio.get_running_loop().create_future()
+        tache = asyncio.ensure_future(
+            serve(application_echo, port=0, started=pret.set_result)
+        )
+        port = await pret
+        try:
+            return await scenario(port)
+        finally:
+            tache.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await tache
+
+    return asyncio.run(principal())
+
+
+async def echanger(port, requete_brute):
+    """Envoie une requete brute et lit tout jusqu'a la fermeture de la connexion."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(requete_brute)
+    await writer.drain()
+    reponse = await reader.read()
+    writer.close()
+    return reponse
+
+
+def test_serve_chemin_decode():
+    """Le chemin est passe decode a l'application, raw_path garde la forme recue."""
+    async def scenario(port):
+        return await echanger(
+            port, b'GET /triangulation/a%20b HTTP/1.1\r\nConnection: close\r\n\r\n'
+        )
+
+    reponse = avec_serveur_asgi(scenario)
+
+    assert reponse.startswith(b'HTTP/1.1 200')
+    assert reponse.endswith(b'\r\n\r\n/triangulation/a b')
+
+
+@pytest.mark.parametrize("requete_brute", [
+    b'GARBAGE\r\n\r\n',
+    b'GET /a b HTTP/1.1\r\n\r\n',
+    b'POST / HTTP/1.1\r\nContent-Length: abc\r\n\r\n',
+])
+def test_serve_requete_mal_formee(requete_brute):
+    """Une requete illisible recoit 400 et la connexion est fermee.
+
+    Le serveur continue de repondre.
+    """
+    async def scenario(port):
+        return [await echanger(port, requete_brute),
+                await echanger(port, b'GET /ok HTTP/1.1\r\nConnection: close\r\n\r\n')]
+
+    mal_formee, suivante = avec_serveur_asgi(scenario)
+
+    assert mal_formee.startswith(b'HTTP/1.1 400')
+    assert suivante.endswith(b'/ok')
+
+
+def test_serve_erreur_apres_debut_de_reponse():
+    """Si l'application echoue en cours de reponse, la connexion est coupee."""
+    async def scenario(port):
+        return [await echanger(port, b'GET /erreur HTTP/1.1\r\n\r\n'),
+                await echanger(port, b'GET /ok HTTP/1.1\r\nConnection: close\r\n\r\n')]
+
+    erreur, suivante = avec_serveur_asgi(scenario)
+
+    assert erreur.count(b'HTTP/1.1') == 1
+    assert suivante.endswith(b'/ok')
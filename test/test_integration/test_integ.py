@@ -1,11 +1,37 @@
-import pytest
+import math
 import struct
+import threading
+import time
+import zlib
+
 # import unittest
 from unittest.mock import Mock, patch
-from triangulator.app import app
-# from triangulator.serialization import serialize_pointset
+
+import pytest
 from requests import HTTPError
 
+from triangulator.algorithm import triangulate
+from triangulator.app import (
+    _triangulation_result,
+    app,
+    compute_triangulation,
+    triangulation_cache,
+    triangulation_flights,
+    triangulation_jobs,
+    triangulation_locators,
+)
+from triangulator.serialization import (
+    VORONOI_INFINITY,
+    apply_delta,
+    compress_pointset,
+    decompress_triangles,
+    deserialize_batch,
+    deserialize_delta,
+    deserialize_locations,
+    deserialize_triangles,
+    deserialize_voronoi,
+    serialize_pointset,
+)
 
 
 @pytest.fixture
@@ -13,16 +39,20 @@ def client():
     """Create test client."""
     app.config['TESTING'] = True
     app.config["PROPAGATE_EXCEPTIONS"] = False
+    triangulation_cache.clear()
+    triangulation_flights.clear()
+    triangulation_locators.clear()
     with app.test_client() as client:
         yield client
+    triangulation_jobs.clear()
 
 
 def test_api_triangulate_success(client):
     """Test requete triangulation avec succes"""
     points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
     
-    with patch('triangulator.app.pointset_client.get_pointset') as mock_get:
-        mock_get.return_value = points
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
         
         response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
         
@@ -49,7 +79,7 @@ def test_api_triangulate_empty_id(client):
 def test_api_triangulate_pointset_not_found(client):
     """Test avec un Pointset qui n'existe pas."""
     
-    with patch('triangulator.app.pointset_client.get_pointset') as mock_get:
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
         mock_response = Mock()
         mock_response.status_code = 404
         error = HTTPError()
@@ -65,7 +95,7 @@ def test_api_pointsetmanager_unreachable(client):
     """Test Pointsetmanager est unreachable (n'est pas atteints)"""
     from requests import HTTPError
     
-    with patch('triangulator.app.pointset_client.get_pointset') as mock_get:
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
         mock_get.side_effect = HTTPError("PointSetManager unreachable")
         
         response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
@@ -78,8 +108,8 @@ def test_api_triangulate_insufficient_points(client):
     """Test avec moins de 3 points"""
     points = [(0.0, 0.0), (1.0, 1.0)]
     
-    with patch('triangulator.app.pointset_client.get_pointset') as mock_get:
-        mock_get.return_value = points
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
         
         response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
         
@@ -89,7 +119,10 @@ def test_api_triangulate_insufficient_points(client):
 
 
 def test_api_triangulate_collinear_points(client):
-    with patch('triangulator.app.pointset_client.get_pointset', side_effect=Exception("boom")):
+    with patch(
+        'triangulator.app.pointset_client.get_pointset_payload',
+        side_effect=Exception("boom"),
+    ):
         
         response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
 
@@ -98,12 +131,27 @@ def test_api_triangulate_collinear_points(client):
         assert response.json['message'] == 'Internal server error'
 
 
+def test_api_response_streamed_with_content_length(client):
+    """Sans place dans le cache, la reponse est envoyee par morceaux avec sa taille."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.5, 0.4)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get, \
+            patch.object(triangulation_cache, 'max_bytes', 0):
+        mock_get.return_value = serialize_pointset(points)
+
+        response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.content_length == len(response.data) == 4 + 4 * 8 + 4 + 3 * 12
+
+
 def test_api_response_binary_format(client):
     """Test avec un format binaire valide"""
     points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
     
-    with patch('triangulator.app.pointset_client.get_pointset') as mock_get:
-        mock_get.return_value = points
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
         
         response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
         
@@ -114,7 +162,7 @@ def test_api_response_binary_format(client):
 
 
 def test_app_bad_request_from_pointsetmanager(client):
-    with patch('triangulator.app.pointset_client.get_pointset') as mock_get:
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
         mock_response = Mock()
         mock_response.status_code = 400
         
@@ -133,9 +181,9 @@ def test_app_bad_request_from_pointsetmanager(client):
 
 def test_app_invalid_pointset_data(client):
     """Test quand les données du PointSet sont invalides (ValueError)."""
-    with patch('triangulator.app.pointset_client.get_pointset') as mock_get:
-        # Simuler une ValueError lors de la désérialisation
-        mock_get.side_effect = ValueError("Invalid binary format: corrupted data")
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        # Données corrompues : la désérialisation lève une ValueError
+        mock_get.return_value = struct.pack('<I', 5) + b'corrupted data'
         
         # Faire la requête
         response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
@@ -144,7 +192,7 @@ def test_app_invalid_pointset_data(client):
         assert response.status_code == 500
         assert response.json['code'] == 'INVALID_DATA'
         assert 'Invalid PointSet data' in response.json['message']
-        assert 'corrupted data' in response.json['message']
+        assert 'Invalid data length' in response.json['message']
 
 
 
@@ -153,8 +201,8 @@ def test_app_triangulation_failed(client):
     # Points colinéaires qui vont faire échouer la triangulation
     collinear_points = [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)]
     
-    with patch('triangulator.app.pointset_client.get_pointset') as mock_get:
-        mock_get.return_value = collinear_points
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(collinear_points)
         
         # Faire la requête
         response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
@@ -172,8 +220,8 @@ def test_app_serialization_failed(client):
     # Points valides pour la triangulation
     valid_points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
     
-    with patch('triangulator.app.pointset_client.get_pointset') as mock_get:
-        mock_get.return_value = valid_points
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(valid_points)
         
         # Faire échouer la sérialisation
         with patch('triangulator.app.serialize_triangles') as mock_serialize:
@@ -187,4 +235,975 @@ def test_app_serialization_failed(client):
             assert response.json['code'] == 'SERIALIZATION_FAILED'
             assert 'Failed to serialize result' in response.json['message']
             assert 'memory issue' in response.json['message']
-            
\ No newline at end of file
+            
+
+
+def test_api_triangulate_method_divide_and_conquer(client):
+    """Test avec l'algorithme par division choisi dans la requête."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.5, 0.4)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
+
+        incremental = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        division = client.get(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000?method=divide_and_conquer'
+        )
+
+        assert division.status_code == 200
+        assert len(division.data) == len(incremental.data)
+        triangle_count = struct.unpack('<I', division.data[4 + 4 * 8:4 + 4 * 8 + 4])[0]
+        assert triangle_count == 3
+
+
+def test_api_triangulate_invalid_method(client):
+    """Test avec un algorithme inconnu."""
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        response = client.get(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000?method=magic'
+        )
+
+        assert response.status_code == 400
+        assert response.json['code'] == 'INVALID_METHOD'
+        mock_get.assert_not_called()
+
+
+def test_api_cache_hit(client):
+    """Le second appel pour le meme PointSet est servi par le cache, sans calcul."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.5, 0.4)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
+
+        premier = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        second = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+
+        assert mock_get.call_count == 1
+        assert premier.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.data == premier.data
+
+    metrics = client.get('/metrics').json['cache']
+    assert metrics['hits'] == 1
+    assert metrics['misses'] == 1
+    assert metrics['entries'] == 2  # l'empreinte de l'identifiant et le resultat
+    assert metrics['bytes'] == len(premier.data) + 32
+
+
+def test_api_cache_key_includes_method(client):
+    """Chaque algorithme a sa propre entree dans le cache."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.5, 0.4)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
+
+        client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        response = client.get(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000?method=divide_and_conquer'
+        )
+
+        assert mock_get.call_count == 2
+        assert response.headers['X-Cache'] == 'MISS'
+
+
+def test_api_cache_errors_not_cached(client):
+    """Une erreur n'est pas gardee : l'appel suivant interroge le PointSetManager."""
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)])
+        assert (
+            client.get(
+                '/triangulation/123e4567-e89b-12d3-a456-426614174000'
+            ).status_code
+            == 500
+        )
+
+        mock_get.return_value = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+        assert (
+            client.get(
+                '/triangulation/123e4567-e89b-12d3-a456-426614174000'
+            ).status_code
+            == 200
+        )
+        assert mock_get.call_count == 2
+
+
+def test_api_cache_identical_content(client):
+    """Deux identifiants au contenu identique partagent le resultat.
+
+    Le second n'est ni decode ni triangule.
+    """
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.5, 0.4)]
+
+    with (
+        patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get,
+        patch('triangulator.app.triangulate', wraps=triangulate) as mock_triangulate,
+    ):
+        mock_get.return_value = serialize_pointset(points)
+
+        premier = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        second = client.get('/triangulation/00000000-0000-0000-0000-000000000000')
+
+        assert mock_get.call_count == 2
+        assert mock_triangulate.call_count == 1
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.data == premier.data
+
+
+def test_api_batch_triangulations(client):
+    """Le lot renvoie une entree par identifiant, dans l'ordre.
+
+    Chaque entree a son propre statut et son code.
+    """
+    payloads = {
+        '123e4567-e89b-12d3-a456-426614174000': serialize_pointset(
+            [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.5, 0.4)]
+        ),
+        '00000000-0000-0000-0000-000000000001': serialize_pointset(
+            [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)]
+        ),
+    }
+
+    def lire(pointset_id):
+        if pointset_id not in payloads:
+            response = Mock()
+            response.status_code = 404
+            raise HTTPError(response=response)
+        return payloads[pointset_id]
+
+    ids = [
+        '123e4567-e89b-12d3-a456-426614174000',
+        '00000000-0000-0000-0000-000000000001',
+        '00000000-0000-0000-0000-000000000002',
+        'invalid-id',
+    ]
+    with patch(
+        'triangulator.app.pointset_client.get_pointset_payload', side_effect=lire
+    ):
+        response = client.post('/triangulations', json={'ids': ids})
+
+    assert response.status_code == 200
+    assert response.content_type == 'application/octet-stream'
+    resultats = deserialize_batch(response.data)
+    assert [r.pointset_id for r in resultats] == ids
+    assert [(r.status, r.code) for r in resultats] == [
+        (200, ''),
+        (500, 'TRIANGULATION_FAILED'),
+        (404, 'NOT_FOUND'),
+        (400, 'INVALID_ID'),
+    ]
+    sommets, triangles = deserialize_triangles(resultats[0].data)
+    assert len(sommets) == 4
+    assert len(triangles) == 3
+    assert 'not found' in bytes(resultats[2].data).decode()
+
+
+def test_api_batch_erreur_inattendue(client):
+    """Une exception inattendue devient une entree 500, sans couper le flux."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
+
+    def calcul(pointset_id, method, deja_compte, executor=None):
+        if pointset_id.endswith('1'):
+            raise OSError("connection reset")
+        return _triangulation_result(pointset_id, method, deja_compte)
+
+    ids = [
+        '00000000-0000-0000-0000-000000000001',
+        '00000000-0000-0000-0000-000000000002',
+    ]
+    with (
+        patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get,
+        patch('triangulator.app._triangulation_result', side_effect=calcul),
+    ):
+        mock_get.return_value = serialize_pointset(points)
+        response = client.post('/triangulations', json={'ids': ids})
+        resultats = deserialize_batch(response.data)
+
+    assert response.status_code == 200
+    assert [(r.pointset_id, r.status, r.code) for r in resultats] == [
+        (ids[0], 500, 'INTERNAL_ERROR'),
+        (ids[1], 200, ''),
+    ]
+    assert len(deserialize_triangles(resultats[1].data)[1]) == 1
+
+
+def test_api_batch_uses_cache(client):
+    """Un resultat deja calcule par GET est repris par le lot."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
+        seul = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        lot = client.post(
+            '/triangulations', json={'ids': ['123e4567-e89b-12d3-a456-426614174000']}
+        )
+
+        assert mock_get.call_count == 1
+        assert bytes(deserialize_batch(lot.data)[0].data) == seul.data
+
+
+def test_api_batch_resultat_hors_budget(client):
+    """Un calcul partage avec un GET dont le resultat depasse le cache est serialise."""
+    def calcul_partage(pointset_id, method, deja_compte, executor=None):
+        # le vol a ete lance par un GET : triangulation dans le thread, sans pool
+        return _triangulation_result(pointset_id, method, deja_compte)
+
+    with (
+        patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get,
+        patch('triangulator.app._triangulation_result', side_effect=calcul_partage),
+        patch.object(triangulation_cache, 'max_bytes', 10),
+    ):
+        mock_get.return_value = serialize_pointset(
+            [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.5, 0.4)]
+        )
+        lot = client.post(
+            '/triangulations', json={'ids': ['123e4567-e89b-12d3-a456-426614174000']}
+        )
+        resultat, = deserialize_batch(lot.data)
+
+    assert resultat.status == 200
+    sommets, triangles = deserialize_triangles(resultat.data)
+    assert len(sommets) == 4
+    assert len(triangles) == 3
+
+
+@pytest.mark.parametrize(
+    "corps", [None, {'ids': 'abc'}, {'ids': [1, 2]}, {'autre': []}]
+)
+def test_api_batch_invalid_request(client, corps):
+    """Un corps qui n'est pas {"ids": [...]} est refuse."""
+    response = client.post('/triangulations', json=corps)
+
+    assert response.status_code == 400
+    assert response.json['code'] == 'INVALID_REQUEST'
+
+
+def test_api_batch_too_many_ids(client):
+    """Le nombre d'identifiants par lot est borne."""
+    with patch('triangulator.app.BATCH_MAX_IDS', 2):
+        response = client.post('/triangulations', json={'ids': ['a', 'b', 'c']})
+
+    assert response.status_code == 400
+    assert response.json['code'] == 'INVALID_REQUEST'
+
+
+def test_api_batch_invalid_method(client):
+    """L'algorithme est valide avant tout calcul."""
+    response = client.post('/triangulations?method=bogus', json={'ids': []})
+
+    assert response.status_code == 400
+    assert response.json['code'] == 'INVALID_METHOD'
+
+
+def test_api_upload_triangulation(client):
+    """Un PointSet envoye dans le corps est triangule sans le PointSetManager."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.5, 0.25)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        response = client.post('/triangulation', data=serialize_pointset(points),
+                               content_type='application/octet-stream')
+
+        assert mock_get.call_count == 0
+    assert response.status_code == 200
+    assert response.content_type == 'application/octet-stream'
+    sommets, triangles = deserialize_triangles(response.data)
+    assert list(sommets) == points
+    assert len(triangles) == 3
+
+
+def test_api_upload_shares_content_cache(client):
+    """Un contenu deja triangule via GET est servi par le cache a l'envoi direct."""
+    binary = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = binary
+        seul = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+
+    envoi = client.post('/triangulation', data=binary)
+    assert envoi.headers['X-Cache'] == 'HIT'
+    assert envoi.data == seul.data
+
+
+@pytest.mark.parametrize(
+    "corps, statut, code",
+    [
+        (b'', 400, 'INVALID_DATA'),
+        (struct.pack('<I', 5) + b'corrupted', 400, 'INVALID_DATA'),
+        (serialize_pointset([(0.0, 0.0), (1.0, 0.0)]), 400, 'INSUFFICIENT_POINTS'),
+        (
+            serialize_pointset([(0.0, 0.0), (1.0, 0.0), (math.inf, 1.0)]),
+            400,
+            'INVALID_DATA',
+        ),
+        (
+            serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, math.nan)]),
+            400,
+            'INVALID_DATA',
+        ),
+        (
+            serialize_pointset([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)]),
+            500,
+            'TRIANGULATION_FAILED',
+        ),
+    ],
+)
+def test_api_upload_errors(client, corps, statut, code):
+    """Le corps est valide avec les memes regles que deserialize_pointset."""
+    response = client.post('/triangulation', data=corps)
+
+    assert response.status_code == statut
+    assert response.json['code'] == code
+
+
+def test_api_upload_too_large(client):
+    """Un corps plus grand que la limite est refuse avant d'etre lu."""
+    with patch('triangulator.app.UPLOAD_MAX_BYTES', 16):
+        response = client.post(
+            '/triangulation',
+            data=serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]),
+        )
+
+    assert response.status_code == 413
+    assert response.json['code'] == 'PAYLOAD_TOO_LARGE'
+
+
+def attendre_job(client, url, timeout=5.0):
+    """Interroge l'URL de suivi d'un job jusqu'a ce qu'il soit termine."""
+    fin = time.monotonic() + timeout
+    while True:
+        response = client.get(url)
+        if response.content_type != 'application/json' or response.json.get(
+            'state'
+        ) not in ('pending', 'running'):
+            return response
+        assert time.monotonic() < fin
+        time.sleep(0.01)
+
+
+def test_api_job_success(client):
+    """Un job retourne le meme resultat binaire que la requete directe."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.25, 0.25)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
+        creation = client.post(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000/jobs'
+        )
+
+        assert creation.status_code == 202
+        assert creation.json['state'] in ('pending', 'running', 'done')
+        url = creation.headers['Location']
+        assert url == f"/jobs/{creation.json['id']}"
+        resultat = attendre_job(client, url)
+
+        assert resultat.status_code == 200
+        assert resultat.content_type == 'application/octet-stream'
+        direct = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+    assert direct.headers['X-Cache'] == 'HIT'
+    assert resultat.data == direct.data
+    assert client.get('/metrics').json['jobs']['done'] == 1
+
+
+def test_api_job_resultat_evince(client):
+    """Un job termine ne garde que la cle de son resultat.
+
+    Si le resultat a ete evince du cache, le suivi repond 410 sans le recalculer.
+    """
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.25, 0.25)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
+        url = client.post(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000/jobs'
+        ).headers['Location']
+        assert attendre_job(client, url).status_code == 200
+        job = triangulation_jobs.get(url.split('/')[-1])
+        assert isinstance(job.result, str)
+        triangulation_cache.clear()
+        second = client.get(url)
+
+    assert second.status_code == 410
+    assert second.json['code'] == 'RESULT_EXPIRED'
+    assert mock_get.call_count == 1
+
+
+def test_api_job_resultat_hors_budget(client):
+    """Un resultat plus grand que le budget du cache est garde par le job.
+
+    Il est servi une fois sans recalcul, puis libere.
+    """
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.25, 0.25)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get, \
+            patch.object(triangulation_cache, 'max_bytes', 16), \
+            patch.object(triangulation_cache, 'disk', None):
+        mock_get.return_value = serialize_pointset(points)
+        url = client.post(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000/jobs'
+        ).headers['Location']
+        resultat = attendre_job(client, url)
+        second = client.get(url)
+
+    assert resultat.status_code == 200
+    assert len(resultat.data) > 16
+    vertices, triangles = deserialize_triangles(resultat.data)
+    assert len(vertices) == 4
+    assert len(triangles) == 3
+    assert mock_get.call_count == 1
+    assert second.status_code == 410
+    assert second.json['code'] == 'RESULT_EXPIRED'
+
+
+def test_api_job_progress_and_cancel(client):
+    """L'etat d'un job en cours donne sa progression ; DELETE l'annule."""
+    en_cours = threading.Event()
+    libre = threading.Event()
+
+    def triangulation_lente(points, method, progress=None):
+        progress(0, len(points))
+        progress(2, len(points))
+        en_cours.set()
+        libre.wait(5)
+        progress(3, len(points))
+        raise AssertionError("job non annule")
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get, \
+            patch('triangulator.app.triangulate', triangulation_lente):
+        mock_get.return_value = serialize_pointset(
+            [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.25, 0.25)]
+        )
+        url = client.post(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000/jobs'
+        ).headers['Location']
+        assert en_cours.wait(5)
+
+        etat = client.get(url)
+        assert etat.status_code == 200
+        assert etat.json['state'] == 'running'
+        assert etat.json['progress'] == {'inserted': 2, 'total': 4}
+
+        annulation = client.delete(url)
+        assert annulation.status_code == 200
+        assert annulation.json['cancel_requested']
+        libre.set()
+        assert attendre_job(client, url).json['state'] == 'cancelled'
+
+
+def test_api_job_failure(client):
+    """Un job en echec retourne l'erreur du calcul."""
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_get.side_effect = HTTPError(response=mock_response)
+        url = client.post(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000/jobs'
+        ).headers['Location']
+        response = attendre_job(client, url)
+
+    assert response.status_code == 404
+    assert response.json['code'] == 'NOT_FOUND'
+
+
+@pytest.mark.parametrize(
+    "requete, statut, code",
+    [
+        (('post', '/triangulation/invalid-id/jobs'), 400, 'INVALID_ID'),
+        (
+            (
+                'post',
+                '/triangulation/123e4567-e89b-12d3-a456-426614174000/jobs?method=magic',
+            ),
+            400,
+            'INVALID_METHOD',
+        ),
+        (('get', '/jobs/inconnu'), 404, 'JOB_NOT_FOUND'),
+        (('delete', '/jobs/inconnu'), 404, 'JOB_NOT_FOUND'),
+    ],
+)
+def test_api_job_errors(client, requete, statut, code):
+    """Erreurs de creation et de suivi des jobs."""
+    methode, url = requete
+    response = getattr(client, methode)(url)
+
+    assert response.status_code == statut
+    assert response.json['code'] == code
+
+
+def test_api_job_queue_full(client):
+    """Au-dela de la file d'attente, la creation est refusee avec 429."""
+    with patch('triangulator.app.triangulation_jobs.max_pending', 0), \
+            patch('triangulator.app.triangulation_jobs.max_workers', 0):
+        response = client.post(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000/jobs'
+        )
+
+    assert response.status_code == 429
+    assert response.json['code'] == 'TOO_MANY_JOBS'
+
+
+def test_api_etag_not_modified(client):
+    """Avec l'ETag recu, la requete suivante recoit 304 sans appel au manager."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.25, 0.25)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
+        premier = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        etag = premier.headers['ETag']
+        second = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000',
+                            headers={'If-None-Match': etag})
+        autre = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000',
+                           headers={'If-None-Match': '"autre"'})
+
+    assert premier.status_code == 200
+    assert etag.startswith('"') and not etag.startswith('W/')
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == etag
+    assert mock_get.call_count == 1
+    assert autre.status_code == 200
+    assert autre.data == premier.data
+
+
+def test_api_etag_result_evicted(client):
+    """Un resultat evince du cache n'est pas recalcule pour repondre 304."""
+    with (
+        patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get,
+        patch(
+            'triangulator.app.compute_triangulation', wraps=compute_triangulation
+        ) as mock_calcul,
+    ):
+        mock_get.return_value = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+        etag = client.get(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000'
+        ).headers['ETag']
+        for cle in [
+            cle
+            for cle in triangulation_cache._entries
+            if not cle.startswith('pointset:')
+        ]:
+            triangulation_cache._entries.pop(cle)
+
+        response = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000',
+                              headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert mock_get.call_count == 1
+    assert mock_calcul.call_count == 1
+
+
+def test_api_etag_method_and_upload(client):
+    """L'ETag depend de l'algorithme et du contenu, pas du chemin d'envoi."""
+    binary = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.25, 0.25)])
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = binary
+        incremental = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        division = client.get(
+            '/triangulation/123e4567-e89b-12d3-a456-426614174000?method=divide_and_conquer'
+        )
+
+    envoi = client.post('/triangulation', data=binary)
+    conditionnel = client.post(
+        '/triangulation',
+        data=binary,
+        headers={'If-None-Match': incremental.headers['ETag']},
+    )
+
+    assert incremental.headers['ETag'] != division.headers['ETag']
+    assert envoi.headers['ETag'] == incremental.headers['ETag']
+    assert conditionnel.status_code == 304
+
+
+def test_api_compressed_encoding(client):
+    """Avec Accept-Encoding: x-delta-varint, le resultat est compresse.
+
+    La version compressee a son propre ETag.
+    """
+    points = [(float(x), float(y) + 0.1 * x) for y in range(10) for x in range(10)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
+        brut = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        compresse = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000',
+                               headers={'Accept-Encoding': 'gzip, x-delta-varint'})
+        conditionnel = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000',
+                                  headers={'Accept-Encoding': 'x-delta-varint',
+                                           'If-None-Match': compresse.headers['ETag']})
+        etoile = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000',
+                            headers={'Accept-Encoding': '*'})
+
+    assert 'Content-Encoding' not in brut.headers
+    assert brut.headers['Vary'] == 'Accept-Encoding'
+    assert compresse.headers['Content-Encoding'] == 'x-delta-varint'
+    assert decompress_triangles(compresse.data) == brut.data
+    assert len(compresse.data) < len(brut.data)
+    assert compresse.headers['ETag'] != brut.headers['ETag']
+    assert conditionnel.status_code == 304
+    assert etoile.data == brut.data
+
+
+def test_api_compressed_stream(client):
+    """Un resultat trop grand pour le cache est aussi envoye compresse."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.25, 0.25)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get, \
+            patch.object(triangulation_cache, 'max_bytes', 40):
+        mock_get.return_value = serialize_pointset(points)
+        brut = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        compresse = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000',
+                               headers={'Accept-Encoding': 'x-delta-varint'})
+
+    assert brut.is_streamed
+    assert brut.headers['Vary'] == 'Accept-Encoding'
+    assert compresse.headers['Content-Encoding'] == 'x-delta-varint'
+    assert decompress_triangles(compresse.data) == brut.data
+
+
+def test_api_upload_compressed(client):
+    """Un PointSet compresse peut etre envoye avec Content-Encoding: x-delta-varint."""
+    binary = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.25, 0.25)])
+
+    brut = client.post('/triangulation', data=binary)
+    compresse = client.post('/triangulation', data=compress_pointset(binary),
+                            headers={'Content-Encoding': 'x-delta-varint'})
+    invalide = client.post(
+        '/triangulation', data=binary, headers={'Content-Encoding': 'x-delta-varint'}
+    )
+    inconnu = client.post(
+        '/triangulation', data=binary, headers={'Content-Encoding': 'br'}
+    )
+
+    assert compresse.status_code == 200
+    assert compresse.data == brut.data
+    assert invalide.status_code == 400
+    assert invalide.json['code'] == 'INVALID_DATA'
+    assert inconnu.status_code == 415
+    assert inconnu.json['code'] == 'UNSUPPORTED_ENCODING'
+
+
+def test_api_upload_compressed_bombe(client):
+    """Un corps compresse annoncant 0 point mais qui se developpe est refuse."""
+    bombe = struct.pack('<I', 0) + zlib.compress(bytes(10_000_000), 9)
+
+    response = client.post(
+        '/triangulation', data=bombe, headers={'Content-Encoding': 'x-delta-varint'}
+    )
+
+    assert response.status_code == 400
+    assert response.json['code'] == 'INVALID_DATA'
+
+
+def test_api_large_result_disk_tier(client, tmp_path, monkeypatch):
+    """Un resultat trop grand pour la memoire est servi depuis un fichier projete."""
+    import triangulator.cache as cache_module
+    from triangulator.cache import DiskTier
+    monkeypatch.setattr(cache_module, 'MMAP_MIN_BYTES', 16)
+    monkeypatch.setattr(triangulation_cache, 'max_bytes', 40)
+    monkeypatch.setattr(triangulation_cache, 'disk', DiskTier(str(tmp_path)))
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0), (0.25, 0.25)]
+
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset(points)
+        premier = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+        second = client.get('/triangulation/123e4567-e89b-12d3-a456-426614174000')
+
+    assert premier.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert premier.is_streamed and second.is_streamed
+    assert int(second.headers['Content-Length']) == len(second.data)
+    assert premier.data == second.data
+    sommets, triangles = deserialize_triangles(second.data)
+    assert len(sommets) == 4
+    assert len(triangles) == 3
+
+
+BASE_ID = '123e4567-e89b-12d3-a456-426614174000'
+NOUVEAU_ID = '00000000-0000-0000-0000-000000000001'
+
+
+def test_api_triangulation_delta(client):
+    """La difference appliquee a la base donne la nouvelle triangulation."""
+    base = [(float(x), float(y)) for x in range(5) for y in range(4)] + [(0.5, 0.25)]
+    nouveau = base[1:] + [(2.5, 1.75), (6.0, 1.0)]
+    payloads = {
+        BASE_ID: serialize_pointset(base),
+        NOUVEAU_ID: serialize_pointset(nouveau),
+    }
+
+    with patch(
+        'triangulator.app.pointset_client.get_pointset_payload',
+        side_effect=payloads.get,
+    ) as mock_get:
+        triangulation_base = client.get(f'/triangulation/{BASE_ID}').data
+        response = client.get(f'/triangulation/{NOUVEAU_ID}/delta?base={BASE_ID}')
+        etag = response.headers['ETag']
+        encore = client.get(f'/triangulation/{NOUVEAU_ID}/delta?base={BASE_ID}')
+        inchange = client.get(
+            f'/triangulation/{NOUVEAU_ID}/delta?base={BASE_ID}',
+            headers={'If-None-Match': etag},
+        )
+
+    assert response.status_code == 200
+    assert response.content_type == 'application/octet-stream'
+    assert response.headers['X-Cache'] == 'MISS'
+    assert (encore.status_code, encore.headers['X-Cache'], encore.data) == (
+        200,
+        'HIT',
+        response.data,
+    )
+    assert (inchange.status_code, inchange.data) == (304, b'')
+    # base lue une fois pour GET, nouvelle version une fois pour la difference
+    assert mock_get.call_count == 2
+
+    delta = deserialize_delta(response.data)
+    assert len(delta.vertices) == 2
+    assert len(response.data) < len(triangulation_base)
+    sommets, triangles = deserialize_triangles(
+        apply_delta(triangulation_base, response.data)
+    )
+    sommets = list(sommets)
+    assert sorted({sommets[i] for t in triangles for i in t}) == sorted(nouveau)
+    assert len(triangles) == len(triangulate(nouveau))
+
+
+def test_api_triangulation_delta_base_non_calculee(client):
+    """La base absente du cache est calculee avec la methode demandee."""
+    base = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0)]
+    payloads = {
+        BASE_ID: serialize_pointset(base),
+        NOUVEAU_ID: serialize_pointset(base + [(0.5, 0.4)]),
+    }
+
+    with patch(
+        'triangulator.app.pointset_client.get_pointset_payload',
+        side_effect=payloads.get,
+    ):
+        response = client.get(
+            f'/triangulation/{NOUVEAU_ID}/delta?base={BASE_ID}&method=divide_and_conquer'
+        )
+        triangulation_base = client.get(
+            f'/triangulation/{BASE_ID}?method=divide_and_conquer'
+        )
+
+    assert response.status_code == 200
+    assert triangulation_base.headers['X-Cache'] == 'HIT'
+    sommets, triangles = deserialize_triangles(
+        apply_delta(triangulation_base.data, response.data)
+    )
+    assert len(sommets) == 5
+    assert len(triangles) == 4
+
+
+@pytest.mark.parametrize(
+    "requete,statut,code",
+    [
+        (f'/triangulation/{NOUVEAU_ID}/delta', 400, 'INVALID_ID'),
+        (f'/triangulation/{NOUVEAU_ID}/delta?base=invalid-id', 400, 'INVALID_ID'),
+        (f'/triangulation/invalid-id/delta?base={BASE_ID}', 400, 'INVALID_ID'),
+        (
+            f'/triangulation/{NOUVEAU_ID}/delta?base={BASE_ID}&method=inconnue',
+            400,
+            'INVALID_METHOD',
+        ),
+        (
+            f'/triangulation/{NOUVEAU_ID}/delta?base=00000000-0000-0000-0000-000000000002',
+            404,
+            'NOT_FOUND',
+        ),
+        (
+            f'/triangulation/00000000-0000-0000-0000-000000000003/delta?base={BASE_ID}',
+            500,
+            'TRIANGULATION_FAILED',
+        ),
+    ],
+)
+def test_api_triangulation_delta_erreurs(client, requete, statut, code):
+    """Erreurs de GET /triangulation/<id>/delta, avec leur statut et leur code."""
+    payloads = {
+        BASE_ID: serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]),
+        NOUVEAU_ID: serialize_pointset([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0)]),
+        '00000000-0000-0000-0000-000000000003': serialize_pointset(
+            [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)]
+        ),
+    }
+
+    def lire(pointset_id):
+        if pointset_id not in payloads:
+            response = Mock()
+            response.status_code = 404
+            raise HTTPError(response=response)
+        return payloads[pointset_id]
+
+    with patch(
+        'triangulator.app.pointset_client.get_pointset_payload', side_effect=lire
+    ):
+        response = client.get(requete)
+
+    assert response.status_code == statut
+    assert response.json['code'] == code
+
+
+def test_api_locate(client):
+    """La localisation reutilise le resultat en cache et l'index deja construit."""
+    points = [(0.0, 0.0), (4.0, 0.0), (4.0, 3.0), (0.0, 3.0), (1.0, 1.0)]
+
+    with (
+        patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get,
+        patch(
+            'triangulator.app.compute_triangulation', wraps=compute_triangulation
+        ) as mock_calcul,
+    ):
+        mock_get.return_value = serialize_pointset(points)
+        triangles = list(
+            deserialize_triangles(client.get(f'/triangulation/{BASE_ID}').data)[1]
+        )
+        dedans = client.get(f'/triangulation/{BASE_ID}/locate?x=3.5&y=2.5')
+        dehors = client.get(f'/triangulation/{BASE_ID}/locate?x=-1&y=0.9')
+        lot = client.post(
+            f'/triangulation/{BASE_ID}/locate',
+            data=serialize_pointset([(3.5, 2.5), (-1.0, 0.9), (1.0, 1.0)]),
+        )
+
+    assert mock_get.call_count == 1
+    assert mock_calcul.call_count == 1
+    assert triangulation_locators.stats()['entries'] == 1
+
+    assert dedans.status_code == 200
+    assert dedans.json['nearest'] == 2
+    assert dedans.json['vertices'] == list(triangles[dedans.json['triangle']])
+    assert 2 in dedans.json['vertices']
+    assert dehors.json == {
+        'x': -1.0,
+        'y': 0.9,
+        'triangle': None,
+        'vertices': None,
+        'nearest': 0,
+    }
+
+    assert lot.status_code == 200
+    assert lot.content_type == 'application/octet-stream'
+    positions, sommets = deserialize_locations(lot.data)
+    assert list(positions) == [dedans.json['triangle'], -1, positions[2]]
+    assert 4 in triangles[positions[2]]
+    assert list(sommets) == [2, 0, 4]
+
+
+@pytest.mark.parametrize("requete,statut,code", [
+    ('/triangulation/invalid-id/locate?x=0&y=0', 400, 'INVALID_ID'),
+    (f'/triangulation/{BASE_ID}/locate?x=0&y=0&method=inconnue', 400, 'INVALID_METHOD'),
+    (f'/triangulation/{BASE_ID}/locate?x=0', 400, 'INVALID_QUERY'),
+    (f'/triangulation/{BASE_ID}/locate?x=abc&y=0', 400, 'INVALID_QUERY'),
+    (f'/triangulation/{BASE_ID}/locate?x=nan&y=0', 400, 'INVALID_QUERY'),
+    (f'/triangulation/{BASE_ID}/locate?x=1e308&y=1e308', 400, 'INVALID_QUERY'),
+    (f'/triangulation/{BASE_ID}/locate?x=-1e39&y=0', 400, 'INVALID_QUERY'),
+    (f'/triangulation/{NOUVEAU_ID}/locate?x=0&y=0', 404, 'NOT_FOUND'),
+])
+def test_api_locate_erreurs(client, requete, statut, code):
+    """Erreurs de GET /triangulation/<id>/locate, avec leur statut et leur code."""
+    def lire(pointset_id):
+        if pointset_id != BASE_ID:
+            response = Mock()
+            response.status_code = 404
+            raise HTTPError(response=response)
+        return serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)])
+
+    with patch(
+        'triangulator.app.pointset_client.get_pointset_payload', side_effect=lire
+    ):
+        response = client.get(requete)
+
+    assert response.status_code == statut
+    assert response.json['code'] == code
+
+
+def test_api_locate_lot_invalide(client):
+    """Un lot de points tronque ou non fini est refuse."""
+    with patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get:
+        mock_get.return_value = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)])
+        tronque = client.post(
+            f'/triangulation/{BASE_ID}/locate', data=b'\x02\x00\x00\x00'
+        )
+        infini = client.post(
+            f'/triangulation/{BASE_ID}/locate',
+            data=serialize_pointset([(float('inf'), 0.0)]),
+        )
+
+    assert (tronque.status_code, tronque.json['code']) == (400, 'INVALID_DATA')
+    assert (infini.status_code, infini.json['code']) == (400, 'INVALID_DATA')
+    mock_get.assert_not_called()
+
+
+def test_api_voronoi(client):
+    """Le diagramme est construit sur la triangulation en cache, puis garde en cache."""
+    points = [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0), (1.0, 1.2)]
+
+    with (
+        patch('triangulator.app.pointset_client.get_pointset_payload') as mock_get,
+        patch(
+            'triangulator.app.compute_triangulation', wraps=compute_triangulation
+        ) as mock_calcul,
+    ):
+        mock_get.return_value = serialize_pointset(points)
+        triangles = list(
+            deserialize_triangles(client.get(f'/triangulation/{BASE_ID}').data)[1]
+        )
+        premier = client.get(f'/voronoi/{BASE_ID}')
+        second = client.get(f'/voronoi/{BASE_ID}')
+        inchange = client.get(
+            f'/voronoi/{BASE_ID}', headers={'If-None-Match': premier.headers['ETag']}
+        )
+        autre_methode = client.get(f'/voronoi/{BASE_ID}?method=divide_and_conquer')
+
+    # un appel au PointSetManager et une triangulation par algorithme
+    assert mock_get.call_count == 2
+    assert mock_calcul.call_count == 2
+    assert (premier.status_code, premier.headers['X-Cache']) == (200, 'MISS')
+    assert premier.content_type == 'application/octet-stream'
+    assert (second.status_code, second.headers['X-Cache'], second.data) == (
+        200,
+        'HIT',
+        premier.data,
+    )
+    assert (inchange.status_code, inchange.data) == (304, b'')
+    assert autre_methode.status_code == 200
+    assert autre_methode.headers['ETag'] != premier.headers['ETag']
+
+    voronoi = deserialize_voronoi(premier.data)
+    assert len(voronoi.vertices) == len(triangles)
+    interieur = list(voronoi.cells[voronoi.offsets[4]:voronoi.offsets[5]])
+    assert sorted(interieur) == list(range(len(triangles)))
+    for i in range(4):
+        assert (
+            VORONOI_INFINITY
+            in voronoi.cells[voronoi.offsets[i] : voronoi.offsets[i + 1]]
+        )
+
+
+@pytest.mark.parametrize("requete,statut,code", [
+    ('/voronoi/invalid-id', 400, 'INVALID_ID'),
+    (f'/voronoi/{BASE_ID}?method=inconnue', 400, 'INVALID_METHOD'),
+    (f'/voronoi/{NOUVEAU_ID}', 404, 'NOT_FOUND'),
+    ('/voronoi/00000000-0000-0000-0000-000000000003', 500, 'TRIANGULATION_FAILED'),
+])
+def test_api_voronoi_erreurs(client, requete, statut, code):
+    """Erreurs de GET /voronoi/<pointset_id>, avec leur statut et leur code."""
+    payloads = {
+        BASE_ID: serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]),
+        '00000000-0000-0000-0000-000000000003': serialize_pointset(
+            [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)]
+        ),
+    }
+
+    def lire(pointset_id):
+        if pointset_id not in payloads:
+            response = Mock()
+            response.status_code = 404
+            raise HTTPError(response=response)
+        return payloads[pointset_id]
+
+    with patch(
+        'triangulator.app.pointset_client.get_pointset_payload', side_effect=lire
+    ):
+        response = client.get(requete)
+
+    assert response.status_code == statut
+    assert response.json['code'] == code
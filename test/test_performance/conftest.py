@@ -0,0 +1,20 @@
+"""Rapport des mesures enregistrées par les tests de performance."""
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Affiche en fin de session les mesures enregistrées avec record_property.
+
+    Les mesures figurent aussi dans le rapport JUnit (--junitxml).
+    """
+    rapports = [
+        rapport
+        for etat in ('passed', 'failed')
+        for rapport in terminalreporter.stats.get(etat, [])
+        if rapport.when == 'call' and rapport.user_properties
+    ]
+    if not rapports:
+        return
+    terminalreporter.section('mesures de performance')
+    for rapport in rapports:
+        mesures = ', '.join(f'{nom}={val}' for nom, val in rapport.user_properties)
+        terminalreporter.write_line(f'{rapport.nodeid}: {mesures}')
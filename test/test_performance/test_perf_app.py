@@ -0,0 +1,240 @@
+"""Tests de performance du service HTTP."""
+import asyncio
+import contextlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+from werkzeug.serving import make_server
+
+from triangulator.algorithm import triangulate
+from triangulator.app import (
+    app,
+    pointset_client,
+    triangulation_cache,
+    triangulation_flights,
+)
+from triangulator.asgi import TriangulatorASGI, serve
+from triangulator.async_client import AsyncPointSetManagerClient
+from triangulator.cache import TriangulationCache
+from triangulator.client import PointSetManagerClient
+from triangulator.serialization import serialize_pointset
+
+
+class StubPointSetManager(BaseHTTPRequestHandler):
+    """PointSetManager de test : sert le même PointSet pour tout identifiant.
+
+    Chaque réponse est envoyée après un délai.
+    """
+
+    # HTTP/1.1 : les connexions restent ouvertes entre deux requêtes ; sans
+    # Nagle, comme un vrai serveur
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    payload = b''
+    delai = 0.0
+    appels = 0
+    verrou = threading.Lock()
+
+    def do_GET(self):
+        """Renvoie le PointSet configuré après le délai configuré."""
+        with StubPointSetManager.verrou:
+            StubPointSetManager.appels += 1
+        time.sleep(self.delai)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(self.payload)))
+        self.end_headers()
+        self.wfile.write(self.payload)
+
+    def log_message(self, format, *args):
+        """N'affiche pas le journal des requêtes."""
+
+
+@pytest.fixture
+def manager():
+    """Démarre le PointSetManager de test sur un port local et retourne son URL."""
+    StubPointSetManager.appels = 0
+    StubPointSetManager.delai = 0.0
+    serveur = ThreadingHTTPServer(('127.0.0.1', 0), StubPointSetManager)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{serveur.server_port}'
+    serveur.shutdown()
+    serveur.server_close()
+
+
+@pytest.fixture
+def serveurs(manager):
+    """Démarre le service, relié au PointSetManager de test, sur un port local."""
+    triangulation_cache.clear()
+    triangulation_flights.clear()
+
+    service = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=service.serve_forever, daemon=True).start()
+
+    with patch.object(pointset_client, 'base_url', manager):
+        yield f'http://127.0.0.1:{service.server_port}'
+
+    service.shutdown()
+    service.server_close()
+
+
+def percentile(durees, p):
+    """Retourne le percentile p (0-100) d'une liste de durées."""
+    durees = sorted(durees)
+    return durees[min(len(durees) - 1, int(len(durees) * p / 100))]
+
+
+@pytest.mark.performance
+def test_perf_client_session(manager, record_property):
+    """Latences p50/p99 de 500 lectures d'un PointSet.
+
+    Une connexion par requête contre la session du client.
+    """
+    StubPointSetManager.payload = serialize_pointset(
+        [(float(i), float(i)) for i in range(100)]
+    )
+    url = f'{manager}/pointset/123e4567-e89b-12d3-a456-426614174000'
+    client = PointSetManagerClient(manager)
+    n = 500
+
+    def latences(lire):
+        durees = []
+        for _ in range(n):
+            start = time.perf_counter()
+            lire()
+            durees.append(time.perf_counter() - start)
+        return durees
+
+    avant = latences(lambda: requests.get(url, timeout=5).content)
+    apres = latences(
+        lambda: client.get_pointset_payload('123e4567-e89b-12d3-a456-426614174000')
+    )
+
+    for p in (50, 99):
+        record_property(f'p{p}_sans_session_s', round(percentile(avant, p), 4))
+        record_property(f'p{p}_session_s', round(percentile(apres, p), 4))
+    assert percentile(apres, 50) < percentile(avant, 50)
+
+
+@pytest.mark.performance
+def test_charge_requetes_simultanees(serveurs, record_property):
+    """50 requêtes simultanées pour un nouveau PointSet.
+
+    Un seul appel au PointSetManager et une seule triangulation.
+    """
+    rng = random.Random(13)
+    StubPointSetManager.payload = serialize_pointset(
+        [(rng.random(), rng.random()) for _ in range(2000)]
+    )
+    StubPointSetManager.delai = 0.2
+    n = 50
+    depart = threading.Barrier(n)
+    reponses = []
+
+    def client():
+        depart.wait()
+        reponse = requests.get(
+            f'{serveurs}/triangulation/123e4567-e89b-12d3-a456-426614174000', timeout=30
+        )
+        reponses.append((reponse.status_code, reponse.content))
+
+    with patch('triangulator.app.triangulate', wraps=triangulate) as mock_triangulate:
+        threads = [threading.Thread(target=client) for _ in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    metrics = requests.get(f'{serveurs}/metrics', timeout=5).json()
+    record_property('requetes', n)
+    record_property('triangulations', mock_triangulate.call_count)
+    assert all(statut == 200 for statut, _ in reponses)
+    assert len({contenu for _, contenu in reponses}) == 1
+    assert mock_triangulate.call_count == 1
+    assert StubPointSetManager.appels == 1
+    assert metrics['single_flight']['shared'] == n - 1
+
+
+def debit(url_base, n, concurrence):
+    """Envoie n requêtes pour des identifiants distincts avec concurrence clients.
+
+    Retourne (requêtes/s, statuts).
+    """
+    locales = threading.local()
+    statuts = []
+
+    def lire(i):
+        if not hasattr(locales, 'session'):
+            locales.session = requests.Session()
+        reponse = locales.session.get(f'{url_base}/triangulation/{i:036d}', timeout=60)
+        statuts.append(reponse.status_code)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrence) as executor:
+        list(executor.map(lire, range(n)))
+    return n / (time.perf_counter() - start), statuts
+
+
+@pytest.fixture
+def serveur_asgi(manager):
+    """Démarre la variante asyncio du service, sans cache.
+
+    Le serveur tourne dans un thread avec sa propre boucle.
+    """
+    application = TriangulatorASGI(
+        AsyncPointSetManagerClient(manager, pool_size=64),
+        workers=os.cpu_count() or 1,
+        cache=TriangulationCache(0),
+    )
+    pret = threading.Event()
+    etat = {}
+
+    def demarre(port):
+        etat['port'] = port
+        etat['boucle'] = asyncio.get_running_loop()
+        pret.set()
+
+    async def principal():
+        etat['tache'] = asyncio.current_task()
+        with contextlib.suppress(asyncio.CancelledError):
+            await serve(application, port=0, started=demarre)
+
+    thread = threading.Thread(target=asyncio.run, args=(principal(),), daemon=True)
+    thread.start()
+    pret.wait()
+    yield f"http://127.0.0.1:{etat['port']}"
+    etat['boucle'].call_soon_threadsafe(etat['tache'].cancel)
+    thread.join(5)
+
+
+@pytest.mark.performance
+def test_perf_asgi_contre_flask(serveurs, serveur_asgi, record_property):
+    """Requêtes/s à 64 clients simultanés, PointSetManager à 20 ms de latence.
+
+    300 points par PointSet.
+    """
+    rng = random.Random(15)
+    StubPointSetManager.payload = serialize_pointset(
+        [(rng.random(), rng.random()) for _ in range(300)]
+    )
+    StubPointSetManager.delai = 0.02
+    n, concurrence = 256, 64
+
+    with patch.object(triangulation_cache, 'max_bytes', 0):
+        flask_rps, flask_statuts = debit(serveurs, n, concurrence)
+    asgi_rps, asgi_statuts = debit(serveur_asgi, n, concurrence)
+
+    record_property('flask_req_par_s', round(flask_rps))
+    record_property('asgi_req_par_s', round(asgi_rps))
+    assert flask_statuts == asgi_statuts == [200] * n
+    # le gain vient des processus de calcul : il n'est mesurable
+    # qu'avec plusieurs processeurs
+    if (os.cpu_count() or 1) >= 4:
+        assert asgi_rps > flask_rps
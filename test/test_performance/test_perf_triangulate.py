@@ -1,8 +1,48 @@
-import time
+import math
+import os
 import random
+import struct
+import time
+import tracemalloc
+from array import array
+from unittest.mock import patch
+
 import pytest
-from triangulator.algorithm import triangulate
-from triangulator.serialization import serialize_pointset, deserialize_pointset, serialize_triangles, deserialize_triangles,serialize_triangles
+
+from triangulator.algorithm import (
+    DIVIDE_AND_CONQUER,
+    INCREMENTAL,
+    DelaunayMesh,
+    MeshLocator,
+    _brio_order,
+    _delaunay,
+    _hilbert_sort,
+    triangulate,
+    triangulation_delta,
+    voronoi_from_triangles,
+)
+from triangulator.models import PointSet, Triangles
+from triangulator.predicates import (
+    _incircle_exact,
+    _orient2d_exact,
+    incircle,
+    orient2d,
+)
+from triangulator.serialization import (
+    compress_pointset,
+    compress_triangles,
+    decompress_pointset,
+    decompress_triangles,
+    deserialize_pointset,
+    deserialize_triangles,
+    map_triangles_file,
+    serialize_delta,
+    serialize_pointset,
+    serialize_triangles,
+    serialize_triangles_stream,
+    serialize_voronoi,
+    write_triangles_file,
+)
 
 
 @pytest.mark.performance
@@ -50,6 +90,66 @@ def test_perf_triangulate_1000_points():
     assert duration < 60.0
 
 
+@pytest.mark.performance
+def test_perf_triangulate_scaling(record_property):
+    """Le temps par point doit croître comme log(n), pas comme n."""
+    rng = random.Random(0)
+    par_point = {}
+    for n in (1000, 10000, 100000):
+        points = [(rng.random() * 1000, rng.random() * 1000) for _ in range(n)]
+        start = time.perf_counter()
+        triangulate(points)
+        par_point[n] = (time.perf_counter() - start) / (n * math.log2(n))
+
+    for n, t in par_point.items():
+        record_property(f'{n}_points_us', round(t * 1e6, 2))
+    assert par_point[100000] < 2 * par_point[1000]
+
+
+def points_uniformes(n, rng):
+    """Points répartis uniformément dans un carré."""
+    return [(rng.random() * 1000, rng.random() * 1000) for _ in range(n)]
+
+
+def points_groupes(n, rng):
+    """Points regroupés autour de 10 centres, comme les jeux du PointSetManager."""
+    centres = [(rng.random() * 1000, rng.random() * 1000) for _ in range(10)]
+    points = set()
+    while len(points) < n:
+        cx, cy = rng.choice(centres)
+        points.add((rng.gauss(cx, 5), rng.gauss(cy, 5)))
+    return list(points)
+
+
+def points_grille(n, rng):
+    """Grille régulière d'environ n points."""
+    cote = int(n ** 0.5)
+    return [(float(x), float(y)) for x in range(cote) for y in range(cote)]
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize(
+    "generateur", [points_uniformes, points_groupes, points_grille]
+)
+def test_perf_ordre_insertion(generateur, record_property):
+    """Ordre BRIO + marche contre l'ordre de la requête."""
+    points = generateur(10000, random.Random(1))
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+
+    start = time.perf_counter()
+    _delaunay(xs, ys, list(range(len(points))))
+    ordre_requete = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _delaunay(xs, ys, _brio_order(xs, ys))
+    ordre_brio = time.perf_counter() - start
+
+    record_property('ordre_requete_s', round(ordre_requete, 3))
+    record_property('ordre_brio_s', round(ordre_brio, 3))
+    assert ordre_brio < ordre_requete
+
+
 @pytest.mark.performance
 def test_perf_serialize_pointset_large():
     """Test seralisation avec 10000 points"""
@@ -108,4 +208,479 @@ def test_perf_roundtrip_large():
     duration = time.time() - start
     
     # print(f"\nTemps: {duration:.6f}s")
-    assert duration < 1.0
\ No newline at end of file
+    assert duration < 1.0
+
+
+def serialize_pointset_origine(points):
+    """serialize_pointset d'avant les modèles sur tableaux, recopiée telle quelle."""
+    num_points = len(points)
+    data = struct.pack('<I', num_points)
+
+    for x, y in points:
+        data += struct.pack('<ff', x, y)
+
+    return data
+
+
+def deserialize_pointset_origine(data):
+    """deserialize_pointset d'avant les modèles sur tableaux, recopiée telle quelle."""
+    if len(data) < 4:
+        raise ValueError("Data too short to contain point count")
+
+    num_points = struct.unpack('<I', data[:4])[0]
+    expected_length = 4 + num_points * 8
+
+    if len(data) != expected_length:
+        raise ValueError(
+            f"Invalid data length: expected {expected_length}, got {len(data)}"
+        )
+
+    points = []
+    offset = 4
+
+    for _ in range(num_points):
+        x, y = struct.unpack('<ff', data[offset:offset + 8])
+        points.append((x, y))
+        offset += 8
+
+    return points
+
+
+@pytest.mark.performance
+def test_perf_debit_serialisation_million(record_property):
+    """Lecture puis réécriture des points reçus contre les fonctions d'origine.
+
+    Le débit est aussi mesuré sur 10^6 points. L'ancienne sérialisation concatène des
+    bytes, son coût est quadratique : la comparaison est faite sur 2.10^4 points, où
+    elle dure encore moins d'une seconde.
+    """
+    rng = random.Random(9)
+    petit = [(rng.random() * 1000, rng.random() * 1000) for _ in range(20000)]
+    recu_petit = serialize_pointset_origine(petit)
+    n = 1000000
+    points = PointSet([(rng.random() * 1000, rng.random() * 1000) for _ in range(n)])
+    recu = serialize_pointset(points)
+
+    # exécutions alternées, on garde la meilleure de chaque
+    # variante pour limiter le bruit
+    temps = {cle: float("inf") for cle in ("origine", "tableaux", "million", "doubles")}
+    for _ in range(3):
+        start = time.perf_counter()
+        renvoye_origine = serialize_pointset_origine(
+            deserialize_pointset_origine(recu_petit)
+        )
+        temps["origine"] = min(temps["origine"], time.perf_counter() - start)
+
+        start = time.perf_counter()
+        renvoye_petit = serialize_pointset(deserialize_pointset(recu_petit))
+        temps["tableaux"] = min(temps["tableaux"], time.perf_counter() - start)
+
+        start = time.perf_counter()
+        renvoye = serialize_pointset(deserialize_pointset(recu))
+        temps["million"] = min(temps["million"], time.perf_counter() - start)
+
+        start = time.perf_counter()
+        serialize_pointset(points)
+        temps["doubles"] = min(temps["doubles"], time.perf_counter() - start)
+
+    for nom, duree in temps.items():
+        record_property(f'{nom}_s', round(duree, 5))
+    assert renvoye_petit == renvoye_origine == recu_petit
+    assert renvoye == recu
+    assert temps["tableaux"] * 10 < temps["origine"]
+    assert temps["million"] < 1.0
+    assert temps["doubles"] < 2.0
+
+
+@pytest.mark.performance
+def test_perf_reponse_par_morceaux(record_property):
+    """Mémoire crête et temps jusqu'au premier octet d'une réponse de 10^6 points.
+
+    Buffer complet contre morceaux.
+    """
+    rng = random.Random(10)
+    n = 1000000
+    sommets = deserialize_pointset(
+        serialize_pointset([(rng.random(), rng.random()) for _ in range(n)])
+    )
+    maillage = Triangles(sommets, array('I', (rng.randrange(n) for _ in range(6 * n))))
+
+    def complet():
+        start = time.perf_counter()
+        data = serialize_triangles(sommets, maillage)
+        premier_octet = time.perf_counter() - start
+        return premier_octet, len(data)
+
+    def par_morceaux():
+        start = time.perf_counter()
+        chunks = serialize_triangles_stream(sommets, maillage)
+        taille = len(next(chunks))
+        premier_octet = time.perf_counter() - start
+        return premier_octet, taille + sum(len(chunk) for chunk in chunks)
+
+    tracemalloc.start()
+    premier_octet_complet, taille_complet = complet()
+    crete_complet = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    premier_octet_morceaux, taille_morceaux = par_morceaux()
+    crete_morceaux = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    record_property('crete_complet_octets', crete_complet)
+    record_property('crete_morceaux_octets', crete_morceaux)
+    assert taille_complet == taille_morceaux
+    assert crete_morceaux * 10 < crete_complet
+    assert premier_octet_morceaux < premier_octet_complet
+
+
+@pytest.mark.performance
+def test_perf_cache_cercles(record_property):
+    """Temps par point avec et sans cercle circonscrit mémorisé par triangle."""
+    rng = random.Random(4)
+    n = 20000
+    xs = [rng.random() * 1000 for _ in range(n)]
+    ys = [rng.random() * 1000 for _ in range(n)]
+    ordre = _brio_order(xs, ys)
+
+    # exécutions alternées, on garde la meilleure de chaque
+    # variante pour limiter le bruit
+    par_point = {False: float("inf"), True: float("inf")}
+    for _ in range(5):
+        for cache in (False, True):
+            start = time.perf_counter()
+            _delaunay(xs, ys, ordre, cache_circles=cache)
+            par_point[cache] = min(par_point[cache], (time.perf_counter() - start) / n)
+
+    record_property('sans_cache_us_par_point', round(par_point[False] * 1e6, 2))
+    record_property('avec_cache_us_par_point', round(par_point[True] * 1e6, 2))
+    record_property('acceleration', round(par_point[False] / par_point[True], 2))
+    assert par_point[True] < par_point[False]
+
+
+@pytest.mark.performance
+def test_perf_predicats_robustes(record_property):
+    """Coût du filtre des prédicats robustes face aux flottants seuls.
+
+    Sur des points quelconques le filtre tranche presque toujours en flottants : le
+    taux de repli en arithmétique exacte, qui ne dépend pas de la charge de la machine,
+    est vérifié de près ; le temps ne l'est que largement.
+    """
+    rng = random.Random(6)
+    n = 20000
+    xs = [rng.random() * 1000 for _ in range(n)]
+    ys = [rng.random() * 1000 for _ in range(n)]
+    ordre = _brio_order(xs, ys)
+
+    with (
+        patch('triangulator.algorithm.orient2d', wraps=orient2d) as orient,
+        patch('triangulator.algorithm.incircle', wraps=incircle) as cercle,
+        patch(
+            'triangulator.predicates._orient2d_exact', wraps=_orient2d_exact
+        ) as orient_exact,
+        patch(
+            'triangulator.predicates._incircle_exact', wraps=_incircle_exact
+        ) as cercle_exact,
+    ):
+        _delaunay(xs, ys, ordre, robust=True)
+    appels = orient.call_count + cercle.call_count
+    replis = orient_exact.call_count + cercle_exact.call_count
+
+    # exécutions alternées, on garde la meilleure de chaque
+    # variante pour limiter le bruit
+    temps = {False: float("inf"), True: float("inf")}
+    for _ in range(5):
+        for robust in (False, True):
+            start = time.perf_counter()
+            _delaunay(xs, ys, ordre, robust=robust)
+            temps[robust] = min(temps[robust], time.perf_counter() - start)
+
+    record_property('appels_predicats', appels)
+    record_property('replis_exacts', replis)
+    record_property('flottants_s', round(temps[False], 3))
+    record_property('robustes_s', round(temps[True], 3))
+    assert appels > n
+    assert replis <= appels // 10000
+    assert temps[True] < 2 * temps[False]
+
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize(
+    "generateur", [points_uniformes, points_groupes, points_grille]
+)
+def test_perf_incremental_contre_division(generateur, record_property):
+    """Comparaison des deux algorithmes sur 10000 points."""
+    points = generateur(10000, random.Random(8))
+    temps = {}
+    for methode in (INCREMENTAL, DIVIDE_AND_CONQUER):
+        start = time.perf_counter()
+        triangulate(points, methode)
+        temps[methode] = time.perf_counter() - start
+
+    for methode, duree in temps.items():
+        record_property(f'{methode}_s', round(duree, 3))
+    assert max(temps.values()) < 10.0
+
+
+
+@pytest.mark.performance
+def test_perf_triangulation_parallele(record_property):
+    """Accélération du mode parallèle en fonction du nombre de processus."""
+    rng = random.Random(9)
+    points = points_uniformes(30000, rng)
+
+    start = time.perf_counter()
+    reference = triangulate(points, DIVIDE_AND_CONQUER)
+    serie = time.perf_counter() - start
+
+    acceleration = {}
+    for workers in (2, 4):
+        start = time.perf_counter()
+        triangles = triangulate(points, parallel_threshold=0, workers=workers)
+        acceleration[workers] = serie / (time.perf_counter() - start)
+        assert len(triangles) == len(reference)
+
+    record_property('serie_s', round(serie, 2))
+    for workers, valeur in acceleration.items():
+        record_property(f'acceleration_{workers}_processus', round(valeur, 2))
+    if (os.cpu_count() or 1) >= 4:
+        assert acceleration[4] > 1.5
+
+
+
+def octets_alloues(construire):
+    """Mesure la mémoire retenue par l'objet construit."""
+    tracemalloc.start()
+    avant = tracemalloc.get_traced_memory()[0]
+    objet = construire()
+    apres = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objet
+    return apres - avant
+
+
+@pytest.mark.performance
+def test_perf_memoire_modeles(record_property):
+    """Octets par point et par triangle : listes de tuples contre tableaux compacts."""
+    rng = random.Random(10)
+    n = 100000
+    coords = [rng.random() * 1000 for _ in range(2 * n)]
+    indices = [rng.randrange(n) for _ in range(6 * n)]
+
+    points_liste = (
+        octets_alloues(
+            lambda: [(coords[2 * i] + 0.0, coords[2 * i + 1] + 0.0) for i in range(n)]
+        )
+        / n
+    )
+    points_tableau = (
+        octets_alloues(lambda: PointSet.from_coords(array('f', coords))) / n
+    )
+    triangles_liste = octets_alloues(
+        lambda: [
+            (indices[3 * t] + n, indices[3 * t + 1] + n, indices[3 * t + 2] + n)
+            for t in range(2 * n)
+        ]
+    ) / (2 * n)
+    triangles_tableau = octets_alloues(
+        lambda: Triangles(PointSet(), array('I', indices))
+    ) / (2 * n)
+
+    record_property('octets_par_point', round(points_tableau, 1))
+    record_property('octets_par_triangle', round(triangles_tableau, 1))
+    assert points_tableau <= 9
+    assert triangles_tableau <= 13
+    assert points_liste > 4 * points_tableau
+    assert triangles_liste > 4 * triangles_tableau
+
+
+@pytest.mark.performance
+def test_perf_compression_maillages(record_property):
+    """Taux de compression de DELTA_ENCODING sur des maillages réalistes."""
+    rng = random.Random(11)
+    cote = 300
+    grille = [
+        (x + rng.random() * 0.3, y + rng.random() * 0.3)
+        for y in range(cote)
+        for x in range(cote)
+    ]
+    gps = [
+        (45.0 + rng.gauss(0, 0.05), 5.0 + rng.gauss(0, 0.05))
+        for _ in range(cote * cote)
+    ]
+    ordre = _hilbert_sort(
+        list(range(len(gps))), [x for x, _ in gps], [y for _, y in gps]
+    )
+    maillages = {
+        "grille": grille,
+        "gps (ordre de Hilbert)": [gps[i] for i in ordre],
+        "gps (ordre aleatoire)": gps,
+    }
+
+    taux = {}
+    for nom, points in maillages.items():
+        binary = serialize_triangles(points, triangulate(points))
+        compresse = compress_triangles(binary)
+        assert decompress_triangles(compresse) == binary
+
+        pointset = serialize_pointset(points)
+        assert decompress_pointset(compress_pointset(pointset)) == pointset
+        taux[nom] = len(compresse) / len(binary)
+        record_property(f'taux {nom}', round(taux[nom], 2))
+
+    # les écarts d'indices ne sont petits que si les points sont ordonnés dans l'espace
+    assert taux["grille"] < 0.35
+    assert taux["gps (ordre de Hilbert)"] < 0.45
+    assert taux["gps (ordre aleatoire)"] < 0.9
+
+
+@pytest.mark.performance
+def test_perf_fichier_projete(tmp_path, record_property):
+    """Mémoire crête pour persister puis relire un maillage de 10^6 points.
+
+    En mémoire contre fichier projeté.
+    """
+    rng = random.Random(12)
+    n = 1000000
+    sommets = deserialize_pointset(
+        serialize_pointset([(rng.random(), rng.random()) for _ in range(n)])
+    )
+    maillage = Triangles(sommets, array('I', (rng.randrange(n) for _ in range(6 * n))))
+    chemin = str(tmp_path / 'maillage.bin')
+
+    tracemalloc.start()
+    relus = deserialize_triangles(serialize_triangles(sommets, maillage))
+    crete_memoire = tracemalloc.get_traced_memory()[1]
+    del relus
+    tracemalloc.reset_peak()
+    write_triangles_file(chemin, sommets, maillage)
+    projetes, triangles = map_triangles_file(chemin)
+    crete_fichier = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    record_property('crete_memoire_octets', crete_memoire)
+    record_property('crete_fichier_octets', crete_fichier)
+    assert len(triangles) == len(maillage)
+    assert triangles[12345] == maillage[12345]
+    assert projetes[n - 1] == sommets[n - 1]
+    assert crete_fichier * 10 < crete_memoire
+
+
+@pytest.mark.performance
+def test_perf_maillage_incremental(record_property):
+    """Ajout et suppression de 300 points dans un maillage de 10^5 points.
+
+    Comparés à un recalcul complet.
+    """
+    rng = random.Random(13)
+    points = [(rng.random(), rng.random()) for _ in range(100000)]
+    ajouts = [(rng.random(), rng.random()) for _ in range(300)]
+    maillage = DelaunayMesh.restore(serialize_triangles(points, triangulate(points)))
+
+    start = time.perf_counter()
+    maillage.insert(ajouts)
+    duree_insertion = time.perf_counter() - start
+    start = time.perf_counter()
+    for index in rng.sample(range(len(points)), 300):
+        maillage.remove(index)
+    duree_suppression = time.perf_counter() - start
+    start = time.perf_counter()
+    triangulate(points + ajouts)
+    duree_complete = time.perf_counter() - start
+
+    record_property('ajouts_s', round(duree_insertion, 3))
+    record_property('suppressions_s', round(duree_suppression, 3))
+    record_property('triangulation_complete_s', round(duree_complete, 3))
+    assert duree_insertion * 20 < duree_complete
+    assert duree_suppression * 10 < duree_complete
+
+
+@pytest.mark.performance
+def test_perf_difference_triangulations(record_property):
+    """Nouvelle version d'un PointSet de 10^5 points dont 1 % des points change.
+
+    Différence contre résultat complet.
+    """
+    rng = random.Random(14)
+    n = 100000
+    points = deserialize_pointset(
+        serialize_pointset([(rng.random(), rng.random()) for _ in range(n)])
+    )
+    base = serialize_triangles(points, triangulate(points))
+    nouveaux = list(points)[n // 200 :] + [
+        (rng.random(), rng.random()) for _ in range(n // 200)
+    ]
+    nouveaux = deserialize_pointset(serialize_pointset(nouveaux))
+
+    start = time.perf_counter()
+    difference = serialize_delta(
+        triangulation_delta(deserialize_triangles(base)[1], nouveaux)
+    )
+    duree_difference = time.perf_counter() - start
+    start = time.perf_counter()
+    complet = serialize_triangles(nouveaux, triangulate(nouveaux))
+    duree_complete = time.perf_counter() - start
+
+    record_property('difference_octets', len(difference))
+    record_property('complet_octets', len(complet))
+    record_property('difference_s', round(duree_difference, 2))
+    assert len(difference) * 20 < len(complet)
+    assert duree_difference < duree_complete
+
+
+@pytest.mark.performance
+def test_perf_localisation(record_property):
+    """Localisation de 10^4 points dans un maillage de 10^5 points.
+
+    Index contre parcours linéaire des triangles.
+    """
+    rng = random.Random(15)
+    points = [(rng.random(), rng.random()) for _ in range(100000)]
+    triangles = triangulate(points)
+    requetes = [(rng.random(), rng.random()) for _ in range(10000)]
+
+    start = time.perf_counter()
+    locator = MeshLocator(triangles)
+    duree_index = time.perf_counter() - start
+    start = time.perf_counter()
+    positions, _ = locator.query_all(requetes)
+    duree_requetes = time.perf_counter() - start
+
+    # parcours linéaire, comme le font les clients, sur quelques requêtes seulement
+    start = time.perf_counter()
+    for (x, y), position in zip(requetes[:5], positions, strict=False):
+        trouve = next(p for p, (a, b, c) in enumerate(triangles)
+                      if all((points[w][0] - points[u][0]) * (y - points[u][1])
+                             - (points[w][1] - points[u][1]) * (x - points[u][0]) >= 0
+                             for u, w in ((a, b), (b, c), (c, a))))
+        assert trouve == position
+    duree_lineaire = (time.perf_counter() - start) / 5
+
+    par_requete = duree_requetes / len(requetes)
+    record_property('index_s', round(duree_index, 2))
+    record_property('us_par_requete', round(par_requete * 1e6))
+    assert par_requete * 100 < duree_lineaire
+    assert duree_index < 10
+
+
+@pytest.mark.performance
+def test_perf_voronoi(record_property):
+    """Diagramme de Voronoi de 10^5 points dérivé de la triangulation.
+
+    Temps linéaire, bien moins qu'une triangulation.
+    """
+    rng = random.Random(16)
+    durees = {}
+    for n in (25000, 100000):
+        points = [(rng.random(), rng.random()) for _ in range(n)]
+        start = time.perf_counter()
+        triangles = triangulate(points)
+        duree_triangulation = time.perf_counter() - start
+        start = time.perf_counter()
+        serialize_voronoi(voronoi_from_triangles(triangles))
+        durees[n] = time.perf_counter() - start
+        record_property(f'{n}_points_s', round(durees[n], 2))
+        assert durees[n] * 2 < duree_triangulation
+
+    # 4 fois plus de points : environ 4 fois plus de temps
+    assert durees[100000] < 6 * durees[25000]
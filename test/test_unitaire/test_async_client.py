@@ -0,0 +1,142 @@
+"""Tests du client asyncio du PointSetManager."""
+import asyncio
+
+import pytest
+from requests import HTTPError
+
+from triangulator.async_client import AsyncPointSetManagerClient
+from triangulator.serialization import serialize_pointset
+
+
+def avec_serveur(reponses, scenario, requetes=None):
+    """Lance un serveur qui renvoie les reponses brutes, puis execute scenario(client).
+
+    Une reponse None ferme la connexion sans repondre ; les lignes de requete
+    recues sont ajoutees a requetes.
+    """
+    connexions = []
+
+    async def traiter(reader, writer):
+        connexions.append(writer)
+        while reponses:
+            ligne = await reader.readline()
+            if not ligne:
+                break
+            if requetes is not None:
+                requetes.append(ligne)
+            while (await reader.readline()) not in (b'\r\n', b''):
+                pass
+            brute = reponses.pop(0)
+            if brute is None:
+                break
+            writer.write(brute)
+            await writer.drain()
+        writer.close()
+
+    async def principal():
+        serveur = await asyncio.start_server(traiter, '127.0.0.1', 0)
+        client = AsyncPointSetManagerClient(f'http://127.0.0.1:{serveur.sockets[0].getsockname()[1]}')
+        try:
+            return await scenario(client)
+        finally:
+            await client.close()
+            serveur.close()
+
+    return asyncio.run(principal()), connexions
+
+
+def reponse(status, corps=b'', entetes=b''):
+    """Reponse HTTP/1.1 brute avec Content-Length."""
+    return (
+        f'HTTP/1.1 {status} X\r\nContent-Length: {len(corps)}\r\n'.encode()
+        + entetes
+        + b'\r\n'
+        + corps
+    )
+
+
+def test_async_get_pointset_keep_alive():
+    """Deux lectures reutilisent la meme connexion."""
+    binary = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+
+    async def scenario(client):
+        return [
+            list(await client.get_pointset('a')),
+            await client.get_pointset_payload('b'),
+        ]
+
+    (points, payload), connexions = avec_serveur(
+        [reponse(200, binary), reponse(200, binary)], scenario
+    )
+
+    assert points == [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
+    assert payload == binary
+    assert len(connexions) == 1
+
+
+def test_async_get_pointset_chunked():
+    """Un corps en Transfer-Encoding chunked est reassemble."""
+    binary = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+    brute = (b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+             + f'{10:x}\r\n'.encode() + binary[:10] + b'\r\n'
+             + f'{len(binary) - 10:x}\r\n'.encode() + binary[10:] + b'\r\n0\r\n\r\n')
+
+    async def scenario(client):
+        return await client.get_pointset_payload('a')
+
+    payload, _ = avec_serveur([brute], scenario)
+    assert payload == binary
+
+
+def test_async_get_pointset_not_found():
+    """Un statut d'erreur est leve avec le statut dans e.response."""
+    async def scenario(client):
+        with pytest.raises(HTTPError) as erreur:
+            await client.get_pointset_payload('absent')
+        return erreur.value.response.status_code
+
+    statut, _ = avec_serveur([reponse(404)], scenario)
+    assert statut == 404
+
+
+def test_async_get_pointset_unreachable():
+    """Une connexion refusee est signalee comme injoignable."""
+    async def scenario():
+        client = AsyncPointSetManagerClient('http://127.0.0.1:9')
+        with pytest.raises(HTTPError, match="unreachable"):
+            await client.get_pointset_payload('a')
+
+    asyncio.run(scenario())
+
+
+def test_async_get_pointset_id_encode():
+    """L'identifiant est encode : espaces et CRLF ne peuvent pas injecter de requete."""
+    requetes = []
+
+    async def scenario(client):
+        with pytest.raises(HTTPError):
+            await client.get_pointset_payload('a b\r\nGET /admin HTTP/1.1')
+
+    avec_serveur([reponse(404), reponse(200)], scenario, requetes)
+
+    assert requetes == [
+        b'GET /pointset/a%20b%0D%0AGET%20%2Fadmin%20HTTP%2F1.1 HTTP/1.1\r\n'
+    ]
+
+
+def test_async_get_pointset_connexion_perimee():
+    """Une connexion du pool fermee par le serveur est remplacee."""
+    binary = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+
+    async def scenario(client):
+        return [
+            await client.get_pointset_payload('a'),
+            await client.get_pointset_payload('b'),
+        ]
+
+    payloads, connexions = avec_serveur(
+        [reponse(200, binary), None, reponse(200, binary)], scenario
+    )
+
+    assert payloads == [binary, binary]
+    assert len(connexions) == 2
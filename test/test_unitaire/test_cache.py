@@ -0,0 +1,147 @@
+"""Tests des caches et du regroupement des calculs."""
+import threading
+import time
+
+import pytest
+
+from triangulator.cache import (
+    DiskTier,
+    SingleFlight,
+    TriangulationCache,
+    payload_digest,
+)
+
+
+def test_cache_hit_miss():
+    """Les compteurs suivent les succes et les echecs."""
+    cache = TriangulationCache(max_bytes=100)
+
+    assert cache.get('a') is None
+    cache.put('a', b'12345')
+
+    assert cache.get('a') == b'12345'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['bytes'] == 5
+
+
+def test_cache_lru_eviction():
+    """Au-dela du budget, l'entree la moins recemment utilisee est evincee."""
+    cache = TriangulationCache(max_bytes=10)
+    cache.put('a', b'aaaa')
+    cache.put('b', b'bbbb')
+    cache.get('a')
+    cache.put('c', b'cccc')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'aaaa'
+    assert cache.get('c') == b'cccc'
+    assert cache.stats()['evictions'] == 1
+    assert cache.size == 8
+
+
+def test_cache_replace_and_too_large():
+    """Remplacer une entree met a jour la taille.
+
+    Une entree plus grande que le budget n'est pas gardee.
+    """
+    cache = TriangulationCache(max_bytes=10)
+    cache.put('a', b'aaaa')
+    cache.put('a', b'aa')
+    assert cache.size == 2
+
+    cache.put('b', b'b' * 11)
+    assert cache.get('b') is None
+    assert len(cache) == 1
+
+
+def test_cache_disk_tier(tmp_path):
+    """Le niveau disque garde les entrees d'un cache a l'autre (redemarrage)."""
+    TriangulationCache(max_bytes=100, disk=DiskTier(str(tmp_path))).put('a', b'12345')
+
+    cache = TriangulationCache(max_bytes=100, disk=DiskTier(str(tmp_path)))
+    assert cache.get('a') == b'12345'
+    assert len(cache) == 1
+
+    cache.clear()
+    assert (
+        TriangulationCache(max_bytes=100, disk=DiskTier(str(tmp_path))).get('a') is None
+    )
+
+
+def test_cache_get_sans_compter():
+    """Une recherche interne ne modifie pas les compteurs."""
+    cache = TriangulationCache(max_bytes=100)
+    cache.put('a', b'1')
+
+    assert cache.get('a', count=False) == b'1'
+    assert cache.get('b', count=False) is None
+    assert cache.stats()['hits'] == cache.stats()['misses'] == 0
+
+
+def test_payload_digest():
+    """Des contenus identiques ont la meme empreinte, des contenus differents non."""
+    assert payload_digest(b'abc') == payload_digest(b'abc')
+    assert payload_digest(b'abc') != payload_digest(b'abd')
+
+
+def test_single_flight_partage():
+    """Les appels concurrents pour une meme cle attendent un seul calcul."""
+    flights = SingleFlight()
+    demarre = threading.Event()
+    libere = threading.Event()
+    calculs = []
+
+    def calcul():
+        calculs.append(1)
+        demarre.set()
+        libere.wait()
+        return 'resultat'
+
+    resultats = []
+    meneur = threading.Thread(target=lambda: resultats.append(flights.do('a', calcul)))
+    meneur.start()
+    demarre.wait()
+    suiveurs = [
+        threading.Thread(target=lambda: resultats.append(flights.do('a', calcul)))
+        for _ in range(4)
+    ]
+    for suiveur in suiveurs:
+        suiveur.start()
+    while flights.stats()['shared'] < 4:
+        time.sleep(0.001)
+    libere.set()
+    for thread in [meneur] + suiveurs:
+        thread.join()
+
+    assert resultats == ['resultat'] * 5
+    assert len(calculs) == 1
+    assert flights.stats() == {'calls': 5, 'shared': 4, 'in_flight': 0}
+
+
+def test_single_flight_erreur():
+    """Une exception est relevee et la cle est liberee pour le calcul suivant."""
+    flights = SingleFlight()
+
+    def echec():
+        raise ValueError('echec')
+
+    with pytest.raises(ValueError):
+        flights.do('a', echec)
+    assert flights.do('a', lambda: 1) == 1
+
+
+def test_disk_tier_projection(tmp_path, monkeypatch):
+    """Une grande entree du niveau disque est une vue projetee, ecrite par morceaux."""
+    import triangulator.cache as cache_module
+    monkeypatch.setattr(cache_module, 'MMAP_MIN_BYTES', 8)
+    disque = DiskTier(str(tmp_path))
+
+    assert disque.put_chunks('grand', (b'0123', b'4567', b'89')) == 10
+    disque.put('petit', b'0123')
+
+    grand = disque.get('grand')
+    assert isinstance(grand, memoryview)
+    assert grand == b'0123456789'
+    assert disque.get('petit') == b'0123'
+    assert TriangulationCache(max_bytes=5, disk=disque).get('grand') == b'0123456789'
@@ -5,7 +5,7 @@ from triangulator.client import PointSetManagerClient
 from requests import HTTPError, Timeout, ConnectionError
 
 
-@patch('triangulator.client.requests.get')
+@patch('triangulator.client.requests.Session.get')
 def test_get_pointset_success_simple(mock_get):
     points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
     binary = serialize_pointset(points)
@@ -24,7 +24,7 @@ def test_get_pointset_success_simple(mock_get):
     assert result[2] == (0.5, 1.0)
 
 
-@patch('triangulator.client.requests.get')
+@patch('triangulator.client.requests.Session.get')
 def test_get_pointset_timeout(mock_get):
     mock_get.side_effect = Timeout()
     
@@ -34,7 +34,7 @@ def test_get_pointset_timeout(mock_get):
         client.get_pointset("timeout-id")
 
 
-@patch('triangulator.client.requests.get')
+@patch('triangulator.client.requests.Session.get')
 def test_get_pointset_network_unreachable(mock_get):
     """Test avec réseau non disponible."""
     mock_get.side_effect = ConnectionError("Network is unreachable")
@@ -47,7 +47,7 @@ def test_get_pointset_network_unreachable(mock_get):
 
 
 
-@patch('triangulator.client.requests.get')
+@patch('triangulator.client.requests.Session.get')
 def test_get_pointset_unexpected_status_code(mock_get):
     """Test avec un code de statut inattendu (non 200, mais pas d'exception)."""
     mock_response = Mock()
@@ -59,3 +59,78 @@ def test_get_pointset_unexpected_status_code(mock_get):
     with pytest.raises(HTTPError, match="Unexpected status: 202"):
         client.get_pointset("weird-status-id")
 
+
+@patch('triangulator.client.requests.Session.get')
+def test_get_pointset_payload(mock_get):
+    """Les octets recus sont retournes tels quels, sans decodage."""
+    binary = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.content = binary
+    mock_get.return_value = mock_response
+
+    client = PointSetManagerClient("http://localhost:5000")
+
+    assert client.get_pointset_payload("test-id-123") is binary
+    mock_get.assert_called_once_with(
+        "http://localhost:5000/pointset/test-id-123", timeout=(2.0, 5.0)
+    )
+
+
+def test_client_session_configuration():
+    """La session garde un pool de connexions et retente les erreurs transitoires."""
+    client = PointSetManagerClient(
+        "http://localhost:5000/",
+        connect_timeout=1.0,
+        read_timeout=3.0,
+        pool_size=20,
+        retries=4,
+        backoff_factor=0.5,
+    )
+
+    adapter = client.session.get_adapter("http://localhost:5000/pointset/x")
+    assert client.base_url == "http://localhost:5000"
+    assert client.timeout == (1.0, 3.0)
+    assert adapter._pool_maxsize == 20
+    assert adapter.max_retries.total == 4
+    assert adapter.max_retries.backoff_factor == 0.5
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_client_retry_then_unreachable():
+    """Une connexion refusee est signalee injoignable apres les nouvelles tentatives."""
+    client = PointSetManagerClient("http://127.0.0.1:9", retries=1, backoff_factor=0)
+
+    with pytest.raises(HTTPError, match="unreachable"):
+        client.get_pointset("refused-id")
+
+
+@patch('triangulator.client.requests.Session.get')
+def test_get_pointset_conditional(mock_get):
+    """Requete conditionnelle : 200 avec l'ETag, puis 304 sans corps."""
+    binary = serialize_pointset([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)])
+    client = PointSetManagerClient("http://localhost:5000")
+
+    mock_get.return_value = Mock(
+        status_code=200, content=binary, headers={'ETag': '"v1"'}
+    )
+    assert client.get_pointset_payload_if_none_match("test-id-123") == (binary, '"v1"')
+
+    mock_get.return_value = Mock(status_code=304, headers={'ETag': '"v1"'})
+    assert client.get_pointset_payload_if_none_match("test-id-123", '"v1"') == (
+        None,
+        '"v1"',
+    )
+    mock_get.assert_called_with("http://localhost:5000/pointset/test-id-123",
+                                headers={'If-None-Match': '"v1"'}, timeout=(2.0, 5.0))
+
+
+@patch('triangulator.client.requests.Session.get')
+def test_get_pointset_304_sans_etag(mock_get):
+    """Un 304 a une requete non conditionnelle est un statut inattendu."""
+    mock_get.return_value = Mock(status_code=304, headers={})
+    client = PointSetManagerClient("http://localhost:5000")
+
+    with pytest.raises(HTTPError, match="Unexpected status: 304"):
+        client.get_pointset_payload("test-id-123")
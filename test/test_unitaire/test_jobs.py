@@ -0,0 +1,116 @@
+"""Tests du gestionnaire de jobs."""
+import threading
+import time
+
+import pytest
+
+from triangulator.jobs import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    PENDING,
+    Job,
+    JobCancelled,
+    JobManager,
+    JobQueueFull,
+)
+
+
+def attendre(job, timeout=5.0):
+    """Attend la fin d'un job."""
+    fin = time.monotonic() + timeout
+    while job.state in (PENDING, 'running') and time.monotonic() < fin:
+        time.sleep(0.01)
+    return job.state
+
+
+def test_job_termine():
+    """Le resultat du calcul est garde dans le job."""
+    manager = JobManager(max_workers=1, max_pending=1, max_retained=10)
+    job = manager.submit(Job('a' * 36, 'incremental'), lambda job: b'resultat')
+
+    assert attendre(job) == DONE
+    assert job.result == b'resultat'
+    assert manager.get(job.id) is job
+    assert manager.stats()[DONE] == 1
+
+
+def test_job_echec():
+    """L'exception du calcul est gardee dans le job."""
+    manager = JobManager(max_workers=1, max_pending=1, max_retained=10)
+
+    def echec(job):
+        raise ValueError("boom")
+
+    job = manager.submit(Job('a' * 36, 'incremental'), echec)
+
+    assert attendre(job) == FAILED
+    assert isinstance(job.error, ValueError)
+
+
+def test_job_annulation_en_cours():
+    """Un job en cours s'arrete au prochain suivi de progression."""
+    manager = JobManager(max_workers=1, max_pending=1, max_retained=10)
+    demarre = threading.Event()
+
+    def calcul(job):
+        demarre.set()
+        for i in range(1000):
+            job.progress(i, 1000)
+            time.sleep(0.01)
+        return b''
+
+    job = manager.submit(Job('a' * 36, 'incremental'), calcul)
+    assert demarre.wait(5)
+    manager.cancel(job.id)
+
+    assert attendre(job) == CANCELLED
+    assert job.result is None
+    assert 0 < job.to_dict()['progress']['inserted'] < 1000
+
+
+def test_job_annulation_en_attente():
+    """Un job en attente ne demarre pas, et la file est bornee."""
+    manager = JobManager(max_workers=1, max_pending=1, max_retained=10)
+    libre = threading.Event()
+    premier = manager.submit(
+        Job('a' * 36, 'incremental'), lambda job: libre.wait(5) and b''
+    )
+    second = manager.submit(Job('b' * 36, 'incremental'), lambda job: b'second')
+
+    with pytest.raises(JobQueueFull):
+        manager.submit(Job('c' * 36, 'incremental'), lambda job: b'')
+
+    manager.cancel(second.id)
+    libre.set()
+    assert attendre(premier) == DONE
+    assert attendre(second) == CANCELLED
+    assert second.result is None
+
+
+def test_job_progress_annule():
+    """Progress leve JobCancelled apres une demande d'annulation."""
+    manager = JobManager(max_workers=1, max_pending=0, max_retained=10)
+    libre = threading.Event()
+    job = manager.submit(
+        Job('a' * 36, 'incremental'), lambda job: libre.wait(5) and b''
+    )
+    manager.cancel(job.id)
+
+    with pytest.raises(JobCancelled):
+        job.progress(1, 2)
+    libre.set()
+    assert attendre(job) == CANCELLED
+
+
+def test_jobs_termines_retenus():
+    """Seuls les max_retained derniers jobs termines restent consultables."""
+    manager = JobManager(max_workers=1, max_pending=10, max_retained=2)
+    jobs = []
+    for _ in range(4):
+        jobs.append(manager.submit(Job('a' * 36, 'incremental'), lambda job: b''))
+        attendre(jobs[-1])
+
+    assert manager.get(jobs[0].id) is None
+    assert manager.get(jobs[1].id) is jobs[1]
+    assert manager.get(jobs[3].id) is jobs[3]
@@ -1,4 +1,8 @@
-from triangulator.models import PointSet,Triangles
+from array import array
+
+import pytest
+
+from triangulator.models import PointSet, Triangles
 
 
 def test_Pointset():
@@ -12,4 +16,37 @@ def test_Triangles():
     points=[(0,0),(1,0),(0,1)]
     triangle=[(0,1,2)]
     triangles=Triangles(points,triangle)
-    assert triangles.__len__()==1
\ No newline at end of file
+    assert triangles.__len__()==1
+
+
+def test_Pointset_tableau_compact():
+    """Les coordonnées sont gardées dans un tableau compact."""
+    pointset = PointSet([(0.5, 1.5), (2.0, -3.0)])
+    assert pointset.coords == array('d', [0.5, 1.5, 2.0, -3.0])
+    assert pointset[-1] == (2.0, -3.0)
+    assert list(pointset) == [(0.5, 1.5), (2.0, -3.0)]
+    assert pointset.xs == [0.5, 2.0] and pointset.ys == [1.5, -3.0]
+    with pytest.raises(IndexError):
+        pointset[2]
+    with pytest.raises(AttributeError):
+        pointset.points = []
+
+
+def test_Pointset_from_coords_sans_copie():
+    """from_coords reprend le tableau de coordonnées sans le copier."""
+    coords = array('f', [1.0, 2.0, 3.0, 4.0])
+    pointset = PointSet.from_coords(coords)
+    assert pointset.coords is coords
+    assert PointSet(pointset).coords is coords
+    assert len(pointset) == 2
+
+
+def test_Triangles_tableau_compact():
+    """Les indices des triangles sont gardés dans un tableau compact."""
+    triangles = Triangles([(0, 0), (1, 0), (0, 1), (1, 1)], [(0, 1, 2), (1, 3, 2)])
+    assert triangles.indices == array('I', [0, 1, 2, 1, 3, 2])
+    assert isinstance(triangles.vertices, PointSet)
+    assert triangles[1] == (1, 3, 2) and triangles[-2] == (0, 1, 2)
+    assert list(triangles) == [(0, 1, 2), (1, 3, 2)]
+    with pytest.raises(IndexError):
+        triangles[2]
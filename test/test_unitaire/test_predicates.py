@@ -0,0 +1,72 @@
+"""Tests des prédicats géométriques robustes."""
+import random
+from fractions import Fraction
+
+from triangulator.predicates import incircle, incircle_fast, orient2d, orient2d_fast
+
+
+def signe(valeur):
+    """Retourne le signe d'un nombre : -1, 0 ou 1."""
+    return (valeur > 0) - (valeur < 0)
+
+
+def orient_exact(ax, ay, bx, by, cx, cy):
+    """Signe exact du déterminant d'orientation, calculé en rationnels."""
+    ax, ay, bx, by, cx, cy = (Fraction(c) for c in (ax, ay, bx, by, cx, cy))
+    return signe((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def test_orient2d_cas_simples():
+    """Sens trigonométrique, sens horaire et points colinéaires."""
+    assert orient2d(0, 0, 1, 0, 0, 1) > 0
+    assert orient2d(0, 0, 0, 1, 1, 0) < 0
+    assert orient2d(1, 2, 3, 6, 5, 10) == 0
+
+
+def test_orient2d_presque_colineaires():
+    """Petites perturbations autour d'une droite : le signe doit être le signe exact."""
+    rng = random.Random(0)
+    faux_en_flottants = 0
+    for _ in range(2000):
+        ax, ay = 0.5 + rng.randrange(64) * 2.0**-53, 0.5 + rng.randrange(64) * 2.0**-53
+        exact = orient_exact(ax, ay, 12.0, 12.0, 24.0, 24.0)
+        assert signe(orient2d(ax, ay, 12.0, 12.0, 24.0, 24.0)) == exact
+        faux_en_flottants += (
+            signe(orient2d_fast(ax, ay, 12.0, 12.0, 24.0, 24.0)) != exact
+        )
+    assert faux_en_flottants > 0
+
+
+def test_incircle_cas_simples():
+    """Point dans, hors et sur le cercle circonscrit."""
+    assert incircle(0, 0, 2, 0, 0, 2, 1, 1) > 0
+    assert incircle(0, 0, 2, 0, 0, 2, 3, 3) < 0
+    assert incircle(0, 0, 1, 0, 1, 1, 0, 1) == 0
+
+
+def test_incircle_cocirculaires():
+    """Points sur un cercle : le filtre renvoie 0 là où les flottants hésitent."""
+    points = [
+        (0.6, 0.8),
+        (-0.8, 0.6),
+        (-0.6, -0.8),
+        (0.8, -0.6),
+        (0.28, 0.96),
+        (-0.96, 0.28),
+    ]
+    for d in points[3:]:
+        (ax, ay), (bx, by), (cx, cy) = points[:3]
+        det = incircle(ax, ay, bx, by, cx, cy, *d)
+        ecart = incircle_fast(ax, ay, bx, by, cx, cy, *d)
+        dx, dy = Fraction(d[0]), Fraction(d[1])
+        lignes = [(Fraction(x) - dx, Fraction(y) - dy) for x, y in points[:3]]
+        exact = sum(
+            (u * u + v * v)
+            * (
+                lignes[(i + 1) % 3][0] * lignes[(i + 2) % 3][1]
+                - lignes[(i + 2) % 3][0] * lignes[(i + 1) % 3][1]
+            )
+            for i, (u, v) in enumerate(lignes)
+        )
+        assert signe(det) == signe(exact)
+        assert abs(ecart) < 1e-12
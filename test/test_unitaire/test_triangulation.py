@@ -1,8 +1,63 @@
+import math
+import random
 import struct
+import tracemalloc
+import zlib
+from array import array
+from collections import Counter
+
 import pytest
-from triangulator.serialization import serialize_triangles, deserialize_triangles, serialize_pointset, deserialize_pointset
-from triangulator.algorithm import triangulate
-from triangulator.geometry import duplication_point,sont_colineaires, point_in_circumcircle
+
+from triangulator.algorithm import (
+    DIVIDE_AND_CONQUER,
+    INCREMENTAL,
+    DelaunayMesh,
+    MeshLocator,
+    _brio_order,
+    triangulate,
+    triangulation_delta,
+    voronoi_from_triangles,
+)
+from triangulator.geometry import (
+    circumcircle,
+    duplication_point,
+    duplication_point_xy,
+    point_in_circumcircle,
+    sont_colineaires,
+    sont_colineaires_xy,
+)
+from triangulator.models import PointSet, Triangles
+from triangulator.predicates import incircle, orient2d
+from triangulator.serialization import (
+    VORONOI_INFINITY,
+    BatchResult,
+    TriangulationDelta,
+    VoronoiDiagram,
+    apply_delta,
+    compress_pointset,
+    compress_triangles,
+    decompress_pointset,
+    decompress_triangles,
+    deserialize_batch,
+    deserialize_delta,
+    deserialize_locations,
+    deserialize_pointset,
+    deserialize_triangles,
+    deserialize_voronoi,
+    map_pointset_file,
+    map_triangles_file,
+    serialize_batch,
+    serialize_delta,
+    serialize_locations,
+    serialize_pointset,
+    serialize_pointset_stream,
+    serialize_triangles,
+    serialize_triangles_stream,
+    serialize_voronoi,
+    serialized_triangles_size,
+    write_pointset_file,
+    write_triangles_file,
+)
 
 
 def test_point_in_circumcircle():
@@ -107,6 +162,22 @@ def test_pointset_large_dataset():
     assert len(restored) == 1000
 
 
+def test_pointset_deserialization_sans_copie():
+    """La deserialisation garde une vue sur les octets recus, meme une memoryview."""
+    binary = bytearray(b'xx' + serialize_pointset([(1.5, 2.5), (3.0, 4.0)]))
+    restored = deserialize_pointset(memoryview(binary)[2:])
+
+    assert list(restored) == [(1.5, 2.5), (3.0, 4.0)]
+    struct.pack_into('<f', binary, 6, 9.0)
+    assert restored[0] == (9.0, 2.5)
+
+
+def test_pointset_serialization_overflow():
+    """Une coordonnee hors des float 32 bits est refusee, comme avec struct."""
+    with pytest.raises(OverflowError):
+        serialize_pointset([(1e40, 0.0)])
+
+
 # triangulation serialize
 def test_triangles_serialization_empty():
     """Test serialization with no triangles."""
@@ -187,6 +258,57 @@ def test_triangles_roundtrip():
         assert orig == rest
 
 
+@pytest.mark.parametrize("chunk_size", [1, 12, 100, 65536])
+def test_triangles_serialization_stream(chunk_size):
+    """L'encodage par morceaux produit les memes octets que serialize_triangles.
+
+    Pour des doubles comme pour des floats.
+    """
+    vertices = [(float(i), float(i * i) / 7) for i in range(50)]
+    triangles = [(i, i + 1, i + 2) for i in range(48)]
+    recus = deserialize_pointset(serialize_pointset(vertices))
+
+    for sommets in (vertices, recus):
+        chunks = list(serialize_triangles_stream(sommets, triangles, chunk_size))
+        assert b''.join(chunks) == serialize_triangles(sommets, triangles)
+        assert max(len(chunk) for chunk in chunks) <= max(chunk_size, 8)
+        assert serialized_triangles_size(sommets, triangles) == len(b''.join(chunks))
+
+
+def test_triangles_serialization_stream_overflow():
+    """Une coordonnee hors des float 32 bits est refusee avant le premier morceau."""
+    with pytest.raises(OverflowError):
+        serialize_triangles_stream([(1e40, 0.0), (0.0, 0.0), (1.0, 1.0)], [(0, 1, 2)])
+
+
+def test_batch_roundtrip():
+    """Serialisation puis deserialisation d'un lot de resultats."""
+    data = serialize_triangles([(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)], [(0, 1, 2)])
+    resultats = [
+        BatchResult('123e4567-e89b-12d3-a456-426614174000', 200, '', data),
+        BatchResult('invalid-id', 400, 'INVALID_ID', b'Invalid PointSetID format'),
+    ]
+
+    binary = serialize_batch(resultats)
+
+    assert len(binary) == 4 + (2 + 1 + 36 + 1 + 4 + len(data)) + (
+        2 + 1 + 10 + 1 + 10 + 4 + 25
+    )
+    assert deserialize_batch(binary) == resultats
+    assert deserialize_batch(serialize_batch([])) == []
+
+
+@pytest.mark.parametrize("coupe", [1, 5, 20])
+def test_batch_deserialization_truncated(coupe):
+    """Un lot tronque ou trop long est refuse."""
+    binary = serialize_batch([BatchResult('a', 404, 'NOT_FOUND', b'message')])
+
+    with pytest.raises(ValueError):
+        deserialize_batch(binary[:-coupe])
+    with pytest.raises(ValueError, match="Invalid data length"):
+        deserialize_batch(binary + b'x')
+
+
 def test_triangles_deserialization_too_short():
     """Test deserialisation donnée pas complete"""
     binary = b'abc'
@@ -312,4 +434,902 @@ def test_deserialize_triangles_truncated_triangle_data():
     # Manque le 2ème triangle (12 bytes supplémentaires attendus)
     
     with pytest.raises(ValueError, match="Invalid data length: expected"):
-        deserialize_triangles(binary)
\ No newline at end of file
+        deserialize_triangles(binary)
+
+
+def verifier_delaunay(points, triangles):
+    """Vérifie l'orientation, le cercle vide et le nombre de triangles 2n - 2 - h."""
+    for a, b, c in triangles:
+        (ax, ay), (bx, by), (cx, cy) = points[a], points[b], points[c]
+        assert orient2d(ax, ay, bx, by, cx, cy) > 0
+        for i, (px, py) in enumerate(points):
+            if i not in (a, b, c):
+                assert incircle(ax, ay, bx, by, cx, cy, px, py) <= 0
+    aretes = Counter(
+        frozenset(e) for a, b, c in triangles for e in ((a, b), (b, c), (c, a))
+    )
+    assert all(nb <= 2 for nb in aretes.values())
+    h = sum(1 for nb in aretes.values() if nb == 1)
+    assert len(triangles) == 2 * len(points) - 2 - h
+
+
+def test_triangulate_delaunay_aleatoire():
+    """Points aléatoires : le résultat vérifie la propriété de Delaunay."""
+    rng = random.Random(42)
+    for n in (3, 5, 20, 150):
+        points = [(rng.random(), rng.random()) for _ in range(n)]
+        verifier_delaunay(points, triangulate(points))
+
+
+def test_triangulate_grille():
+    """Points cocirculaires et colinéaires sur l'enveloppe convexe."""
+    points = [(float(x), float(y)) for x in range(8) for y in range(8)]
+    random.Random(3).shuffle(points)
+    triangles = triangulate(points)
+    verifier_delaunay(points, triangles)
+    assert len(triangles) == 2 * 7 * 7
+
+
+def test_triangulate_premiers_points_colineaires():
+    """Les premiers points insérés peuvent être colinéaires."""
+    points = [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0), (3.0, 0.0), (1.5, 1.0)]
+    triangles = triangulate(points)
+    verifier_delaunay(points, triangles)
+    assert len(triangles) == 3
+
+
+def test_triangulate_indices_entree():
+    """Les indices des triangles sont ceux des points reçus."""
+    points = [(0.0, 0.0), (4.0, 0.0), (0.0, 4.0), (1.0, 1.0)]
+    triangles = triangulate(points)
+    assert {i for t in triangles for i in t} == {0, 1, 2, 3}
+
+
+def test_brio_order_permutation():
+    """L'ordre BRIO est une permutation déterministe des indices."""
+    rng = random.Random(7)
+    xs = [rng.random() for _ in range(1000)]
+    ys = [rng.random() for _ in range(1000)]
+    ordre = _brio_order(xs, ys)
+    assert sorted(ordre) == list(range(1000))
+    assert ordre == _brio_order(xs, ys)
+
+
+def test_circumcircle():
+    """Centre et rayon du cercle circonscrit, erreur pour des points colinéaires."""
+    centre, rayon = circumcircle((0, 0), (2, 0), (0, 2))
+    assert centre == (1.0, 1.0)
+    assert abs(rayon - 2 ** 0.5) < 1e-12
+    with pytest.raises(ValueError, match="collinear"):
+        circumcircle((1, 2), (3, 6), (5, 10))
+
+
+def test_point_in_circumcircle_interieur(capsys):
+    """Un point intérieur est détecté, sans rien afficher."""
+    assert point_in_circumcircle((0.5, 0.5), (2, 0), (0, 2), (-2, 0))
+    assert not point_in_circumcircle((3, 3), (2, 0), (0, 2), (-2, 0))
+    assert capsys.readouterr().out == ""
+
+
+def test_validation_tableaux():
+    """Versions par tableaux de duplication_point et sont_colineaires."""
+    assert duplication_point_xy([0.0, 1.0, 0.0], [0.0, 1.0, 0.0])
+    assert not duplication_point_xy([0.0, 1.0], [0.0, 0.0])
+    assert sont_colineaires_xy([1, 3, 5, 7], [2, 6, 10, 14])
+    assert not sont_colineaires_xy([1, 3, 4], [2, 6, 18])
+    assert sont_colineaires_xy([1, 3], [2, 6])
+
+
+def test_triangulate_grille_gps():
+    """Grille GPS : nombreux points presque cocirculaires en flottants."""
+    points = [
+        (48.8566 + i * 1e-4, 2.3522 + j * 1e-4) for i in range(12) for j in range(12)
+    ]
+    random.Random(5).shuffle(points)
+    verifier_delaunay(points, triangulate(points))
+
+
+def test_triangulate_cercle():
+    """Points cocirculaires : toutes les triangulations de l'anneau sont de Delaunay."""
+    points = [(1.0, 0.0), (0.0, 1.0), (-1.0, 0.0), (0.0, -1.0), (0.6, 0.8), (-0.8, 0.6)]
+    triangles = triangulate(points)
+    verifier_delaunay(points, triangles)
+    assert len(triangles) == 4
+
+
+def aretes_illegales(points, triangles):
+    """Compte les arêtes intérieures qui ne vérifient pas la propriété de Delaunay.
+
+    Le sommet opposé voisin est strictement dans le cercle (prédicat exact).
+    """
+    opposes = {}
+    for a, b, c in triangles:
+        for u, w, o in ((a, b, c), (b, c, a), (c, a, b)):
+            opposes[(u, w)] = o
+    illegales = 0
+    for (u, w), o in opposes.items():
+        p = opposes.get((w, u))
+        if p is not None:
+            (ax, ay), (bx, by), (cx, cy), (px, py) = (
+                points[u],
+                points[w],
+                points[o],
+                points[p],
+            )
+            illegales += incircle(ax, ay, bx, by, cx, cy, px, py) > 0
+    return illegales
+
+
+@pytest.mark.parametrize("decalage", [1e3, 1e6])
+def test_triangulate_coordonnees_decalees(decalage):
+    """Points presque cocirculaires loin de l'origine.
+
+    Le filtre du cercle mémorisé doit rendre la main à incircle.
+    """
+    cercle = [
+        (
+            decalage + math.cos(2 * math.pi * i / 400),
+            decalage + math.sin(2 * math.pi * i / 400),
+        )
+        for i in range(400)
+    ]
+    rng = random.Random(1)
+    grille = [
+        (
+            decalage + x + rng.uniform(-1e-9, 1e-9),
+            decalage + y + rng.uniform(-1e-9, 1e-9),
+        )
+        for x in range(20)
+        for y in range(20)
+    ]
+    for points in (cercle, grille):
+        for methode in (INCREMENTAL, DIVIDE_AND_CONQUER):
+            assert aretes_illegales(points, triangulate(points, methode)) == 0
+
+
+def triangles_non_orientes(triangles):
+    """Retourne les triangles triés, indépendamment de leur orientation."""
+    return sorted(tuple(sorted(t)) for t in triangles)
+
+
+def corpus_commun():
+    """Jeux de points en position générale partagés par les deux algorithmes."""
+    rng = random.Random(11)
+    corpus = [
+        [(rng.random(), rng.random()) for _ in range(n)] for n in (3, 4, 5, 8, 40, 300)
+    ]
+    corpus.append([(rng.random() * 1000, rng.random()) for _ in range(200)])
+    corpus.append([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0), (3.0, 0.0), (1.5, 1.0)])
+    corpus.append([(rng.gauss(0.5, 0.01), rng.gauss(0.5, 0.01)) for _ in range(100)])
+    return corpus
+
+
+def test_divide_and_conquer_identique_incremental():
+    """La division donne les mêmes triangles que l'algorithme incrémental."""
+    for points in corpus_commun():
+        division = triangulate(points, DIVIDE_AND_CONQUER)
+        verifier_delaunay(points, division)
+        assert triangles_non_orientes(division) == triangles_non_orientes(
+            triangulate(points, INCREMENTAL)
+        )
+
+
+def test_divide_and_conquer_grille():
+    """Grille régulière : points cocirculaires traités par la division."""
+    points = [(float(x), float(y)) for x in range(9) for y in range(7)]
+    triangles = triangulate(points, DIVIDE_AND_CONQUER)
+    verifier_delaunay(points, triangles)
+    assert len(triangles) == 2 * 8 * 6
+
+
+def test_methode_inconnue():
+    """Une méthode de triangulation inconnue est refusée."""
+    with pytest.raises(ValueError, match="inconnue"):
+        triangulate([(0, 0), (0, 1), (1, 0)], "magic")
+
+
+def test_triangulation_parallele_identique():
+    """Bandes triangulées dans des processus puis recousues, comme en série."""
+    for points in corpus_commun()[3:]:
+        for workers in (2, 3):
+            paralleles = triangulate(points, parallel_threshold=0, workers=workers)
+            verifier_delaunay(points, paralleles)
+            assert triangles_non_orientes(paralleles) == triangles_non_orientes(
+                triangulate(points)
+            )
+
+
+def test_triangulation_parallele_sous_le_seuil(monkeypatch):
+    """Sous PARALLEL_THRESHOLD, la triangulation reste dans le processus."""
+    import triangulator.algorithm as algorithm
+
+    def interdit(*args):
+        raise AssertionError("mode parallèle inattendu")
+
+    monkeypatch.setattr(algorithm, "_divide_and_conquer_parallel", interdit)
+    assert (
+        len(
+            triangulate(
+                [(0, 0), (0, 1), (1, 0), (1, 1)], parallel_threshold=5, workers=4
+            )
+        )
+        == 2
+    )
+    assert (
+        len(
+            triangulate(
+                [(0, 0), (0, 1), (1, 0), (1, 1)], parallel_threshold=0, workers=1
+            )
+        )
+        == 2
+    )
+
+
+def test_triangulate_progress():
+    """Le suivi de progression est croissant et se termine a (n, n)."""
+    rng = random.Random(5)
+    points = [(rng.random(), rng.random()) for _ in range(3000)]
+    appels = []
+    triangulate(points, progress=lambda inseres, total: appels.append((inseres, total)))
+
+    assert appels[0] == (0, 3000)
+    assert appels[-1] == (3000, 3000)
+    assert len(appels) > 2
+    assert [inseres for inseres, _ in appels] == sorted(
+        inseres for inseres, _ in appels
+    )
+
+
+def test_triangulate_progress_interruption():
+    """Une exception levee par le suivi interrompt le calcul."""
+    rng = random.Random(6)
+    points = [(rng.random(), rng.random()) for _ in range(3000)]
+
+    def arret(inseres, total):
+        if inseres >= 1024:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        triangulate(points, progress=arret)
+
+
+def test_triangulate_progress_parallele():
+    """En parallele, le suivi avance a chaque bande et peut interrompre le calcul."""
+    rng = random.Random(7)
+    points = [(rng.random(), rng.random()) for _ in range(600)]
+    appels = []
+    triangulate(
+        points,
+        parallel_threshold=0,
+        workers=3,
+        progress=lambda inseres, total: appels.append((inseres, total)),
+    )
+
+    assert appels == [(0, 600), (200, 600), (400, 600), (600, 600), (600, 600)]
+
+    def arret(inseres, total):
+        if inseres > 0:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        triangulate(points, parallel_threshold=0, workers=3, progress=arret)
+
+
+def grille_perturbee(n, graine=0):
+    """Grille n x n legerement perturbee, points dans l'ordre des lignes."""
+    rng = random.Random(graine)
+    return [
+        (x + rng.random() * 0.3, y + rng.random() * 0.3)
+        for y in range(n)
+        for x in range(n)
+    ]
+
+
+@pytest.mark.parametrize("points", [
+    [],
+    [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)],
+    grille_perturbee(30),
+    [(45.0 + i * 1e-4, 5.0 - i * 3e-4) for i in range(50)] + [(45.0, 6.0)],
+])
+def test_compression_aller_retour(points):
+    """Les formats compresses restituent les octets d'origine."""
+    pointset = serialize_pointset(points)
+    triangles = triangulate(points) if len(points) >= 3 else []
+    triangulation = serialize_triangles(points, triangles)
+
+    assert decompress_pointset(compress_pointset(pointset)) == pointset
+    assert decompress_triangles(compress_triangles(triangulation)) == triangulation
+
+
+def test_compression_taux():
+    """Sur une grille ordonnee les indices tiennent le plus souvent sur un octet."""
+    points = grille_perturbee(60)
+    triangulation = serialize_triangles(points, triangulate(points))
+
+    assert len(compress_triangles(triangulation)) < 0.35 * len(triangulation)
+    assert len(compress_pointset(serialize_pointset(points))) < 0.7 * len(
+        serialize_pointset(points)
+    )
+
+
+def test_decompression_invalide():
+    """Les donnees compressees invalides levent ValueError."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
+    compresse = compress_triangles(serialize_triangles(points, triangulate(points)))
+
+    with pytest.raises(ValueError, match="too short"):
+        decompress_triangles(compresse[:6])
+    with pytest.raises(ValueError, match="Invalid compressed block"):
+        decompress_triangles(compresse[:-3])
+    with pytest.raises(ValueError, match="Invalid compressed block"):
+        decompress_pointset(struct.pack('<I', 3) + b'pas du zlib')
+
+
+def test_decompression_taille_max():
+    """Un PointSet qui depasse max_size est refuse avant d'etre decompresse."""
+    compresse = compress_pointset(serialize_pointset(grille_perturbee(10)))
+
+    with pytest.raises(ValueError, match="exceeds"):
+        decompress_pointset(compresse, max_size=100)
+    with pytest.raises(ValueError, match="Invalid compressed block"):
+        decompress_pointset(struct.pack('<I', 1) + compresse[4:])
+
+
+def test_decompression_bombe():
+    """Un bloc qui se developpe au-dela de la taille annoncee est refuse.
+
+    Le refus vaut aussi pour un bloc qui annonce 0 point.
+    """
+    bombe = zlib.compress(bytes(10_000_000), 9)
+
+    tracemalloc.start()
+    with pytest.raises(ValueError, match="Invalid compressed block"):
+        decompress_pointset(struct.pack('<I', 0) + bombe)
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert pic < 1_000_000
+    with pytest.raises(ValueError, match="Invalid compressed block"):
+        decompress_pointset(struct.pack('<I', 2) + bombe)
+    sommets = zlib.compress(b'')
+    with pytest.raises(ValueError, match="Invalid compressed block"):
+        decompress_triangles(
+            struct.pack('<II', 0, len(sommets))
+            + sommets
+            + struct.pack('<II', 0, 0)
+            + bombe
+        )
+    with pytest.raises(ValueError, match="Invalid varint size"):
+        decompress_triangles(
+            struct.pack('<II', 0, len(sommets))
+            + sommets
+            + struct.pack('<II', 1, 10_000_000)
+            + bombe
+        )
+    with pytest.raises(ValueError, match="exceeds"):
+        decompress_triangles(
+            struct.pack('<II', 0, len(sommets))
+            + sommets
+            + struct.pack('<II', 10**6, 3 * 10**6),
+            max_size=1000,
+        )
+
+
+def test_decompression_indice_hors_bornes():
+    """Les indices decodes sont verifies comme dans deserialize_triangles."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.5, 1.0)]
+    compresse = compress_triangles(serialize_triangles(points, [(0, 1, 2)]))
+    fin_sommets = 8 + struct.unpack_from('<I', compresse, 4)[0]
+    # indices (0, 1, 5) : ecarts 0, 1, 4, soit 0, 2, 8 en zigzag
+    compresse = (
+        compresse[:fin_sommets]
+        + struct.pack('<II', 1, 3)
+        + zlib.compress(bytes([0, 2, 8]))
+    )
+
+    with pytest.raises(ValueError, match="out of bounds"):
+        decompress_triangles(compresse)
+
+
+def test_fichier_triangles_projete(tmp_path):
+    """Le fichier a le format binaire habituel.
+
+    Les sommets et les indices relus sont des vues sur sa projection.
+    """
+    points = grille_perturbee(20)
+    triangles = triangulate(points)
+    chemin = str(tmp_path / 'maillage.bin')
+
+    taille = write_triangles_file(chemin, points, triangles)
+    sommets, projetes = map_triangles_file(chemin)
+
+    with open(chemin, 'rb') as fichier:
+        assert fichier.read() == serialize_triangles(points, triangles)
+    assert taille == serialized_triangles_size(points, triangles)
+    assert isinstance(sommets.coords, memoryview)
+    assert isinstance(projetes.indices, memoryview)
+    assert list(projetes) == list(triangles)
+    assert sommets[7] == deserialize_pointset(serialize_pointset(points))[7]
+
+
+def test_fichier_pointset_projete(tmp_path):
+    """Un PointSet projete reste lisible apres suppression du fichier."""
+    points = grille_perturbee(5)
+    chemin = tmp_path / 'points.bin'
+
+    write_pointset_file(str(chemin), points)
+    projete = map_pointset_file(str(chemin))
+    chemin.unlink()
+
+    assert b''.join(
+        serialize_pointset_stream(points, chunk_size=16)
+    ) == serialize_pointset(points)
+    assert serialize_pointset(projete) == serialize_pointset(points)
+
+
+def test_fichier_erreurs(tmp_path):
+    """Un fichier invalide leve ValueError.
+
+    Une ecriture en echec ne laisse pas de fichier.
+    """
+    chemin = tmp_path / 'invalide.bin'
+    chemin.write_bytes(struct.pack('<I', 5))
+    with pytest.raises(ValueError, match="Invalid data length"):
+        map_pointset_file(str(chemin))
+
+    chemin.write_bytes(b'')
+    with pytest.raises(ValueError, match="too short"):
+        map_triangles_file(str(chemin))
+
+    with pytest.raises(OverflowError):
+        write_triangles_file(
+            str(tmp_path / 'trop_grand.bin'),
+            [(1e39, 0.0), (0.0, 0.0), (1.0, 1.0)],
+            [(0, 1, 2)],
+        )
+    assert sorted(f.name for f in tmp_path.iterdir()) == ['invalide.bin']
+
+
+def verifier_maillage(maillage, attendus):
+    """Vérifie que le maillage est la triangulation de Delaunay des sommets attendus."""
+    sommets = list(maillage.vertices)
+    triangles = list(maillage.triangles())
+    assert {i for t in triangles for i in t} == set(attendus)
+    assert len(maillage) == len(attendus)
+    renumerotes = {ancien: nouveau for nouveau, ancien in enumerate(sorted(attendus))}
+    verifier_delaunay([sommets[i] for i in sorted(attendus)],
+                      [tuple(renumerotes[i] for i in t) for t in triangles])
+
+
+def test_delaunay_mesh_insertion():
+    """Les points insérés donnent la triangulation de l'ensemble."""
+    rng = random.Random(5)
+    points = [(rng.random(), rng.random()) for _ in range(50)]
+    maillage = DelaunayMesh(points[:20])
+    assert maillage.insert(points[20:]) == list(range(20, 50))
+    verifier_maillage(maillage, range(50))
+    assert triangles_non_orientes(maillage.triangles()) == triangles_non_orientes(
+        triangulate(points)
+    )
+
+
+def test_delaunay_mesh_insertion_hors_enveloppe():
+    """Insertion de points hors de l'enveloppe convexe et sur son bord."""
+    maillage = DelaunayMesh([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)])
+    maillage.insert([(5.0, 5.0), (-3.0, 0.5), (0.5, 0.0), (0.2, 0.2)])
+    verifier_maillage(maillage, range(7))
+
+
+def test_delaunay_mesh_suppression_aleatoire():
+    """Insertions et suppressions mêlées gardent un maillage de Delaunay."""
+    rng = random.Random(8)
+    points = [(rng.random(), rng.random()) for _ in range(120)]
+    maillage = DelaunayMesh(points)
+    actifs = set(range(len(points)))
+    for _ in range(80):
+        if rng.random() < 0.3:
+            nouveaux = [(rng.random(), rng.random()) for _ in range(3)]
+            actifs.update(maillage.insert(nouveaux))
+        else:
+            index = rng.choice(sorted(actifs))
+            maillage.remove(index)
+            actifs.remove(index)
+    verifier_maillage(maillage, actifs)
+    sommets = list(maillage.vertices)
+    attendus = sorted(actifs)
+    recalcules = [
+        tuple(attendus[i] for i in t)
+        for t in triangulate([sommets[i] for i in attendus])
+    ]
+    assert triangles_non_orientes(maillage.triangles()) == triangles_non_orientes(
+        recalcules
+    )
+
+
+def test_delaunay_mesh_suppression_grille():
+    """Points cocirculaires, colinéaires sur l'enveloppe et coins de l'enveloppe."""
+    points = [(float(x), float(y)) for x in range(6) for y in range(5)]
+    maillage = DelaunayMesh(points)
+    actifs = set(range(len(points)))
+    for index in (0, 12, 4, 2, 29, 25, 13, 7):
+        maillage.remove(index)
+        actifs.remove(index)
+        verifier_maillage(maillage, actifs)
+
+
+def test_delaunay_mesh_suppression_jusqu_au_triangle():
+    """Les suppressions peuvent réduire le maillage à un triangle."""
+    rng = random.Random(3)
+    points = [(rng.random(), rng.random()) for _ in range(15)]
+    maillage = DelaunayMesh(points)
+    actifs = set(range(15))
+    for index in range(12):
+        maillage.remove(index)
+        actifs.remove(index)
+        verifier_maillage(maillage, actifs)
+    with pytest.raises(ValueError):
+        maillage.remove(12)
+    verifier_maillage(maillage, actifs)
+
+
+def test_delaunay_mesh_suppression_colineaires():
+    """Une suppression qui laisse des points colinéaires est refusée."""
+    maillage = DelaunayMesh([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0), (1.0, 1.0)])
+    with pytest.raises(ValueError, match="colineaires"):
+        maillage.remove(3)
+    verifier_maillage(maillage, range(4))
+
+
+def test_delaunay_mesh_erreurs():
+    """Les erreurs laissent le maillage inchangé."""
+    maillage = DelaunayMesh([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0)])
+    with pytest.raises(ValueError, match="point existant deja"):
+        maillage.insert([(2.0, 2.0), (1.0, 1.0)])
+    with pytest.raises(ValueError, match="point existant deja"):
+        maillage.insert([(2.0, 2.0), (2.0, 2.0)])
+    assert len(maillage) == 4 and len(maillage.vertices) == 4
+    with pytest.raises(IndexError):
+        maillage.remove(4)
+    maillage.remove(3)
+    with pytest.raises(ValueError):
+        maillage.remove(3)
+    # un sommet supprimé peut être réinséré, sous un nouvel indice
+    assert maillage.insert([(1.0, 1.0)]) == [4]
+    verifier_maillage(maillage, {0, 1, 2, 4})
+    with pytest.raises(ValueError):
+        DelaunayMesh([(0.0, 0.0), (1.0, 1.0), (2.0, 2.0)])
+
+
+def test_delaunay_mesh_snapshot():
+    """Un maillage restauré depuis son instantané reste identique et modifiable."""
+    rng = random.Random(9)
+    points = [
+        (float(rng.randrange(1000)), float(rng.randrange(1000))) for _ in range(200)
+    ]
+    points = list(dict.fromkeys(points))
+    maillage = DelaunayMesh(points)
+    for index in (3, 50, 120):
+        maillage.remove(index)
+    donnees = maillage.snapshot()
+    restaure = DelaunayMesh.restore(donnees)
+    assert len(restaure) == len(maillage)
+    assert list(restaure.triangles()) == list(maillage.triangles())
+    assert restaure.snapshot() == donnees
+    # le maillage restauré reste modifiable
+    restaure.insert([(1000.5, 3.0)])
+    restaure.remove(0)
+    maillage.insert([(1000.5, 3.0)])
+    maillage.remove(0)
+    assert triangles_non_orientes(restaure.triangles()) == triangles_non_orientes(
+        maillage.triangles()
+    )
+
+
+def test_delaunay_mesh_snapshot_doubles():
+    """Des coordonnées en double précision survivent à snapshot puis restore.
+
+    Les points sont serrés : arrondis en float 32 bits après coup, leurs
+    triangles seraient mal orientés.
+    """
+    rng = random.Random(5)
+    for _ in range(20):
+        points = {}
+        while len(points) < 200:
+            x, y = 1000 + rng.random() * 1e-2, 1000 + rng.random() * 1e-2
+            points.setdefault(tuple(array('f', (x, y))), (x, y))
+        maillage = DelaunayMesh(list(points.values()))
+        maillage.insert([(1000 + rng.random() * 1e-2, 1000.02)])
+
+        restaure = DelaunayMesh.restore(maillage.snapshot())
+        assert list(restaure.triangles()) == list(maillage.triangles())
+        assert list(restaure.vertices) == list(maillage.vertices)
+    assert list(maillage.vertices)[:200] == list(points)
+
+
+def test_delaunay_mesh_from_triangulation_invalide():
+    """Une triangulation mal orientée ou non convexe est refusée."""
+    carre = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+    with pytest.raises(ValueError, match="orienté"):
+        DelaunayMesh.from_triangulation(Triangles(carre, [(0, 2, 1)]))
+    with pytest.raises(ValueError, match="convexe"):
+        DelaunayMesh.from_triangulation(
+            Triangles(carre + [(0.5, 0.9)], [(0, 1, 4), (1, 2, 4), (2, 3, 4)])
+        )
+    with pytest.raises(ValueError):
+        DelaunayMesh.from_triangulation(Triangles(carre, [(0, 1, 2), (0, 1, 2)]))
+    maillage = DelaunayMesh.from_triangulation(Triangles(carre, [(0, 1, 2), (0, 2, 3)]))
+    verifier_maillage(maillage, range(4))
+
+
+def appliquer_difference(points, nouveaux):
+    """Calcule la différence entre les triangulations de points et nouveaux.
+
+    La différence est appliquée à la base et le résultat vérifié.
+    """
+    # les sommets sont reconnus par leurs coordonnées, qui passent
+    # en float 32 bits dans la base
+    points = list(deserialize_pointset(serialize_pointset(points)))
+    nouveaux = list(deserialize_pointset(serialize_pointset(nouveaux)))
+    base = serialize_triangles(points, triangulate(points))
+    difference = serialize_delta(
+        triangulation_delta(deserialize_triangles(base)[1], nouveaux)
+    )
+    sommets, triangles = deserialize_triangles(apply_delta(base, difference))
+    sommets = list(sommets)
+    utilises = sorted({i for t in triangles for i in t})
+    assert sorted(sommets[i] for i in utilises) == sorted(nouveaux)
+    renumerotes = {ancien: nouveau for nouveau, ancien in enumerate(utilises)}
+    verifier_delaunay(
+        [sommets[i] for i in utilises],
+        [tuple(renumerotes[i] for i in t) for t in triangles],
+    )
+    return base, difference
+
+
+@pytest.mark.parametrize("reconstruction", [False, True])
+def test_triangulation_delta(reconstruction):
+    """La différence appliquée à la base donne la nouvelle triangulation."""
+    rng = random.Random(21)
+    points = [(rng.random(), rng.random()) for _ in range(300)]
+    if reconstruction:
+        nouveaux = points[:150] + [(rng.random(), rng.random()) for _ in range(100)]
+    else:
+        nouveaux = points[10:] + [(rng.random(), rng.random()) for _ in range(10)]
+    base, difference = appliquer_difference(points, nouveaux)
+    delta = deserialize_delta(difference)
+    assert (delta.base_vertices, delta.base_triangles) == (
+        300,
+        len(deserialize_triangles(base)[1]),
+    )
+    assert len(delta.vertices) == (100 if reconstruction else 10)
+    if not reconstruction:
+        # seules les cavités touchées changent
+        assert len(difference) < len(base) / 4
+
+
+def test_triangulation_delta_grille():
+    """Points cocirculaires : retirer puis remettre des points garde le maillage."""
+    points = [(float(x), float(y)) for x in range(12) for y in range(12)]
+    appliquer_difference(points, points[:-3] + [(20.0, 5.0)])
+    _, difference = appliquer_difference(points, list(points))
+    delta = deserialize_delta(difference)
+    assert len(delta.vertices) == len(delta.removed) == len(delta.triangles) == 0
+
+
+def test_triangulation_delta_invalide():
+    """Une nouvelle version qui ne peut pas être triangulée est refusée."""
+    base = triangulate([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)])
+    with pytest.raises(ValueError, match="colineaire"):
+        triangulation_delta(base, [(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)])
+    with pytest.raises(ValueError, match="point existant deja"):
+        triangulation_delta(base, [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 0.0)])
+
+
+def test_delta_serialisation_erreurs():
+    """Une différence invalide ou d'une autre base est refusée."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0)]
+    base = serialize_triangles(points, triangulate(points))
+    vides = (array('I'), array('I'))
+    valide = TriangulationDelta(
+        4, 2, PointSet([(2.0, 2.0)]), array('I', [1]), array('I', [1, 4, 3])
+    )
+    relu = deserialize_delta(serialize_delta(valide))
+    assert (relu.base_vertices, relu.base_triangles, list(relu.vertices)) == (
+        4,
+        2,
+        [(2.0, 2.0)],
+    )
+    assert (relu.removed, relu.triangles) == (valide.removed, valide.triangles)
+    with pytest.raises(ValueError, match="too short"):
+        deserialize_delta(b"\x00" * 10)
+    with pytest.raises(ValueError, match="length"):
+        deserialize_delta(serialize_delta(valide) + b"\x00")
+    with pytest.raises(ValueError, match="increasing"):
+        deserialize_delta(
+            serialize_delta(
+                TriangulationDelta(4, 2, PointSet(), array('I', [1, 1]), vides[1])
+            )
+        )
+    with pytest.raises(ValueError, match="out of bounds"):
+        deserialize_delta(
+            serialize_delta(
+                TriangulationDelta(4, 2, PointSet(), array('I', [2]), vides[1])
+            )
+        )
+    with pytest.raises(ValueError, match="out of bounds"):
+        deserialize_delta(
+            serialize_delta(
+                TriangulationDelta(4, 2, PointSet(), vides[0], array('I', [0, 1, 4]))
+            )
+        )
+    with pytest.raises(ValueError, match="base has"):
+        apply_delta(
+            base,
+            serialize_delta(TriangulationDelta(5, 2, PointSet(), vides[0], vides[1])),
+        )
+    sommets, triangles = deserialize_triangles(
+        apply_delta(base, serialize_delta(valide))
+    )
+    assert list(sommets) == points + [(2.0, 2.0)]
+    assert list(triangles) == [triangulate(points)[0], (1, 4, 3)]
+
+
+def verifier_localisation(points, triangles, requetes):
+    """Compare les réponses de MeshLocator à des parcours linéaires."""
+    positions, sommets = MeshLocator(triangles).query_all(requetes)
+    for (x, y), position, sommet in zip(requetes, positions, sommets, strict=True):
+        distances = [(px - x) ** 2 + (py - y) ** 2 for px, py in points]
+        assert distances[sommet] == min(distances)
+        contenants = [
+            p
+            for p, (a, b, c) in enumerate(triangles)
+            if all(
+                orient2d(*points[u], *points[w], x, y) >= 0
+                for u, w in ((a, b), (b, c), (c, a))
+            )
+        ]
+        if position < 0:
+            assert contenants == []
+        else:
+            assert position in contenants
+
+
+def test_mesh_locator_aleatoire():
+    """Localisation de points dans et hors d'un maillage aléatoire."""
+    rng = random.Random(17)
+    points = [(rng.random() * 100, rng.random()) for _ in range(400)]
+    requetes = [(rng.uniform(-10, 110), rng.uniform(-0.1, 1.1)) for _ in range(300)]
+    verifier_localisation(points, triangulate(points), requetes + points[:20])
+
+
+def test_mesh_locator_grille():
+    """Points cocirculaires, requêtes sur les sommets, les arêtes et le bord."""
+    points = [(float(x), float(y)) for x in range(8) for y in range(6)]
+    requetes = [(x / 2, y / 2) for x in range(-2, 17) for y in range(-2, 13)]
+    verifier_localisation(points, triangulate(points, DIVIDE_AND_CONQUER), requetes)
+
+
+def test_mesh_locator_coordonnees_extremes():
+    """Des coordonnées dont le carré dépasse les flottants ne lèvent pas d'erreur."""
+    points = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (1.0, 1.0)]
+    locator = MeshLocator(triangulate(points))
+
+    for x, y in ((1e308, 1e308), (1e300, -1e300), (-1e308, 0.0)):
+        triangle, sommet = locator.query(x, y)
+        assert triangle == -1
+        assert 0 <= sommet < len(points)
+    assert locator.query(1e200, 1e200) == (-1, 3)
+
+
+def test_serialisation_localisations():
+    """Aller-retour du format des localisations."""
+    positions, sommets = array('i', [3, -1, 0]), array('I', [7, 2, 2])
+    donnees = serialize_locations(positions, sommets)
+    assert len(donnees) == 4 + 3 * 8
+    assert deserialize_locations(donnees) == (positions, sommets)
+    assert deserialize_locations(serialize_locations(array('i'), array('I'))) == (
+        array('i'),
+        array('I'),
+    )
+    with pytest.raises(ValueError):
+        serialize_locations(positions, sommets[:2])
+    with pytest.raises(ValueError):
+        deserialize_locations(donnees[:-1])
+
+
+def verifier_voronoi(points, triangles):
+    """Chaque cellule fait le tour de son sommet par triangles adjacents.
+
+    Seules les cellules des sommets de l'enveloppe sont ouvertes.
+    """
+    voronoi = voronoi_from_triangles(triangles)
+    centres = list(voronoi.vertices)
+    assert len(centres) == len(triangles) and len(voronoi.offsets) == len(points) + 1
+    aretes = Counter(
+        frozenset(e) for a, b, c in triangles for e in ((a, b), (b, c), (c, a))
+    )
+    enveloppe = {i for arete, nb in aretes.items() if nb == 1 for i in arete}
+    for i in range(len(points)):
+        cellule = list(voronoi.cells[voronoi.offsets[i]:voronoi.offsets[i + 1]])
+        bornee = VORONOI_INFINITY not in cellule
+        assert bornee == (i not in enveloppe)
+        if not bornee:
+            assert cellule[-1] == VORONOI_INFINITY
+            cellule = cellule[:-1]
+        assert sorted(cellule) == [
+            t for t, triangle in enumerate(triangles) if i in triangle
+        ]
+        paires = list(
+            zip(
+                cellule,
+                cellule[1:] + cellule[:1] if bornee else cellule[1:],
+                strict=False,
+            )
+        )
+        for t, u in paires:
+            assert len(set(triangles[t]) & set(triangles[u])) == 2
+        # les centres des cellules tournent dans le sens
+        # trigonométrique autour du sommet
+        x, y = points[i]
+        for t, u in paires:
+            (ax, ay), (bx, by) = centres[t], centres[u]
+            assert (ax - x) * (by - y) - (ay - y) * (bx - x) >= -1e-9
+    for t, (a, b, c) in enumerate(triangles):
+        (ux, uy) = centres[t]
+        distances = [
+            (px - ux) ** 2 + (py - uy) ** 2
+            for px, py in (points[a], points[b], points[c])
+        ]
+        assert max(distances) - min(distances) <= 1e-9 * max(distances)
+    return voronoi
+
+
+def test_voronoi_aleatoire():
+    """Diagramme de Voronoi d'un maillage aléatoire."""
+    rng = random.Random(23)
+    points = [(rng.random(), rng.random()) for _ in range(300)]
+    verifier_voronoi(points, triangulate(points))
+
+
+def test_voronoi_grille():
+    """Diagramme de Voronoi d'une grille (cercles partagés)."""
+    points = [(float(x), float(y)) for x in range(7) for y in range(5)]
+    verifier_voronoi(points, triangulate(points, DIVIDE_AND_CONQUER))
+
+
+def test_voronoi_triangle():
+    """Un seul triangle : trois cellules non bornées."""
+    voronoi = voronoi_from_triangles(triangulate([(0.0, 0.0), (2.0, 0.0), (0.0, 2.0)]))
+    assert list(voronoi.vertices) == [(1.0, 1.0)]
+    assert list(voronoi.offsets) == [0, 2, 4, 6]
+    assert list(voronoi.cells) == [0, VORONOI_INFINITY] * 3
+
+
+def test_voronoi_serialisation():
+    """Aller-retour du format des diagrammes de Voronoi."""
+    points = [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0), (1.0, 1.2)]
+    voronoi = voronoi_from_triangles(triangulate(points))
+    donnees = serialize_voronoi(voronoi)
+    relu = deserialize_voronoi(donnees)
+    assert list(relu.vertices) == list(
+        deserialize_pointset(serialize_pointset(voronoi.vertices))
+    )
+    assert (relu.offsets, relu.cells) == (voronoi.offsets, voronoi.cells)
+
+    with pytest.raises(ValueError, match="too short"):
+        deserialize_voronoi(donnees[:4])
+    with pytest.raises(ValueError, match="length"):
+        deserialize_voronoi(donnees[:-4])
+    with pytest.raises(ValueError, match="non-decreasing"):
+        deserialize_voronoi(
+            serialize_voronoi(
+                VoronoiDiagram(PointSet(), array('I', [0, 1, 0]), array('I'))
+            )
+        )
+    with pytest.raises(ValueError, match="out of bounds"):
+        deserialize_voronoi(
+            serialize_voronoi(
+                VoronoiDiagram(
+                    PointSet([(0.0, 0.0)]), array('I', [0, 2]), array('I', [0, 1])
+                )
+            )
+        )
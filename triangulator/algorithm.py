@@ -1,87 +1,1541 @@
-from typing import List
-from triangulator.models import Point, Triangle
-from triangulator.geometry import point_in_circumcircle, sont_colineaires, duplication_point
+import math
+import os
+import random
+from array import array
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
 
+from triangulator.geometry import (
+    circumcircle,
+    duplication_point_xy,
+    sont_colineaires_xy,
+)
+from triangulator.models import Point, PointSet, Triangle, Triangles
+from triangulator.predicates import (
+    EPSILON,
+    incircle,
+    incircle_fast,
+    orient2d,
+    orient2d_fast,
+)
+from triangulator.serialization import (
+    VORONOI_INFINITY,
+    TriangulationDelta,
+    VoronoiDiagram,
+    deserialize_triangles,
+    serialize_triangles,
+)
 
-def triangulate(points: List[Point]) -> List[Triangle]:
+# Sommet fictif "à l'infini" utilisé par les triangles fantômes
+# qui bordent l'enveloppe convexe
+GHOST = -1
+
+# Algorithmes de triangulation disponibles
+INCREMENTAL = "incremental"
+DIVIDE_AND_CONQUER = "divide_and_conquer"
+METHODS = (INCREMENTAL, DIVIDE_AND_CONQUER)
+
+# Version des résultats de triangulate : à incrémenter dès qu'un changement de
+# l'algorithme ou du format binaire modifie les octets produits pour un même
+# PointSet, ce qui invalide les ETags
+ALGORITHM_VERSION = 2
+
+# Au-delà de ce nombre de points, la triangulation est découpée en
+# bandes calculées en parallèle
+PARALLEL_THRESHOLD = int(os.environ.get('TRIANGULATION_PARALLEL_THRESHOLD', 200000))
+PARALLEL_WORKERS = int(
+    os.environ.get('TRIANGULATION_PARALLEL_WORKERS', os.cpu_count() or 1)
+)
+
+# En dessous de cette taille, un tour BRIO n'est plus découpé
+BRIO_MIN_ROUND = 64
+
+# Nombre de points insérés entre deux appels du suivi de progression
+PROGRESS_STEP = 1024
+
+# Au-delà de cette part de points ajoutés ou supprimés, triangulation_delta recalcule la
+# nouvelle triangulation en entier plutôt que de modifier celle de base point par point
+DELTA_REBUILD_RATIO = 0.25
+
+# Nombre moyen de triangles par case de la grille qui donne son
+# point de départ à MeshLocator
+LOCATOR_CELL_TRIANGLES = 2
+
+# Fonction de suivi de progression : appelée avec (points
+# insérés, nombre total de points)
+Progress = Callable[[int, int], None]
+
+# Marge (en epsilon machine, multipliée par le conditionnement du triangle)
+# en deçà de laquelle le test par cercle mémorisé est jugé incertain et
+# refait avec le prédicat incircle
+CIRCLE_ERRBOUND = 64.0 * EPSILON
+
+
+class _Mesh:
+    """Triangulation de Delaunay incrémentale (Bowyer-Watson) avec adjacence.
+
+    Les triangles sont stockés à plat : les sommets du triangle t sont v[3t],
+    v[3t+1], v[3t+2] (sens trigonométrique) et nb[3t+k] est le triangle voisin opposé
+    au sommet v[3t+k]. L'enveloppe convexe est bordée de triangles fantômes (x, y,
+    GHOST), ce qui évite le super-triangle et donne exactement les triangles de bord.
+    Le centre (ox[t], oy[t]) du cercle circonscrit de chaque triangle réel, relatif à
+    son premier sommet v[3t], et le carré de son rayon r2[t] sont calculés à sa
+    création et réutilisés jusqu'à sa suppression ; tol[t] borne l'erreur relative de
+    ce test, au-delà de laquelle on revient aux prédicats robustes. Garder le centre
+    relatif évite l'arrondi de ax + ox, qui croît avec la valeur absolue des
+    coordonnées et que tol[t] ne couvre pas.
+    """
+
+    def __init__(
+        self,
+        xs: list[float],
+        ys: list[float],
+        cache_circles: bool = True,
+        robust: bool = True,
+    ):
+        """Initialise une triangulation vide.
+
+        parametres:
+            xs, ys: coordonnées des points, indexées comme la liste d'entrée.
+            cache_circles: si False, chaque test recalcule le déterminant du
+                cercle (comparaison de performance).
+            robust: si False, les prédicats sont évalués en flottants sans
+                filtre (comparaison de performance).
+        """
+        self.xs = xs
+        self.ys = ys
+        self.cache_circles = cache_circles
+        self.robust = robust
+        self.orient = orient2d if robust else orient2d_fast
+        self.incircle = incircle if robust else incircle_fast
+        self.v: list[int] = []
+        self.nb: list[int] = []
+        self.ox: list[float] = []
+        self.oy: list[float] = []
+        self.r2: list[float] = []
+        self.tol: list[float] = []
+        self.libres: list[int] = []
+        self.last = 0
+
+    def _alloc(self) -> int:
+        """Retourne un emplacement de triangle libre, réutilisé en O(1) si possible."""
+        if self.libres:
+            return self.libres.pop()
+        t = len(self.v) // 3
+        self.v.extend((GHOST, GHOST, GHOST))
+        self.nb.extend((-1, -1, -1))
+        self.ox.append(0.0)
+        self.oy.append(0.0)
+        self.r2.append(0.0)
+        self.tol.append(0.0)
+        return t
+
+    def _circle(self, t: int) -> None:
+        """Calcule et mémorise le cercle circonscrit du triangle réel t."""
+        xs, ys, v = self.xs, self.ys, self.v
+        b = 3 * t
+        ax, ay = xs[v[b]], ys[v[b]]
+        bdx = xs[v[b + 1]] - ax
+        bdy = ys[v[b + 1]] - ay
+        cdx = xs[v[b + 2]] - ax
+        cdy = ys[v[b + 2]] - ay
+        d = 2 * (bdx * cdy - bdy * cdx)
+        if d == 0:
+            # triangle trop plat pour les flottants : tous ses
+            # tests passeront par incircle
+            self.ox[t] = self.oy[t] = 0.0
+            self.r2[t] = self.tol[t] = math.inf
+            return
+        b2 = bdx * bdx + bdy * bdy
+        c2 = cdx * cdx + cdy * cdy
+        ox = (cdy * b2 - bdy * c2) / d
+        oy = (bdx * c2 - cdx * b2) / d
+        self.ox[t] = ox
+        self.oy[t] = oy
+        self.r2[t] = ox * ox + oy * oy
+        self.tol[t] = CIRCLE_ERRBOUND * 2 * (abs(bdx * cdy) + abs(bdy * cdx)) / abs(d)
+
+    def _set_nb(self, t: int, sommet: int, voisin: int) -> None:
+        """Définit le voisin de t opposé au sommet donné."""
+        v = self.v
+        b = 3 * t
+        if v[b] == sommet:
+            self.nb[b] = voisin
+        elif v[b + 1] == sommet:
+            self.nb[b + 1] = voisin
+        else:
+            self.nb[b + 2] = voisin
+
+    def _set_nb_edge(self, t: int, u: int, w: int, voisin: int) -> None:
+        """Définit le voisin de t de l'autre côté de son arête u-w."""
+        v = self.v
+        b = 3 * t
+        if v[b] != u and v[b] != w:
+            self.nb[b] = voisin
+        elif v[b + 1] != u and v[b + 1] != w:
+            self.nb[b + 1] = voisin
+        else:
+            self.nb[b + 2] = voisin
+
+    def seed(self, a: int, b: int, c: int) -> None:
+        """Crée le premier triangle réel et ses trois triangles fantômes.
+
+        parametres:
+            a, b, c: indices de trois points non colinéaires.
+        """
+        xs, ys = self.xs, self.ys
+        if self.orient(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) < 0:
+            b, c = c, b
+        # t0 = (a, b, c), puis un fantôme par arête : t1 = (b, a, G),
+        # t2 = (c, b, G), t3 = (a, c, G)
+        self.v = [a, b, c, b, a, GHOST, c, b, GHOST, a, c, GHOST]
+        self.nb = [2, 3, 1, 3, 2, 0, 1, 3, 0, 2, 1, 0]
+        self.ox = [0.0] * 4
+        self.oy = [0.0] * 4
+        self.r2 = [0.0] * 4
+        self.tol = [0.0] * 4
+        self.libres = []
+        self.last = 0
+        self._circle(0)
+
+    def conflict(self, t: int, px: float, py: float) -> bool:
+        """Indique si le point p est dans le cercle circonscrit du triangle t.
+
+        Pour un triangle fantôme (x, y, GHOST), le "cercle" est le demi-plan ouvert
+        situé hors de l'enveloppe convexe au-delà de l'arête x-y, plus l'intérieur
+        du segment x-y. Pour un triangle réel, le cercle mémorisé tranche quand
+        l'écart au rayon dépasse la borne d'erreur tol[t] ; sinon le prédicat
+        incircle donne le signe exact.
+        """
+        xs, ys, v = self.xs, self.ys, self.v
+        b = 3 * t
+        a = v[b]
+        c = v[b + 2]
+        if c == GHOST:
+            return self.ghost_conflict(a, v[b + 1], px, py)
+        if self.cache_circles:
+            dx = (px - xs[a]) - self.ox[t]
+            dy = (py - ys[a]) - self.oy[t]
+            d2 = dx * dx + dy * dy
+            r2 = self.r2[t]
+            if not self.robust:
+                return d2 < r2
+            ecart = d2 - r2
+            marge = self.tol[t] * (d2 + r2)
+            if ecart > marge:
+                return False
+            if -ecart > marge:
+                return True
+        d = v[b + 1]
+        return self.incircle(xs[a], ys[a], xs[d], ys[d], xs[c], ys[c], px, py) > 0
+
+    def ghost_conflict(self, a: int, d: int, px: float, py: float) -> bool:
+        """Test de conflit du triangle fantôme (a, d, GHOST).
+
+        Le point p est en conflit s'il est au-delà de l'arête a-d ou sur le segment
+        ouvert.
+        """
+        xs, ys = self.xs, self.ys
+        ax, ay, dx, dy = xs[a], ys[a], xs[d], ys[d]
+        o = self.orient(ax, ay, dx, dy, px, py)
+        if o != 0:
+            return o > 0
+        # p est sur la droite x-y : comparaisons exactes des coordonnées
+        if ax != dx:
+            return min(ax, dx) < px < max(ax, dx)
+        return min(ay, dy) < py < max(ay, dy)
+
+    def locate(self, px: float, py: float, depart: int | None = None) -> int:
+        """Trouve un triangle en conflit avec p par marche orientée.
+
+        parametres:
+            depart: triangle de départ de la marche, par défaut le dernier créé.
+
+        Retourne:
+            L'indice d'un triangle (réel ou fantôme) en conflit avec p.
+        """
+        xs, ys, v, nb, orient = self.xs, self.ys, self.v, self.nb, self.orient
+        t = self.last if depart is None else depart
+        for _ in range(len(v)):
+            b = 3 * t
+            i, j, k = v[b], v[b + 1], v[b + 2]
+            if k == GHOST:
+                if self.conflict(t, px, py):
+                    return t
+                t = nb[b + 2]
+                continue
+            ax, ay, bx, by, cx, cy = xs[i], ys[i], xs[j], ys[j], xs[k], ys[k]
+            if orient(bx, by, cx, cy, px, py) < 0:
+                t = nb[b]
+            elif orient(cx, cy, ax, ay, px, py) < 0:
+                t = nb[b + 1]
+            elif orient(ax, ay, bx, by, px, py) < 0:
+                t = nb[b + 2]
+            else:
+                return t
+        # filet de sécurité : parcours exhaustif si la marche n'a pas abouti
+        libres = set(self.libres)
+        for t in range(len(v) // 3):
+            if t not in libres and self.conflict(t, px, py):
+                return t
+        raise ValueError("impossible de localiser le point dans la triangulation")
+
+    def insert(self, i: int) -> None:
+        """Insère le point d'indice i.
+
+        La cavité est trouvée par propagation depuis le triangle qui contient le point,
+        puis remplacée par l'étoile des arêtes de son bord.
+        """
+        px, py = self.xs[i], self.ys[i]
+        v, nb = self.v, self.nb
+        depart = self.locate(px, py)
+
+        cavite = [depart]
+        etat = {depart: True}
+        bord = []
+        pile = [depart]
+        while pile:
+            t = pile.pop()
+            b = 3 * t
+            for k in range(3):
+                o = nb[b + k]
+                dedans = etat.get(o)
+                if dedans is None:
+                    dedans = self.conflict(o, px, py)
+                    etat[o] = dedans
+                    if dedans:
+                        cavite.append(o)
+                        pile.append(o)
+                        continue
+                if not dedans:
+                    bord.append((v[b + (k + 1) % 3], v[b + (k + 2) % 3], o))
+
+        # les emplacements de la cavité sont libérés en O(1) et réutilisés immédiatement
+        self.libres.extend(cavite)
+        premier = {}
+        second = {}
+        nouveaux = []
+        for u, w, o in bord:
+            t = self._alloc()
+            b = 3 * t
+            if u == GHOST:
+                v[b], v[b + 1], v[b + 2] = w, i, GHOST
+            elif w == GHOST:
+                v[b], v[b + 1], v[b + 2] = i, u, GHOST
+            else:
+                v[b], v[b + 1], v[b + 2] = u, w, i
+                self._circle(t)
+            self._set_nb(t, i, o)
+            self._set_nb_edge(o, u, w, t)
+            premier[u] = t
+            second[w] = t
+            nouveaux.append((t, u, w))
+
+        for t, u, w in nouveaux:
+            self._set_nb(t, u, premier[w])
+            self._set_nb(t, w, second[u])
+            if v[3 * t + 2] != GHOST:
+                self.last = t
+
+    def triangles(self) -> array:
+        """Retourne à plat les indices des triangles réels (sans les fantômes)."""
+        v = self.v
+        libres = set(self.libres)
+        indices = array('I')
+        for b in range(0, len(v), 3):
+            if v[b + 2] != GHOST and b // 3 not in libres:
+                indices.extend(v[b:b + 3])
+        return indices
+
+
+def _hilbert_index(n: int, x: int, y: int) -> int:
+    """Calcule la position du point entier (x, y) sur la courbe de Hilbert d'ordre n.
+
+    parametres:
+        n: côté de la grille, une puissance de 2.
+        x, y: coordonnées entières dans [0, n).
     """
-    Calcule la triangulation de Delaunay d'un ensemble de points en 2D en utilisant l'algorithme de Bowyer-Watson.
-    
-    :param points: Liste des points à trianguler, minimum 3 points, les points ne doivent pas être dupliqués et les points ne doivent pas être tous colinéaires
-    :return: Liste des triangles formant la triangulation, chaque triangle est un tuple (i, j, k) d'indices, les indices référencent les points dans la liste d'entrée
+    d = 0
+    s = n >> 1
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        d += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x = n - 1 - x
+                y = n - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+
+def _hilbert_sort(
+    indices: list[int], xs: Sequence[float], ys: Sequence[float]
+) -> list[int]:
+    """Trie des indices de points selon la courbe de Hilbert de leur boîte englobante.
+
+    La grille a environ un point par case, ce qui suffit à rendre voisins dans la liste
+    des points voisins dans le plan.
     """
-    if duplication_point(points):
+    if len(indices) < 3:
+        return list(indices)
+    min_x = min(xs[i] for i in indices)
+    max_x = max(xs[i] for i in indices)
+    min_y = min(ys[i] for i in indices)
+    max_y = max(ys[i] for i in indices)
+    n = 2
+    while n * n < len(indices):
+        n *= 2
+    sx = (n - 1) / ((max_x - min_x) or 1)
+    sy = (n - 1) / ((max_y - min_y) or 1)
+    cles = {
+        i: _hilbert_index(n, int((xs[i] - min_x) * sx), int((ys[i] - min_y) * sy))
+        for i in indices
+    }
+    return sorted(indices, key=cles.__getitem__)
+
+
+def _brio_order(xs: Sequence[float], ys: Sequence[float], seed: int = 0) -> list[int]:
+    """Calcule l'ordre d'insertion BRIO (Biased Randomized Insertion Order) des points.
+
+    Les points sont mélangés puis répartis en tours de tailles doublantes ;
+    chaque tour est trié selon la courbe de Hilbert. Le mélange garde des cavités
+    de taille constante en moyenne, le tri spatial rend très courte la marche
+    depuis le dernier triangle créé.
+
+    parametres:
+        xs, ys: coordonnées des points.
+        seed: graine du mélange, fixée pour que la triangulation soit reproductible.
+
+    Retourne:
+        Une permutation des indices 0..n-1.
+    """
+    indices = list(range(len(xs)))
+    random.Random(seed).shuffle(indices)
+    tours = []
+    fin = len(indices)
+    while fin > BRIO_MIN_ROUND:
+        debut = fin // 2
+        tours.append(indices[debut:fin])
+        fin = debut
+    tours.append(indices[:fin])
+
+    ordre = []
+    for tour in reversed(tours):
+        ordre.extend(_hilbert_sort(tour, xs, ys))
+    return ordre
+
+
+def _delaunay(
+    xs: Sequence[float],
+    ys: Sequence[float],
+    ordre: list[int],
+    cache_circles: bool = True,
+    robust: bool = True,
+    progress: Progress | None = None,
+) -> _Mesh:
+    """Construit la triangulation de Delaunay en insérant les points dans l'ordre donné.
+
+    parametres:
+        xs, ys: coordonnées de points distincts et non tous colinéaires.
+        ordre: permutation des indices des points ; les triangles référencent
+            toujours les indices d'origine.
+        cache_circles: mémoriser le cercle circonscrit de chaque triangle (voir _Mesh).
+        robust: utiliser les prédicats robustes de triangulator.predicates (voir _Mesh).
+        progress: appelée tous les PROGRESS_STEP points insérés ; une exception levée
+            par progress interrompt la construction.
+    """
+    # premier triangle : les deux premiers points et le premier point non colinéaire
+    a, b = ordre[0], ordre[1]
+    k = 2
+    while orient2d(xs[a], ys[a], xs[b], ys[b], xs[ordre[k]], ys[ordre[k]]) == 0:
+        k += 1
+
+    mesh = _Mesh(xs, ys, cache_circles, robust)
+    mesh.seed(a, b, ordre[k])
+    total = len(ordre)
+    for pos in range(2, total):
+        if pos != k:
+            mesh.insert(ordre[pos])
+        if progress is not None and pos % PROGRESS_STEP == 0:
+            progress(pos, total)
+    return mesh
+
+
+class _QuadEdge:
+    """Subdivision planaire en quad-edges (Guibas et Stolfi) pour la division.
+
+    L'arête e et ses rotations sont les entiers e, e+1, e+2, e+3 (e multiple de 4) :
+    rot(e) change le dernier couple de bits, sym(e) = e ^ 2. onext[e] est l'arête
+    suivante autour de l'origine org[e] dans le sens trigonométrique.
+    """
+
+    def __init__(self, xs: Sequence[float], ys: Sequence[float]):
+        """Initialise une subdivision vide.
+
+        parametres:
+            xs, ys: coordonnées des points.
+        """
+        self.xs = xs
+        self.ys = ys
+        self.onext: list[int] = []
+        self.org: list[int] = []
+        self.supprimee: list[bool] = []
+
+    def make_edge(self, a: int, b: int) -> int:
+        """Crée une arête isolée de a vers b."""
+        e = len(self.onext)
+        self.onext.extend((e, e + 3, e + 2, e + 1))
+        self.org.extend((a, GHOST, b, GHOST))
+        self.supprimee.append(False)
+        return e
+
+    def splice(self, a: int, b: int) -> None:
+        """Opération splice : fusionne ou sépare les anneaux d'arêtes de a et de b."""
+        onext = self.onext
+        alpha = _rot(onext[a])
+        beta = _rot(onext[b])
+        onext[a], onext[b] = onext[b], onext[a]
+        onext[alpha], onext[beta] = onext[beta], onext[alpha]
+
+    def lnext(self, e: int) -> int:
+        """Arête suivante sur la face à gauche de e."""
+        return _rot(self.onext[_rot(e) ^ 2])
+
+    def oprev(self, e: int) -> int:
+        """Arête précédente autour de l'origine de e."""
+        return _rot(self.onext[_rot(e)])
+
+    def connect(self, a: int, b: int) -> int:
+        """Ajoute une arête de la destination de a vers l'origine de b."""
+        e = self.make_edge(self.org[a ^ 2], self.org[b])
+        self.splice(e, self.lnext(a))
+        self.splice(e ^ 2, b)
+        return e
+
+    def delete_edge(self, e: int) -> None:
+        """Retire l'arête e de la subdivision."""
+        self.splice(e, self.oprev(e))
+        self.splice(e ^ 2, self.oprev(e ^ 2))
+        self.supprimee[e >> 2] = True
+
+    def ccw(self, a: int, b: int, c: int) -> bool:
+        """Indique si a, b, c tournent strictement dans le sens trigonométrique."""
+        xs, ys = self.xs, self.ys
+        return orient2d(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) > 0
+
+    def build(self, s: list[int], lo: int, hi: int):
+        """Triangule récursivement les points s[lo:hi], triés par x puis y.
+
+        Retourne:
+            (ldo, rdo) : l'arête de l'enveloppe convexe sortant du point le
+            plus à gauche (sens trigonométrique) et celle sortant du point
+            le plus à droite (sens horaire).
+        """
+        n = hi - lo
+        if n == 2:
+            a = self.make_edge(s[lo], s[lo + 1])
+            return a, a ^ 2
+        if n == 3:
+            p1, p2, p3 = s[lo], s[lo + 1], s[lo + 2]
+            a = self.make_edge(p1, p2)
+            b = self.make_edge(p2, p3)
+            self.splice(a ^ 2, b)
+            if self.ccw(p1, p2, p3):
+                self.connect(b, a)
+                return a, b ^ 2
+            if self.ccw(p1, p3, p2):
+                c = self.connect(b, a)
+                return c ^ 2, c
+            return a, b ^ 2
+
+        mid = lo + n // 2
+        ldo, ldi = self.build(s, lo, mid)
+        rdi, rdo = self.build(s, mid, hi)
+        return self.merge(ldo, ldi, rdi, rdo)
+
+    def merge(self, ldo: int, ldi: int, rdi: int, rdo: int):
+        """Fusionne deux triangulations de Delaunay séparées par une droite verticale.
+
+        parametres:
+            ldo, ldi: arêtes de l'enveloppe de la moitié gauche sortant de son
+                point le plus à gauche (sens trigonométrique) et de son point
+                le plus à droite (sens horaire).
+            rdi, rdo: les mêmes arêtes pour la moitié droite.
+
+        Retourne:
+            (ldo, rdo) pour la triangulation fusionnée.
+        """
+        xs, ys, org, onext = self.xs, self.ys, self.org, self.onext
+
+        # tangente commune inférieure des deux moitiés
+        while True:
+            o, a, b = org[rdi], org[ldi], org[ldi ^ 2]
+            if orient2d(xs[o], ys[o], xs[a], ys[a], xs[b], ys[b]) > 0:
+                ldi = _rot(onext[_rot(ldi) ^ 2])
+                continue
+            o, a, b = org[ldi], org[rdi ^ 2], org[rdi]
+            if orient2d(xs[o], ys[o], xs[a], ys[a], xs[b], ys[b]) > 0:
+                rdi = onext[rdi ^ 2]
+                continue
+            break
+
+        basel = self.connect(rdi ^ 2, ldi)
+        if org[ldi] == org[ldo]:
+            ldo = basel ^ 2
+        if org[rdi] == org[rdo]:
+            rdo = basel
+
+        # on remonte en ajoutant les arêtes croisées de Delaunay
+        while True:
+            b_org, b_dest = org[basel], org[basel ^ 2]
+            ox, oy, dx, dy = xs[b_org], ys[b_org], xs[b_dest], ys[b_dest]
+
+            lcand = onext[basel ^ 2]
+            c = org[lcand ^ 2]
+            l_valide = orient2d(xs[c], ys[c], dx, dy, ox, oy) > 0
+            if l_valide:
+                while True:
+                    suivant = onext[lcand]
+                    e = org[suivant ^ 2]
+                    # e == b_org : on a fait le tour, le point est sur le cercle
+                    if (
+                        e == b_org
+                        or incircle(dx, dy, ox, oy, xs[c], ys[c], xs[e], ys[e]) <= 0
+                    ):
+                        break
+                    self.delete_edge(lcand)
+                    lcand = suivant
+                    c = org[lcand ^ 2]
+
+            rcand = _rot(onext[(basel & ~3) | ((basel + 1) & 3)])
+            c = org[rcand ^ 2]
+            r_valide = orient2d(xs[c], ys[c], dx, dy, ox, oy) > 0
+            if r_valide:
+                while True:
+                    suivant = _rot(onext[(rcand & ~3) | ((rcand + 1) & 3)])
+                    e = org[suivant ^ 2]
+                    # e == b_org : on a fait le tour, le point est sur le cercle
+                    if (
+                        e == b_org
+                        or incircle(dx, dy, ox, oy, xs[c], ys[c], xs[e], ys[e]) <= 0
+                    ):
+                        break
+                    self.delete_edge(rcand)
+                    rcand = suivant
+                    c = org[rcand ^ 2]
+
+            if not l_valide and not r_valide:
+                break
+            if not l_valide:
+                basel = self.connect(rcand, basel ^ 2)
+                continue
+            if r_valide:
+                a, b, c, d = org[lcand ^ 2], org[lcand], org[rcand], org[rcand ^ 2]
+                if incircle(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], xs[d], ys[d]) > 0:
+                    basel = self.connect(rcand, basel ^ 2)
+                    continue
+            basel = self.connect(basel ^ 2, lcand ^ 2)
+        return ldo, rdo
+
+    def triangles(self) -> array:
+        """Retourne à plat les faces triangulaires bornées (sens trigonométrique)."""
+        org = self.org
+        vue = [False] * len(self.onext)
+        triangles = array('I')
+        for q, supprimee in enumerate(self.supprimee):
+            if supprimee:
+                continue
+            for e in (4 * q, 4 * q + 2):
+                if vue[e]:
+                    continue
+                f = self.lnext(e)
+                g = self.lnext(f)
+                vue[e] = vue[f] = vue[g] = True
+                if self.lnext(g) == e and self.ccw(org[e], org[f], org[g]):
+                    triangles.extend((org[e], org[f], org[g]))
+        return triangles
+
+
+def _rot(e: int) -> int:
+    """Rotation d'un quart de tour de l'arête e."""
+    return (e & ~3) | ((e + 1) & 3)
+
+
+def _divide_and_conquer(xs: Sequence[float], ys: Sequence[float]) -> array:
+    """Construit la triangulation de Delaunay par division (Guibas et Stolfi).
+
+    Les points, triés par x puis y, sont coupés récursivement en deux moitiés dont les
+    triangulations sont fusionnées le long de la tangente commune inférieure.
+
+    parametres:
+        xs, ys: coordonnées de points distincts et non tous colinéaires.
+    """
+    tries = sorted(range(len(xs)), key=lambda i: (xs[i], ys[i]))
+    subdivision = _QuadEdge(xs, ys)
+    subdivision.build(tries, 0, len(tries))
+    return subdivision.triangles()
+
+
+def _strip_worker(
+    nom: str, n: int, lo: int, hi: int
+) -> tuple[bytes, bytes, bytes, int, int]:
+    """Triangule une bande de points dans un processus de travail.
+
+    Les coordonnées triées sont lues dans la mémoire partagée nom (n abscisses puis n
+    ordonnées, en double). La subdivision est renvoyée sous forme de tableaux bruts pour
+    éviter de sérialiser des objets Python.
+
+    Retourne:
+        (onext, org, supprimee, ldo, rdo) de la subdivision
+        de la bande, en indices locaux.
+    """
+    memoire = shared_memory.SharedMemory(name=nom)
+    try:
+        with memoire.buf.cast('d') as coords:
+            xs = coords[lo:hi].tolist()
+            ys = coords[n + lo:n + hi].tolist()
+    finally:
+        memoire.close()
+    subdivision = _QuadEdge(xs, ys)
+    ldo, rdo = subdivision.build(list(range(hi - lo)), 0, hi - lo)
+    return (
+        array('q', subdivision.onext).tobytes(),
+        array('q', subdivision.org).tobytes(),
+        bytes(subdivision.supprimee),
+        ldo,
+        rdo,
+    )
+
+
+def _divide_and_conquer_parallel(xs: Sequence[float], ys: Sequence[float], workers: int,
+                                 progress: Progress | None = None) -> array:
+    """Construit la triangulation de Delaunay par bandes verticales de points.
+
+    Chaque bande est triangulée par division dans un ProcessPoolExecutor, à partir des
+    coordonnées placées en mémoire partagée. Les subdivisions renvoyées sont recollées
+    dans le processus principal par l'étape de fusion de Guibas et Stolfi, qui rétablit
+    la propriété de Delaunay le long des coutures.
+
+    parametres:
+        xs, ys: coordonnées de points distincts et non tous colinéaires.
+        workers: nombre de processus (et de bandes).
+        progress: appelée avec (points des bandes terminées, total) à la fin de chaque
+            bande ; si elle lève une exception, les bandes pas encore commencées sont
+            annulées et l'exception propagée.
+    """
+    n = len(xs)
+    workers = max(1, min(workers, n // 3))
+    tries = sorted(range(n), key=lambda i: (xs[i], ys[i]))
+    sx = array('d', (xs[i] for i in tries))
+    sy = array('d', (ys[i] for i in tries))
+    bornes = [n * k // workers for k in range(workers + 1)]
+
+    memoire = shared_memory.SharedMemory(create=True, size=16 * n)
+    try:
+        with memoire.buf.cast('d') as coords:
+            coords[:n] = sx
+            coords[n:] = sy
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            taches = [
+                pool.submit(_strip_worker, memoire.name, n, bornes[k], bornes[k + 1])
+                for k in range(workers)
+            ]
+            if progress is not None:
+                tailles = {
+                    tache: bornes[k + 1] - bornes[k] for k, tache in enumerate(taches)
+                }
+                faits = 0
+                try:
+                    for tache in as_completed(taches):
+                        faits += tailles[tache]
+                        progress(faits, n)
+                except BaseException:
+                    for tache in taches:
+                        tache.cancel()
+                    raise
+            bandes = [tache.result() for tache in taches]
+    finally:
+        memoire.close()
+        memoire.unlink()
+
+    subdivision = _QuadEdge(sx, sy)
+    enveloppe = None
+    for lo, (onext, org, supprimee, ldo, rdo) in zip(bornes, bandes, strict=False):
+        base = len(subdivision.onext)
+        subdivision.onext.extend(e + base for e in array('q', onext))
+        subdivision.org.extend(o + lo if o != GHOST else GHOST for o in array('q', org))
+        subdivision.supprimee.extend(map(bool, supprimee))
+        if enveloppe is None:
+            enveloppe = (ldo + base, rdo + base)
+        else:
+            enveloppe = subdivision.merge(
+                enveloppe[0], enveloppe[1], ldo + base, rdo + base
+            )
+
+    return array('I', (tries[i] for i in subdivision.triangles()))
+
+
+def _check_points(xs: Sequence[float], ys: Sequence[float]) -> None:
+    """Vérifie qu'un ensemble de points peut être triangulé.
+
+    Raises:
+        ValueError: Si des points sont dupliqués, s'il y a moins de 3 points
+            ou s'ils sont tous colinéaires.
+
+    """
+    if duplication_point_xy(xs, ys):
         raise ValueError("point existant deja")
-    
-    if len(points) < 3:
-        raise ValueError(f"il faut au moins 3 points dans ce cas tu as donné: {len(points)}")
 
-    if sont_colineaires(points):
+    if len(xs) < 3:
+        raise ValueError(
+            f"il faut au moins 3 points dans ce cas tu as donné: {len(xs)}"
+        )
+
+    if sont_colineaires_xy(xs, ys):
         raise ValueError("point colineaire impossible de faire une triangulation")
-    
-    min_x = min(p[0] for p in points)
-    max_x = max(p[0] for p in points)
-    min_y = min(p[1] for p in points)
-    max_y = max(p[1] for p in points)
-    
-    dx = max_x - min_x
-    dy = max_y - min_y
-    delta_max = max(dx, dy)
-    mid_x = (min_x + max_x) / 2
-    mid_y = (min_y + max_y) / 2
-    
-    p1 = (mid_x - 20 * delta_max, mid_y - delta_max)
-    p2 = (mid_x, mid_y + 20 * delta_max)
-    p3 = (mid_x + 20 * delta_max, mid_y - delta_max)
-    
-    all_points = list(points) + [p1, p2, p3]
-    n = len(points)
-    
-    triangles = [(n, n + 1, n + 2)]
-    
-    for i in range(n):
-        point = points[i]
-        bad_triangles = []
-        
-        for tri in triangles:
-            if point_in_circumcircle(
-                point,
-                all_points[tri[0]],
-                all_points[tri[1]],
-                all_points[tri[2]]
+
+
+def _float32(valeurs: list[float]) -> list[float]:
+    """Arrondit des coordonnées en float 32 bits, la précision de serialize_triangles.
+
+    Raises:
+        ValueError: Si une coordonnée n'est pas finie une fois arrondie.
+
+    """
+    arrondies = array('f', valeurs).tolist()
+    if not all(math.isfinite(c) for c in arrondies):
+        raise ValueError("coordonnee hors de la plage des float 32 bits")
+    return arrondies
+
+
+def triangulate(points: list[Point] | PointSet, method: str = INCREMENTAL,
+                parallel_threshold: int | None = None, workers: int | None = None,
+                progress: Progress | None = None) -> Triangles:
+    """Calcule la triangulation de Delaunay d'un ensemble de points en 2D.
+
+    Deux algorithmes sont disponibles :
+    - INCREMENTAL (par défaut) : Bowyer-Watson. Chaque triangle connaît ses trois
+      voisins : la cavité d'un nouveau point est trouvée par propagation depuis le
+      triangle qui le contient, et les triangles supprimés sont réutilisés en O(1). Les
+      points sont insérés dans l'ordre BRIO (courbe de Hilbert) et localisés par une
+      marche depuis le dernier triangle créé.
+    - DIVIDE_AND_CONQUER : division de Guibas et Stolfi, meilleur pire cas sur
+      les entrées triées ou en grille.
+
+    Au-delà de parallel_threshold points, et si plusieurs processus sont disponibles,
+    les points sont découpés en bandes triangulées en parallèle puis fusionnées (voir
+    _divide_and_conquer_parallel), quel que soit l'algorithme demandé : le résultat est
+    la même triangulation de Delaunay.
+
+    :param points: Liste des points à trianguler, minimum 3 points, les points ne
+        doivent pas être dupliqués et les points ne doivent pas être tous colinéaires
+    :param method: l'algorithme à utiliser, une des valeurs de METHODS
+    :param parallel_threshold: seuil du mode parallèle, PARALLEL_THRESHOLD par défaut
+    :param workers: nombre de processus du mode parallèle, PARALLEL_WORKERS par défaut
+    :param progress: fonction appelée avec (points insérés, total) au début, au fil des
+        insertions de l'algorithme incrémental ou à la fin de chaque bande du mode
+        parallèle, et à la fin ; une exception qu'elle lève interrompt le calcul
+        (annulation), dès la fin d'une bande en mode parallèle
+    :return: Les triangles formant la triangulation (séquence de tuples (i, j,
+        k) d'indices dans le sens trigonométrique), les indices référencent
+        les points dans la liste d'entrée
+    """
+    if method not in METHODS:
+        raise ValueError(f"methode de triangulation inconnue: {method}")
+
+    points = PointSet(points)
+    xs = points.xs
+    ys = points.ys
+
+    _check_points(xs, ys)
+
+    if progress is not None:
+        progress(0, len(points))
+
+    seuil = PARALLEL_THRESHOLD if parallel_threshold is None else parallel_threshold
+    processus = PARALLEL_WORKERS if workers is None else workers
+    if len(points) >= seuil and processus > 1:
+        indices = _divide_and_conquer_parallel(xs, ys, processus, progress)
+    elif method == DIVIDE_AND_CONQUER:
+        indices = _divide_and_conquer(xs, ys)
+    else:
+        indices = _delaunay(xs, ys, _brio_order(xs, ys), progress=progress).triangles()
+
+    if progress is not None:
+        progress(len(points), len(points))
+    return Triangles(points, indices)
+
+
+def _mesh_from_triangles(triangles: Triangles) -> _Mesh:
+    """Reprend une triangulation déjà calculée dans un _Mesh, sans la recalculer.
+
+    Seule l'adjacence entre triangles est reconstruite, et les triangles gardent leurs
+    positions. Les cercles circonscrits des triangles repris ne sont pas calculés
+    d'avance, leurs tests de conflit passent directement par le prédicat incircle ; une
+    modification ou une requête n'en teste que quelques-uns.
+
+    parametres:
+        triangles: Triangulation de Delaunay, triangles dans le sens
+            trigonométrique, comme celle de triangulate.
+
+    Raises:
+        ValueError: Si les triangles ne forment pas une
+            triangulation d'un domaine convexe.
+
+    """
+    vertices = triangles.vertices
+    xs = vertices.xs
+    ys = vertices.ys
+    v = list(triangles.indices)
+    if not v:
+        raise ValueError("triangulation vide")
+    mesh = _Mesh(xs, ys)
+    orient = mesh.orient
+
+    # chaque arête orientée u-w (clé u * n + w) appartient à un seul triangle ; son
+    # opposée, si elle existe, au voisin
+    n = len(xs)
+    aretes = {}
+    for b in range(0, len(v), 3):
+        i, j, k = v[b], v[b + 1], v[b + 2]
+        if orient(xs[i], ys[i], xs[j], ys[j], xs[k], ys[k]) <= 0:
+            raise ValueError(f"triangle mal orienté: ({i}, {j}, {k})")
+        aretes[j * n + k] = b
+        aretes[k * n + i] = b + 1
+        aretes[i * n + j] = b + 2
+    if len(aretes) < len(v):
+        raise ValueError("arête partagée par plus de deux triangles")
+
+    nb = [-1] * len(v)
+    bord = []
+    for cle, pos in aretes.items():
+        u, w = divmod(cle, n)
+        jumelle = aretes.get(w * n + u)
+        if jumelle is None:
+            bord.append((u, w, pos))
+        else:
+            nb[pos] = jumelle // 3
+
+    # un triangle fantôme (w, u, GHOST) de l'autre côté de
+    # chaque arête u-w de l'enveloppe
+    premier = {}
+    second = {}
+    for u, w, pos in bord:
+        g = len(v) // 3
+        if w in premier or u in second:
+            raise ValueError(f"sommet {w if w in premier else u} sur plusieurs bords")
+        v.extend((w, u, GHOST))
+        nb.extend((-1, -1, pos // 3))
+        nb[pos] = g
+        premier[w] = g
+        second[u] = g
+    for _, _, pos in bord:
+        g = nb[pos]
+        x, y = v[3 * g], v[3 * g + 1]
+        if y not in premier or x not in second:
+            raise ValueError("bord de la triangulation ouvert")
+        nb[3 * g] = premier[y]
+        nb[3 * g + 1] = second[x]
+        z = v[3 * premier[y] + 1]
+        if orient(xs[x], ys[x], xs[y], ys[y], xs[z], ys[z]) > 0:
+            raise ValueError("enveloppe de la triangulation non convexe")
+
+    # un seul bord fait le tour de la triangulation : pas de trou
+    g = debut = nb[bord[0][2]]
+    tour = 0
+    while tour < len(bord):
+        g = nb[3 * g]
+        tour += 1
+        if g == debut:
+            break
+    if g != debut or tour != len(bord):
+        raise ValueError("la triangulation a des trous")
+
+    # cercles inconnus : comme pour un triangle trop plat, tol infinie
+    # renvoie chaque test à incircle
+    mesh.v = v
+    mesh.nb = nb
+    mesh.ox = [0.0] * (len(v) // 3)
+    mesh.oy = [0.0] * (len(v) // 3)
+    mesh.r2 = [math.inf] * (len(v) // 3)
+    mesh.tol = [math.inf] * (len(v) // 3)
+    return mesh
+
+
+class DelaunayMesh:
+    """Triangulation de Delaunay modifiable.
+
+    Des points peuvent être insérés ou supprimés sans tout recalculer.
+
+    Une insertion ne remplace que la cavité du nouveau point (les triangles dont le
+    cercle circonscrit le contient), une suppression que l'étoile du sommet retiré. Les
+    indices des sommets ne changent jamais : un sommet supprimé garde sa place dans
+    vertices mais n'est plus utilisé par aucun triangle, et les points insérés
+    reçoivent les indices suivants.
+
+    snapshot et restore utilisent le format de serialize_triangles, où un sommet
+    qu'aucun triangle n'utilise est un sommet supprimé. Les coordonnées sont arrondies
+    en float 32 bits, la précision de ce format, dès qu'elles entrent dans le maillage :
+    la triangulation porte sur les points arrondis, et un snapshot la restaure
+    exactement. Deux points égaux une fois arrondis sont des doublons.
+    """
+
+    def __init__(self, points: list[Point] | PointSet):
+        """Triangule un ensemble de points avec l'algorithme incrémental.
+
+        parametres:
+            points: Liste des points à trianguler, avec les mêmes
+                contraintes que pour triangulate.
+
+        Raises:
+            ValueError: Comme triangulate, ou si une coordonnée
+                dépasse la plage des float 32 bits.
+
+        """
+        points = PointSet(points)
+        xs = _float32(points.xs)
+        ys = _float32(points.ys)
+        _check_points(xs, ys)
+        self._mesh = _delaunay(xs, ys, _brio_order(xs, ys))
+        self._actifs = len(xs)
+
+    @classmethod
+    def from_triangulation(cls, triangles: Triangles) -> "DelaunayMesh":
+        """Reprend une triangulation déjà calculée, sans la recalculer.
+
+        Voir _mesh_from_triangles.
+
+        parametres:
+            triangles: Triangulation de Delaunay, triangles dans le sens
+                trigonométrique, comme celle de triangulate.
+
+        Raises:
+            ValueError: Si les triangles ne forment pas une
+                triangulation d'un domaine convexe.
+
+        """
+        delaunay = cls.__new__(cls)
+        delaunay._mesh = _mesh_from_triangles(triangles)
+        delaunay._actifs = len(set(triangles.indices))
+        return delaunay
+
+    @classmethod
+    def restore(cls, data: bytes) -> "DelaunayMesh":
+        """Recrée une triangulation à partir de son snapshot.
+
+        Raises:
+            ValueError: Si les données sont invalides.
+
+        """
+        return cls.from_triangulation(deserialize_triangles(data)[1])
+
+    def snapshot(self) -> bytes:
+        """Retourne la triangulation au format de serialize_triangles."""
+        return serialize_triangles(self.vertices, self.triangles())
+
+    def __len__(self) -> int:
+        """Retourne le nombre de sommets de la triangulation, hors sommets supprimés."""
+        return self._actifs
+
+    @property
+    def vertices(self) -> PointSet:
+        """Tous les points, indexés comme dans les triangles.
+
+        Les sommets supprimés en font toujours partie.
+        """
+        xs, ys = self._mesh.xs, self._mesh.ys
+        coords = array('d', bytes(16 * len(xs)))
+        coords[0::2] = array('d', xs)
+        coords[1::2] = array('d', ys)
+        return PointSet.from_coords(coords)
+
+    def triangles(self) -> Triangles:
+        """Retourne les triangles courants, dans le sens trigonométrique."""
+        return Triangles(self.vertices, self._mesh.triangles())
+
+    def _vertex_triangle(self, x: float, y: float) -> tuple[int, int]:
+        """Retourne un triangle qui contient (x, y) et le sommet situé en (x, y).
+
+        L'indice du sommet vaut -1 si (x, y) n'est pas un sommet de la triangulation.
+        """
+        mesh = self._mesh
+        t = mesh.locate(x, y)
+        for sommet in mesh.v[3 * t:3 * t + 3]:
+            if sommet != GHOST and mesh.xs[sommet] == x and mesh.ys[sommet] == y:
+                return t, sommet
+        return t, -1
+
+    def insert(self, points: Sequence[Point]) -> list[int]:
+        """Insère des points dans la triangulation.
+
+        Les points sont insérés dans l'ordre de la courbe de Hilbert pour
+        que chaque localisation parte d'un triangle proche ; aucun n'est
+        inséré si l'un d'eux est invalide.
+
+        parametres:
+            points: Points à ajouter.
+
+        Retourne:
+            Les indices attribués aux points, dans l'ordre donné.
+
+        Raises:
+            ValueError: Si un point est déjà un sommet de la triangulation ou
+                apparaît deux fois, ou si une coordonnée dépasse la plage des
+                float 32 bits.
+
+        """
+        points = [(float(x), float(y)) for x, y in points]
+        xs = _float32([x for x, _ in points])
+        ys = _float32([y for _, y in points])
+        if len(set(zip(xs, ys, strict=True))) < len(points):
+            raise ValueError("point existant deja")
+        ordre = _hilbert_sort(list(range(len(points))), xs, ys)
+
+        # vérification avant toute modification, dans l'ordre de Hilbert pour
+        # que chaque marche soit courte
+        mesh = self._mesh
+        depart = mesh.last
+        for pos, i in enumerate(ordre):
+            t, sommet = self._vertex_triangle(xs[i], ys[i])
+            if sommet >= 0:
+                raise ValueError("point existant deja")
+            mesh.last = t
+            if pos == 0:
+                depart = t
+        mesh.last = depart
+
+        debut = len(mesh.xs)
+        mesh.xs.extend(xs)
+        mesh.ys.extend(ys)
+        for i in ordre:
+            mesh.insert(debut + i)
+        self._actifs += len(points)
+        return list(range(debut, len(mesh.xs)))
+
+    def remove(self, index: int) -> None:
+        """Supprime un sommet de la triangulation.
+
+        Le trou laissé par son étoile est retriangulé par oreilles : une oreille (trois
+        sommets consécutifs du bord du trou) est retenue si elle est convexe et si son
+        cercle circonscrit ne contient aucun autre sommet du bord. Pour un sommet de
+        l'enveloppe, le bord du trou passe par le sommet fantôme et les oreilles qui le
+        contiennent sont les nouvelles arêtes de l'enveloppe.
+
+        parametres:
+            index: Indice du sommet à supprimer ; les indices des
+                autres sommets ne changent pas.
+
+        Raises:
+            IndexError: Si l'indice n'existe pas.
+            ValueError: Si le sommet a déjà été supprimé, ou s'il ne resterait
+                pas trois points non colinéaires.
+
+        """
+        mesh = self._mesh
+        xs, ys, v, nb = mesh.xs, mesh.ys, mesh.v, mesh.nb
+        if not 0 <= index < len(xs):
+            raise IndexError("point index out of range")
+        t, sommet = self._vertex_triangle(xs[index], ys[index])
+        if sommet != index:
+            raise ValueError(
+                f"le point {index} n'est pas un sommet de la triangulation"
+            )
+
+        # étoile du sommet dans le sens trigonométrique : le triangle (index,
+        # a, c) est suivi du triangle qui partage l'arête index-c ; le bord du
+        # trou est la suite des arêtes a-c
+        etoile = []
+        bord = {}
+        cycle = []
+        while not etoile or t != etoile[0]:
+            b = 3 * t
+            k = v.index(index, b, b + 3) - b
+            a, c = v[b + (k + 1) % 3], v[b + (k + 2) % 3]
+            etoile.append(t)
+            bord[(a, c)] = nb[b + k]
+            cycle.append(a)
+            t = nb[b + (k + 1) % 3]
+
+        # si l'étoile contient tous les triangles réels, les sommets
+        # restants sont ceux de son bord
+        if all(v[3 * o + 2] == GHOST for o in bord.values()):
+            restants = [q for q in cycle if q != GHOST]
+            if len(restants) < 3 or sont_colineaires_xy(
+                [xs[q] for q in restants], [ys[q] for q in restants]
             ):
-                bad_triangles.append(tri)
-        
-        polygon = []
-        for tri in bad_triangles:
-            for edge in [(tri[0], tri[1]), (tri[1], tri[2]), (tri[2], tri[0])]:
-                shared = False
-                for other_tri in bad_triangles:
-                    if other_tri == tri:
-                        continue
-                    if (edge in [(other_tri[0], other_tri[1]), 
-                                 (other_tri[1], other_tri[2]), 
-                                 (other_tri[2], other_tri[0])] or
-                        (edge[1], edge[0]) in [(other_tri[0], other_tri[1]), 
-                                                (other_tri[1], other_tri[2]), 
-                                                (other_tri[2], other_tri[0])]):
-                        shared = True
-                        break
-                
-                if not shared:
-                    polygon.append(edge)
-        
-        for tri in bad_triangles:
-            triangles.remove(tri)
-        
-        for edge in polygon:
-            triangles.append((edge[0], edge[1], i))
-    
-    final_triangles = []
-    for tri in triangles:
-        if tri[0] < n and tri[1] < n and tri[2] < n:
-            final_triangles.append(tri)
-    
-    return final_triangles
+                raise ValueError("il faut au moins 3 points non colineaires")
+
+        nouveaux = []
+        while len(cycle) > 3:
+            for pos in range(len(cycle)):
+                oreille = (cycle[pos - 1], cycle[pos], cycle[(pos + 1) % len(cycle)])
+                if self._ear(oreille, cycle):
+                    nouveaux.append(oreille)
+                    del cycle[pos]
+                    break
+            else:
+                raise ValueError(f"impossible de retrianguler autour du point {index}")
+        nouveaux.append(tuple(cycle))
+
+        # le fantôme en dernière position, comme dans _Mesh
+        nouveaux = [
+            (b, c, a) if a == GHOST else (c, a, b) if b == GHOST else (a, b, c)
+            for a, b, c in nouveaux
+        ]
+
+        mesh.libres.extend(etoile)
+        aretes = {}
+        for a, b, c in nouveaux:
+            t = mesh._alloc()
+            v[3 * t:3 * t + 3] = (a, b, c)
+            if c != GHOST:
+                mesh._circle(t)
+            for pos, arete in (
+                (3 * t, (b, c)),
+                (3 * t + 1, (c, a)),
+                (3 * t + 2, (a, b)),
+            ):
+                aretes[arete] = pos
+        for (u, w), pos in aretes.items():
+            jumelle = aretes.get((w, u))
+            if jumelle is not None:
+                nb[pos] = jumelle // 3
+            else:
+                nb[pos] = bord[(u, w)]
+                mesh._set_nb_edge(bord[(u, w)], u, w, pos // 3)
+        # la marche de locate repart d'un triangle réel : celui de l'autre côté
+        # d'un nouveau fantôme au besoin
+        mesh.last = t if v[3 * t + 2] != GHOST else nb[3 * t + 2]
+        self._actifs -= 1
+
+    def _ear(self, oreille: tuple[int, int, int], cycle: list[int]) -> bool:
+        """Indique si l'oreille (a, b, c) du bord du trou peut être triangulée."""
+        mesh = self._mesh
+        xs, ys = mesh.xs, mesh.ys
+        a, b, c = oreille
+        autres = [q for q in cycle if q not in oreille and q != GHOST]
+        if GHOST in oreille:
+            # fantôme (x, y, GHOST) : aucun autre sommet au-delà de l'arête x-y
+            x, y = (c, a) if b == GHOST else (b, c) if a == GHOST else (a, b)
+            return not any(mesh.ghost_conflict(x, y, xs[q], ys[q]) for q in autres)
+        if mesh.orient(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]) <= 0:
+            return False
+        return not any(
+            mesh.incircle(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], xs[q], ys[q]) > 0
+            for q in autres
+        )
+
+
+class MeshLocator:
+    """Index de requêtes spatiales sur une triangulation calculée.
+
+    Il donne le triangle qui contient un point et le sommet le plus proche. Chaque
+    requête est une marche orientée (voir _Mesh.locate) qui part d'un triangle de la
+    case du point dans une grille uniforme d'environ LOCATOR_CELL_TRIANGLES triangles
+    par case, et fait donc quelques pas seulement. Le sommet le plus proche est ensuite
+    atteint par descente le long des arêtes vers des sommets de plus en plus proches, ce
+    qui est exact dans une triangulation de Delaunay.
+
+    Les requêtes ne modifient pas l'index, qui peut être partagé entre threads.
+    L'attribut triangles est la triangulation indexée.
+    """
+
+    def __init__(self, triangles: Triangles):
+        """Construit l'index sans recalculer la triangulation.
+
+        parametres:
+            triangles: Triangulation de Delaunay, comme celle de triangulate.
+
+        Raises:
+            ValueError: Si les triangles ne forment pas une
+                triangulation d'un domaine convexe.
+
+        """
+        self.triangles = triangles
+        mesh = self._mesh = _mesh_from_triangles(triangles)
+        xs, ys, v = mesh.xs, mesh.ys, mesh.v
+        nt = len(triangles)
+
+        # un triangle de départ par sommet, pour parcourir ses voisins
+        self._triangle_de = array('i', [-1]) * len(xs)
+        for b in range(0, 3 * nt):
+            self._triangle_de[v[b]] = b // 3
+
+        utilises = [i for i, t in enumerate(self._triangle_de) if t >= 0]
+        self._xmin = min(xs[i] for i in utilises)
+        self._ymin = min(ys[i] for i in utilises)
+        largeur = max(xs[i] for i in utilises) - self._xmin
+        hauteur = max(ys[i] for i in utilises) - self._ymin
+        cases = max(1, nt // LOCATOR_CELL_TRIANGLES)
+        self._colonnes = max(1, min(cases, round(math.sqrt(cases * largeur / hauteur))))
+        self._lignes = max(1, cases // self._colonnes)
+        self._fx = self._colonnes / largeur
+        self._fy = self._lignes / hauteur
+
+        # chaque case retient un triangle dont le centre de gravité y tombe ; une case
+        # vide reprend celui de la case précédente
+        self._grille = array('i', [-1]) * (self._colonnes * self._lignes)
+        for t in range(nt):
+            b = 3 * t
+            i, j, k = v[b], v[b + 1], v[b + 2]
+            self._grille[
+                self._case((xs[i] + xs[j] + xs[k]) / 3, (ys[i] + ys[j] + ys[k]) / 3)
+            ] = t
+        precedent = 0
+        for c, t in enumerate(self._grille):
+            if t < 0:
+                self._grille[c] = precedent
+            else:
+                precedent = t
+
+    def _case(self, x: float, y: float) -> int:
+        """Retourne la case de la grille du point (x, y).
+
+        Un point hors de la grille prend la case la plus proche.
+        """
+        colonne = min(max(int((x - self._xmin) * self._fx), 0), self._colonnes - 1)
+        ligne = min(max(int((y - self._ymin) * self._fy), 0), self._lignes - 1)
+        return ligne * self._colonnes + colonne
+
+    def _voisins(self, sommet: int) -> Iterator[int]:
+        """Parcourt les sommets reliés à sommet par une arête, autour de lui."""
+        v, nb = self._mesh.v, self._mesh.nb
+        t = debut = self._triangle_de[sommet]
+        while True:
+            b = 3 * t
+            k = v.index(sommet, b, b + 3) - b
+            a = v[b + (k + 1) % 3]
+            if a != GHOST:
+                yield a
+            t = nb[b + (k + 1) % 3]
+            if t == debut:
+                return
+
+    def query(self, x: float, y: float) -> tuple[int, int]:
+        """Cherche le triangle qui contient le point (x, y) et le sommet le plus proche.
+
+        parametres:
+            x, y: coordonnées du point.
+
+        Retourne:
+            La position du triangle dans la triangulation indexée, ou -1 si le point est
+            hors de l'enveloppe convexe, et l'indice du sommet le plus proche.
+        """
+        mesh = self._mesh
+        xs, ys, v, nb, orient = mesh.xs, mesh.ys, mesh.v, mesh.nb, mesh.orient
+        t = mesh.locate(x, y, self._grille[self._case(x, y)])
+        b = 3 * t
+        sommets = [s for s in v[b:b + 3] if s != GHOST]
+
+        triangle = t
+        if v[b + 2] == GHOST:
+            # un point sur une arête de l'enveloppe est aussi dans le
+            # triangle réel de l'autre côté
+            r = 3 * nb[b + 2]
+            i, j, k = v[r], v[r + 1], v[r + 2]
+            dedans = (
+                orient(xs[i], ys[i], xs[j], ys[j], x, y) >= 0
+                and orient(xs[j], ys[j], xs[k], ys[k], x, y) >= 0
+                and orient(xs[k], ys[k], xs[i], ys[i], x, y) >= 0
+            )
+            triangle = r // 3 if dedans else -1
+
+        def distance2(s: int) -> float:
+            # produits plutôt que ** 2 : un carré trop grand donne inf au lieu de
+            # lever OverflowError
+            dx = xs[s] - x
+            dy = ys[s] - y
+            return dx * dx + dy * dy
+
+        # descente vers des sommets de plus en plus proches
+        courant = min(sommets, key=distance2)
+        distance = distance2(courant)
+        while True:
+            meilleur = courant
+            for q in self._voisins(courant):
+                d = distance2(q)
+                if d < distance:
+                    meilleur, distance = q, d
+            if meilleur == courant:
+                return triangle, courant
+            courant = meilleur
+
+    def query_all(self, points: list[Point] | PointSet) -> tuple[array, array]:
+        """Variante de query pour un lot de points.
+
+        Retourne:
+            Les positions des triangles (array('i'), -1 hors de l'enveloppe) et les
+            indices des sommets les plus proches (array('I')), dans l'ordre des points.
+        """
+        triangles = array('i')
+        sommets = array('I')
+        for x, y in points:
+            triangle, sommet = self.query(x, y)
+            triangles.append(triangle)
+            sommets.append(sommet)
+        return triangles, sommets
+
+
+def _canonical(i: int, j: int, k: int) -> Triangle:
+    """Tourne le triangle (i, j, k) pour commencer par son plus petit indice."""
+    if i < j and i < k:
+        return i, j, k
+    if j < k:
+        return j, k, i
+    return k, i, j
+
+
+def triangulation_delta(
+    base: Triangles, points: list[Point] | PointSet
+) -> TriangulationDelta:
+    """Calcule la triangulation d'une nouvelle version à partir de l'ancienne.
+
+    Seul ce qui a changé est retourné. Les sommets sont reconnus par leurs coordonnées.
+    Quand peu de points changent, la triangulation de base est reprise dans un
+    DelaunayMesh (sans recalcul), les nouveaux points y sont insérés puis les points
+    disparus supprimés : seules les cavités touchées sont recalculées. Au-delà de
+    DELTA_REBUILD_RATIO, la nouvelle version est triangulée en entier.
+
+    parametres:
+        base: Triangulation de l'ancienne version, dans le sens
+            trigonométrique (comme celle de triangulate).
+        points: Nouvelle version des points.
+
+    Retourne:
+        Les sommets ajoutés, les positions dans base des triangles
+        supprimés et les triangles ajoutés, avec les indices de sommets de
+        base (voir TriangulationDelta).
+
+    Raises:
+        ValueError: Si la nouvelle version ne peut pas être triangulée (comme
+            triangulate), ou si base n'est pas une triangulation valide.
+
+    """
+    points = PointSet(points)
+    xs = points.xs
+    ys = points.ys
+    _check_points(xs, ys)
+
+    # un sommet de base qu'aucun triangle n'utilise est considéré comme supprimé
+    utilises = set(base.indices)
+    anciens = {point: i for i, point in enumerate(base.vertices) if i in utilises}
+    indices = [anciens.get(point, -1) for point in zip(xs, ys, strict=True)]
+    ajouts = [
+        point
+        for point, i in zip(zip(xs, ys, strict=True), indices, strict=True)
+        if i < 0
+    ]
+    supprimes = sorted(utilises.difference(indices))
+
+    if (len(ajouts) + len(supprimes)) > DELTA_REBUILD_RATIO * len(points):
+        # les ajouts prennent les indices suivant ceux de la
+        # base, dans l'ordre de points
+        suivant = iter(range(len(base.vertices), len(base.vertices) + len(ajouts)))
+        indices = [i if i >= 0 else next(suivant) for i in indices]
+        nouveaux = [
+            (indices[i], indices[j], indices[k]) for i, j, k in triangulate(points)
+        ]
+    else:
+        # insertions d'abord : chaque étape garde un sur-ensemble des
+        # points finaux, jamais colinéaire
+        maillage = DelaunayMesh.from_triangulation(base)
+        maillage.insert(ajouts)
+        # dans l'ordre de Hilbert, chaque localisation part près du sommet précédent
+        for i in _hilbert_sort(supprimes, maillage._mesh.xs, maillage._mesh.ys):
+            maillage.remove(i)
+        nouveaux = list(maillage.triangles())
+
+    nouveaux = [_canonical(*triangle) for triangle in nouveaux]
+    recherche = set(nouveaux)
+    conserves = set()
+    removed = array('I')
+    for position, triangle in enumerate(base):
+        triangle = _canonical(*triangle)
+        if triangle in recherche:
+            conserves.add(triangle)
+        else:
+            removed.append(position)
+    triangles = array(
+        'I', (i for triangle in nouveaux if triangle not in conserves for i in triangle)
+    )
+
+    coords = array('d', bytes(16 * len(ajouts)))
+    coords[0::2] = array('d', (x for x, _ in ajouts))
+    coords[1::2] = array('d', (y for _, y in ajouts))
+    return TriangulationDelta(
+        len(base.vertices), len(base), PointSet.from_coords(coords), removed, triangles
+    )
+
+
+def voronoi_from_triangles(triangles: Triangles) -> VoronoiDiagram:
+    """Construit le diagramme de Voronoi dual d'une triangulation, sans la recalculer.
+
+    Les sommets de Voronoi sont les centres des cercles circonscrits des triangles
+    (geometry.circumcircle). La cellule d'un sommet est la suite des centres des
+    triangles qui l'entourent : en suivant l'adjacence des triangles, chaque cellule
+    est parcourue une fois et le diagramme est construit en temps linéaire.
+
+    parametres:
+        triangles: Triangulation de Delaunay, triangles dans le sens
+            trigonométrique, comme celle de triangulate.
+
+    Retourne:
+        Le diagramme de Voronoi (voir VoronoiDiagram).
+
+    Raises:
+        ValueError: Si une arête orientée appartient à plusieurs triangles.
+
+    """
+    vertices = triangles.vertices
+    indices = triangles.indices
+    n = len(vertices)
+
+    centres = array('d')
+    for i, j, k in triangles:
+        centre, _ = circumcircle(vertices[i], vertices[j], vertices[k])
+        centres.extend(centre)
+
+    # l'arête orientée s-u (clé s * n + u) part de la position de s dans son
+    # triangle (s, u, w) ; le triangle suivant autour de s dans le sens
+    # trigonométrique est celui de l'arête s-w
+    m = len(indices)
+    aretes = {}
+    for p in range(0, m, 3):
+        i, j, k = indices[p], indices[p + 1], indices[p + 2]
+        aretes[i * n + j] = p
+        aretes[j * n + k] = p + 1
+        aretes[k * n + i] = p + 2
+    if len(aretes) < m:
+        raise ValueError("arête partagée par plus de deux triangles")
+    chercher = aretes.get
+    tourne = [
+        chercher(indices[p] * n + indices[p + 2 if p % 3 == 0 else p - 1], -1)
+        for p in range(m)
+    ]
 
+    # départ de chaque cellule : pour un sommet de l'enveloppe, le premier triangle dans
+    # le sens trigonométrique, qu'aucun triangle ne précède
+    depart = [-1] * n
+    for p in range(m):
+        depart[indices[p]] = p
+    ouvert = [False] * n
+    for p in set(range(m)).difference(tourne):
+        depart[indices[p]] = p
+        ouvert[indices[p]] = True
 
+    offsets = array('I', [0])
+    cells = []
+    for s in range(n):
+        p = q = depart[s]
+        while q >= 0:
+            cells.append(q // 3)
+            q = tourne[q]
+            if q == p:
+                break
+        if ouvert[s]:
+            cells.append(VORONOI_INFINITY)
+        offsets.append(len(cells))
+    return VoronoiDiagram(PointSet.from_coords(centres), offsets, array('I', cells))
@@ -1,10 +1,49 @@
+import math
 import os
-from flask import Flask, jsonify, Response
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
 import requests
-from triangulator.client import PointSetManagerClient
-from triangulator.algorithm import triangulate
-from triangulator.serialization import serialize_triangles
+from flask import Flask, Response, jsonify, request
 
+from triangulator.algorithm import (
+    ALGORITHM_VERSION,
+    INCREMENTAL,
+    METHODS,
+    MeshLocator,
+    Progress,
+    triangulate,
+    triangulation_delta,
+    voronoi_from_triangles,
+)
+from triangulator.cache import (
+    DiskTier,
+    ObjectCache,
+    SingleFlight,
+    TriangulationCache,
+    payload_digest,
+)
+from triangulator.client import PointSetManagerClient
+from triangulator.jobs import DONE, FAILED, Job, JobManager, JobQueueFull
+from triangulator.models import Triangles
+from triangulator.serialization import (
+    CHUNK_SIZE,
+    DELTA_ENCODING,
+    FLOAT32_MAX,
+    BatchResult,
+    compress_triangles,
+    decompress_pointset,
+    deserialize_pointset,
+    deserialize_triangles,
+    serialize_batch_entry,
+    serialize_batch_header,
+    serialize_delta,
+    serialize_locations,
+    serialize_triangles,
+    serialize_triangles_stream,
+    serialize_voronoi,
+    serialized_triangles_size,
+)
 
 app = Flask(__name__)
 
@@ -14,18 +53,289 @@ POINTSET_MANAGER_URL = os.environ.get(
     'http://localhost:5000'
 )
 
-pointset_client = PointSetManagerClient(POINTSET_MANAGER_URL)
+# Budget mémoire du cache des triangulations, et répertoire
+# optionnel de son niveau disque
+CACHE_MAX_BYTES = int(os.environ.get('TRIANGULATION_CACHE_BYTES', 256 * 1024 * 1024))
+CACHE_DIR = os.environ.get('TRIANGULATION_CACHE_DIR')
+
+# Délais (secondes), taille du pool de connexions et nouvelles
+# tentatives vers le PointSetManager
+POINTSET_MANAGER_CONNECT_TIMEOUT = float(
+    os.environ.get('POINTSET_MANAGER_CONNECT_TIMEOUT', 2.0)
+)
+POINTSET_MANAGER_READ_TIMEOUT = float(
+    os.environ.get('POINTSET_MANAGER_READ_TIMEOUT', 5.0)
+)
+POINTSET_MANAGER_POOL_SIZE = int(os.environ.get('POINTSET_MANAGER_POOL_SIZE', 10))
+POINTSET_MANAGER_RETRIES = int(os.environ.get('POINTSET_MANAGER_RETRIES', 2))
+
+pointset_client = PointSetManagerClient(
+    POINTSET_MANAGER_URL,
+    connect_timeout=POINTSET_MANAGER_CONNECT_TIMEOUT,
+    read_timeout=POINTSET_MANAGER_READ_TIMEOUT,
+    pool_size=POINTSET_MANAGER_POOL_SIZE,
+    retries=POINTSET_MANAGER_RETRIES,
+)
+
+# Les PointSets sont immuables : une triangulation sérialisée reste valide pour toujours
+triangulation_cache = TriangulationCache(
+    CACHE_MAX_BYTES, DiskTier(CACHE_DIR) if CACHE_DIR else None
+)
+
+# Les requêtes concurrentes pour un même PointSet et algorithme partagent un seul calcul
+triangulation_flights = SingleFlight()
+
+# Nombre de processus de triangulation ; par défaut un par processeur
+TRIANGULATION_WORKERS = int(
+    os.environ.get('TRIANGULATION_WORKERS', os.cpu_count() or 1)
+)
+
+# Taille maximale en octets d'un PointSet envoyé à POST /triangulation
+UPLOAD_MAX_BYTES = int(
+    os.environ.get('TRIANGULATION_UPLOAD_MAX_BYTES', 256 * 1024 * 1024)
+)
+
+# Nombre maximal d'identifiants par requête POST /triangulations
+BATCH_MAX_IDS = int(os.environ.get('TRIANGULATION_BATCH_MAX_IDS', 1000))
+
+# Jobs de triangulation en arrière-plan : nombre exécutés en même temps, nombre en
+# attente, et nombre de jobs terminés gardés pour consultation
+JOBS_CONCURRENCY = int(os.environ.get('TRIANGULATION_JOBS_CONCURRENCY', 2))
+JOBS_MAX_PENDING = int(os.environ.get('TRIANGULATION_JOBS_MAX_PENDING', 100))
+JOBS_RETAINED = int(os.environ.get('TRIANGULATION_JOBS_RETAINED', 1000))
+
+triangulation_jobs = JobManager(JOBS_CONCURRENCY, JOBS_MAX_PENDING, JOBS_RETAINED)
+
+# Nombre d'index de requêtes spatiales (MeshLocator) gardés en mémoire, un
+# par triangulation interrogée
+LOCATORS_MAX = int(os.environ.get('TRIANGULATION_LOCATORS', 16))
+
+triangulation_locators = ObjectCache(LOCATORS_MAX)
+
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def process_pool() -> ProcessPoolExecutor:
+    """Retourne le pool de processus de triangulation, créé au premier appel."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=TRIANGULATION_WORKERS)
+    return _process_pool
+
+
+class ApiError(Exception):
+    """Erreur renvoyée au client en JSON {'code', 'message'} avec un statut HTTP."""
+
+    def __init__(self, code: str, message: str, status: int):
+        """Initialise l'erreur.
+
+        parametres:
+            code: Code d'erreur lisible par le client (ex. 'INVALID_ID').
+            message: Description de l'erreur.
+            status: Statut HTTP de la réponse.
+        """
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+
+    def __reduce__(self):
+        """Permet de transmettre l'erreur depuis un processus de calcul."""
+        return ApiError, (self.code, self.message, self.status)
+
+    def to_response(self):
+        """Retourne la réponse JSON Flask de l'erreur."""
+        return jsonify({'code': self.code, 'message': self.message}), self.status
+
+
+def fetch_pointset(pointset_id: str) -> bytes:
+    """Récupère le PointSet sérialisé auprès du PointSetManager.
+
+    parametres:
+        pointset_id: UUID de l'ensemble de points.
+
+    Retourne:
+        Les octets du PointSet, non décodés.
+
+    Raises:
+        ApiError: Si le PointSet est introuvable ou si le PointSetManager ne répond pas.
+
+    """
+    try:
+        return pointset_client.get_pointset_payload(pointset_id)
+    except requests.HTTPError as e:
+        raise pointset_error(pointset_id, e) from e
+
+
+def pointset_error(pointset_id: str, e: requests.HTTPError) -> ApiError:
+    """Traduit une erreur du PointSetManager en erreur API.
+
+    parametres:
+        pointset_id: UUID de l'ensemble de points demandé.
+        e: Erreur levée par le client du PointSetManager.
+    """
+    if hasattr(e, 'response') and e.response is not None:
+        if e.response.status_code == 404:
+            return ApiError('NOT_FOUND', f'PointSet {pointset_id} not found', 404)
+        elif e.response.status_code == 400:
+            return ApiError('BAD_REQUEST', 'Invalid request to PointSetManager', 400)
+
+    return ApiError('SERVICE_UNAVAILABLE', 'PointSetManager is unavailable', 503)
+
+
+def compute_triangulation(
+    payload: bytes, method: str, progress: Progress | None = None
+) -> Triangles:
+    """Décode un PointSet sérialisé et le triangule.
+
+    parametres:
+        payload: PointSet au format de serialize_pointset.
+        method: algorithme de triangulation.
+        progress: suivi de progression passé à triangulate.
+
+    Retourne:
+        Les triangles calculés.
+
+    Raises:
+        ApiError: Si le PointSet est invalide ou si la triangulation échoue.
+
+    """
+    try:
+        points = deserialize_pointset(payload)
+    except ValueError as e:
+        raise ApiError('INVALID_DATA', f'Invalid PointSet data: {str(e)}', 500) from e
+
+    # Valider le nombre de points
+    if len(points) < 3:
+        raise ApiError(
+            'INSUFFICIENT_POINTS', f'Need at least 3 points, got {len(points)}', 400
+        )
+
+    # Calculer la triangulation
+    try:
+        return triangulate(points, method, progress=progress)
+    except ValueError as e:
+        raise ApiError(
+            'TRIANGULATION_FAILED', f'Triangulation failed: {str(e)}', 500
+        ) from e
+
+
+def _negotiated_encoding() -> str | None:
+    """Retourne DELTA_ENCODING si Accept-Encoding le nomme explicitement, sinon None."""
+    # '*' ne suffit pas : un client qui ne connaît pas le
+    # format ne saurait pas le décoder
+    if any(
+        codage == DELTA_ENCODING and qualite > 0
+        for codage, qualite in request.accept_encodings
+    ):
+        return DELTA_ENCODING
+    return None
+
+
+def _variant_etag(etag: str, encoding: str | None) -> str:
+    """Retourne l'ETag de la représentation envoyée : chaque codage a le sien."""
+    return etag if encoding is None else f'{etag}.{encoding}'
+
+
+def _compressed_triangles(binary_data: bytes, etag: str | None) -> bytes:
+    """Retourne la triangulation codée avec DELTA_ENCODING.
+
+    Le résultat codé est gardé dans le cache sous son ETag.
+    """
+    if etag is None:
+        return compress_triangles(binary_data)
+    cle = f'{DELTA_ENCODING}:{etag}'
+    compresse = triangulation_cache.get(cle, count=False)
+    if compresse is None:
+        compresse = compress_triangles(binary_data)
+        triangulation_cache.put(cle, compresse)
+    return compresse
+
+
+def _binary_body(binary_data: bytes | memoryview) -> bytes | Iterator[bytes]:
+    """Retourne le corps d'une réponse binaire.
+
+    Un résultat projeté depuis le disque est envoyé par
+    morceaux, sans être lu en entier.
+    """
+    if isinstance(binary_data, bytes):
+        return binary_data
+    vue = memoryview(binary_data)
+    return (
+        bytes(vue[debut : debut + CHUNK_SIZE])
+        for debut in range(0, len(vue), CHUNK_SIZE)
+    )
+
+
+def _octet_response(
+    binary_data: bytes | memoryview, cache: str, etag: str | None = None
+) -> Response:
+    """Retourne une réponse binaire avec son ETag et l'état du cache dans X-Cache.
+
+    Le résultat est codé avec DELTA_ENCODING si le client
+    l'accepte (en-tête Content-Encoding).
+    """
+    encoding = _negotiated_encoding()
+    if encoding is not None:
+        binary_data = _compressed_triangles(binary_data, etag)
+    response = Response(
+        _binary_body(binary_data),
+        mimetype='application/octet-stream',
+        headers={'X-Cache': cache},
+    )
+    response.content_length = len(binary_data)
+    response.vary.add('Accept-Encoding')
+    if encoding is not None:
+        response.content_encoding = encoding
+    if etag is not None:
+        response.set_etag(_variant_etag(etag, encoding))
+    return response
+
+
+def result_etag(empreinte: str, method: str) -> str:
+    """Retourne l'ETag fort, sans guillemets, de la triangulation d'un contenu.
+
+    Il ne dépend que de l'empreinte du PointSet, de l'algorithme et de
+    ALGORITHM_VERSION : il est connu sans recalculer le résultat, ni même relire le
+    PointSet quand son empreinte est en cache.
+    """
+    return f'{empreinte}-{method}-v{ALGORITHM_VERSION}'
+
+
+def _not_modified(etag: str) -> Response | None:
+    """Retourne une réponse 304 si l'en-tête If-None-Match désigne etag, sinon None."""
+    etag = _variant_etag(etag, _negotiated_encoding())
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304)
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    return response
 
 
 @app.route('/triangulation/<pointset_id>', methods=['GET'])
 def get_triangulation(pointset_id: str):
     """Calcule la triangulation pour un ensemble de points (PointSet).
-    
+
+    Le résultat sérialisé est gardé dans triangulation_cache sous l'empreinte du contenu
+    du PointSet et l'algorithme : deux identifiants aux contenus identiques partagent la
+    même entrée. L'empreinte de chaque identifiant est aussi gardée, ce qui évite de
+    refaire l'appel au PointSetManager.
+
+    La réponse porte un ETag (voir result_etag) ; une requête dont l'en-tête
+    If-None-Match le désigne reçoit 304 Not Modified, sans appel au
+    PointSetManager si l'empreinte est en cache.
+
     parametres:
         pointset_id: UUID de l'ensemble de points.
-    
+        method (query string, optionnel): algorithme de triangulation, "incremental"
+            (défaut) ou "divide_and_conquer".
+
     Retourne:
-        Représentation binaire des triangles ou une erreur JSON.
+        Représentation binaire des triangles, 304 sans corps, ou une erreur JSON. Un
+        résultat trop grand pour le cache est envoyé par morceaux avec sa taille dans
+        Content-Length. Avec "Accept-Encoding: x-delta-varint", le résultat est envoyé
+        au format de compress_triangles.
     """
     # Valider le format de l'UUID
     if not pointset_id or len(pointset_id) != 36:
@@ -33,58 +343,946 @@ def get_triangulation(pointset_id: str):
             'code': 'INVALID_ID',
             'message': 'Invalid PointSetID format'
         }), 400
-    
-    # Recuperer le PointSet depuis le PointSetManager
+
+    method = request.args.get('method', INCREMENTAL)
+    if method not in METHODS:
+        return jsonify({
+            'code': 'INVALID_METHOD',
+            'message': f'Unknown triangulation method: {method}'
+        }), 400
+
+    binary_data, empreinte = _cached_triangulation(pointset_id, method)
+    if empreinte is not None:
+        etag = result_etag(empreinte, method)
+        response = _not_modified(etag)
+        if response is not None:
+            return response
+        if binary_data is not None:
+            return _octet_response(binary_data, 'HIT', etag)
+
     try:
-        points = pointset_client.get_pointset(pointset_id)
-    except requests.HTTPError as e:
-        if hasattr(e, 'response') and e.response is not None:
-            if e.response.status_code == 404:
-                return jsonify({
-                    'code': 'NOT_FOUND',
-                    'message': f'PointSet {pointset_id} not found'
-                }), 404
-            elif e.response.status_code == 400:
-                return jsonify({
-                    'code': 'BAD_REQUEST',
-                    'message': 'Invalid request to PointSetManager'
-                }), 400
-        
+        binary_data, triangles, etat, empreinte = triangulation_flights.do(
+            f'{method}:{pointset_id}',
+            lambda: _triangulation_result(pointset_id, method, empreinte is not None),
+        )
+    except ApiError as e:
+        return e.to_response()
+
+    etag = result_etag(empreinte, method)
+    return _not_modified(etag) or _triangulation_response(
+        binary_data, triangles, etat, etag
+    )
+
+
+def _triangulation_response(
+    binary_data: bytes | None,
+    triangles: Triangles | None,
+    etat: str,
+    etag: str | None = None,
+):
+    """Retourne la réponse d'un résultat de _triangulation_result ou _content_result."""
+    if binary_data is not None:
+        return _octet_response(binary_data, etat, etag)
+
+    if _negotiated_encoding() is not None:
+        # le codage compressé porte sur le résultat entier : pas d'envoi par morceaux
+        try:
+            binary_data = serialize_triangles(triangles.vertices, triangles)
+        except Exception as e:
+            return serialization_error(e).to_response()
+        return _octet_response(binary_data, etat, etag)
+
+    # Sans place dans le cache, le résultat est envoyé par morceaux
+    try:
+        chunks = serialize_triangles_stream(triangles.vertices, triangles)
+        response = Response(
+            chunks, mimetype='application/octet-stream', headers={'X-Cache': etat}
+        )
+        response.content_length = serialized_triangles_size(
+            triangles.vertices, triangles
+        )
+        response.vary.add('Accept-Encoding')
+        if etag is not None:
+            response.set_etag(etag)
+        return response
+    except Exception as e:
+        return serialization_error(e).to_response()
+
+
+def _cached_triangulation(
+    pointset_id: str, method: str
+) -> tuple[bytes | None, str | None]:
+    """Cherche dans le cache le résultat d'un identifiant dont l'empreinte est connue.
+
+    Retourne:
+        Le résultat sérialisé ou None, et l'empreinte du PointSet si elle est connue ;
+        dans ce cas seulement, la recherche a compté dans les métriques du cache.
+    """
+    # Les PointSets sont immuables : l'empreinte connue d'un identifiant ne change pas
+    # Chaque requête compte un seul succès ou échec dans les métriques du cache
+    empreinte = triangulation_cache.get(f'pointset:{pointset_id}', count=False)
+    if empreinte is None:
+        return None, None
+    empreinte = empreinte.decode()
+    return triangulation_cache.get(f'{method}:{empreinte}'), empreinte
+
+
+def triangulate_payload(payload: bytes, method: str) -> bytes:
+    """Décode, triangule et sérialise un PointSet ; exécuté dans un processus du pool.
+
+    Raises:
+        ApiError: Comme compute_triangulation, ou SERIALIZATION_FAILED.
+
+    """
+    triangles = compute_triangulation(payload, method)
+    try:
+        return serialize_triangles(triangles.vertices, triangles)
+    except Exception as e:
+        raise serialization_error(e) from e
+
+
+def serialization_error(e: Exception) -> ApiError:
+    """Retourne l'erreur API d'une sérialisation qui a échoué."""
+    return ApiError(
+        'SERIALIZATION_FAILED', f'Failed to serialize result: {str(e)}', 500
+    )
+
+
+def _triangulation_result(
+    pointset_id: str, method: str, deja_compte: bool, executor: Executor | None = None
+) -> tuple[bytes | None, Triangles | None, str, str]:
+    """Calcul partagé entre les requêtes concurrentes de get_triangulation.
+
+    parametres:
+        pointset_id: UUID de l'ensemble de points.
+        method: algorithme de triangulation.
+        deja_compte: True si la requête a déjà compté un
+            échec dans les métriques du cache.
+        executor: Pool où faire la triangulation ; par défaut elle est
+            faite dans le thread appelant.
+
+    Retourne:
+        Le résultat sérialisé, ou à défaut les triangles quand ils sont trop grands pour
+        le cache, l'état du cache ('HIT' ou 'MISS') et l'empreinte du PointSet.
+
+    Raises:
+        ApiError: Pour toute erreur, qui est alors renvoyée à chaque requête en attente.
+
+    """
+    payload = fetch_pointset(pointset_id)
+    empreinte = payload_digest(payload)
+    triangulation_cache.put(f'pointset:{pointset_id}', empreinte.encode())
+    return _content_result(payload, empreinte, method, not deja_compte, executor) + (
+        empreinte,
+    )
+
+
+def _content_result(
+    payload: bytes,
+    empreinte: str,
+    method: str,
+    count: bool,
+    executor: Executor | None = None,
+) -> tuple[bytes | None, Triangles | None, str]:
+    """Retrouve dans le cache, ou calcule, la triangulation d'un PointSet sérialisé.
+
+    parametres:
+        payload: PointSet au format de serialize_pointset.
+        empreinte: payload_digest(payload).
+        method: algorithme de triangulation.
+        count: False si la requête a déjà compté dans les métriques du cache.
+        executor: Pool où faire la triangulation ; par défaut elle est
+            faite dans le thread appelant.
+
+    Retourne:
+        Le résultat sérialisé, ou à défaut les triangles quand ils sont trop grands pour
+        le cache, et l'état du cache ('HIT' ou 'MISS').
+    """
+    # Un contenu déjà triangulé sous un autre identifiant n'est ni décodé ni triangulé
+    cle = f'{method}:{empreinte}'
+    binary_data = triangulation_cache.get(cle, count=count)
+    if binary_data is not None:
+        return binary_data, None, 'HIT'
+
+    if executor is not None:
+        binary_data = executor.submit(triangulate_payload, payload, method).result()
+        triangulation_cache.put(cle, binary_data)
+        return binary_data, None, 'MISS'
+
+    triangles = compute_triangulation(payload, method)
+
+    taille = serialized_triangles_size(triangles.vertices, triangles)
+    if taille > triangulation_cache.max_bytes:
+        if triangulation_cache.disk is None:
+            return None, triangles, 'MISS'
+        # trop grand pour la mémoire : écrit sur disque par morceaux, puis servi depuis
+        # la projection du fichier, sans jamais être assemblé en mémoire
+        try:
+            triangulation_cache.disk.put_chunks(
+                cle, serialize_triangles_stream(triangles.vertices, triangles)
+            )
+        except Exception as e:
+            raise serialization_error(e) from e
+        binary_data = triangulation_cache.disk.get(cle)
+        if binary_data is not None:
+            return binary_data, None, 'MISS'
+        return None, triangles, 'MISS'
+    try:
+        binary_data = serialize_triangles(triangles.vertices, triangles)
+    except Exception as e:
+        raise serialization_error(e) from e
+    triangulation_cache.put(cle, binary_data)
+    return binary_data, None, 'MISS'
+
+
+def _read_body() -> bytearray:
+    """Lit le corps de la requête dans un seul buffer alloué d'avance.
+
+    Raises:
+        ApiError: Si le corps dépasse UPLOAD_MAX_BYTES ou est incomplet.
+
+    """
+    trop_grand = ApiError(
+        'PAYLOAD_TOO_LARGE', f'PointSet larger than {UPLOAD_MAX_BYTES} bytes', 413
+    )
+    taille = request.content_length
+    if taille is None:
+        # taille inconnue (corps envoyé par morceaux) : lecture bornée
+        corps = bytearray(request.stream.read(UPLOAD_MAX_BYTES + 1))
+        if len(corps) > UPLOAD_MAX_BYTES:
+            raise trop_grand
+        return corps
+    if taille > UPLOAD_MAX_BYTES:
+        raise trop_grand
+
+    corps = bytearray(taille)
+    vue = memoryview(corps)
+    lus = 0
+    while lus < taille:
+        n = request.stream.readinto(vue[lus:])
+        if not n:
+            raise ApiError(
+                'INVALID_DATA',
+                f'Invalid PointSet data: body truncated at {lus} bytes',
+                400,
+            )
+        lus += n
+    return corps
+
+
+@app.route('/triangulation', methods=['POST'])
+def post_triangulation():
+    """Calcule la triangulation d'un PointSet envoyé dans le corps de la requête.
+
+    Le corps est au format de serialize_pointset ; il est lu une seule fois dans
+    un buffer et décodé sans copie. Le résultat partage le cache par contenu de
+    GET /triangulation/<pointset_id>.
+
+    parametres:
+        corps: PointSet au format binaire, au plus UPLOAD_MAX_BYTES octets,
+            éventuellement au format de compress_pointset avec
+            "Content-Encoding: x-delta-varint".
+        method (query string, optionnel): algorithme de triangulation.
+
+    Retourne:
+        Représentation binaire des triangles avec son ETag, ou 304, comme GET
+        /triangulation/<pointset_id>, ou une erreur JSON.
+    """
+    method = request.args.get('method', INCREMENTAL)
+    if method not in METHODS:
         return jsonify({
-            'code': 'SERVICE_UNAVAILABLE',
-            'message': 'PointSetManager is unavailable'
-        }), 503
-    except ValueError as e:
+            'code': 'INVALID_METHOD',
+            'message': f'Unknown triangulation method: {method}'
+        }), 400
+
+    encoding = request.headers.get('Content-Encoding', 'identity').strip().lower()
+    if encoding not in ('identity', DELTA_ENCODING):
         return jsonify({
-            'code': 'INVALID_DATA',
-            'message': f'Invalid PointSet data: {str(e)}'
-        }), 500
-    
-    # Valider le nombre de points
+            'code': 'UNSUPPORTED_ENCODING',
+            'message': f'Unsupported Content-Encoding: {encoding}'
+        }), 415
+
+    try:
+        payload = _read_body()
+        if encoding == DELTA_ENCODING:
+            try:
+                payload = decompress_pointset(payload, UPLOAD_MAX_BYTES)
+            except ValueError as e:
+                raise ApiError(
+                    'INVALID_DATA', f'Invalid PointSet data: {str(e)}', 400
+                ) from e
+        # mêmes règles que pour un PointSet du PointSetManager,
+        # mais l'erreur vient du client
+        try:
+            points = deserialize_pointset(payload)
+        except ValueError as e:
+            raise ApiError(
+                'INVALID_DATA', f'Invalid PointSet data: {str(e)}', 400
+            ) from e
+        if not all(math.isfinite(c) for c in points.coords):
+            raise ApiError(
+                'INVALID_DATA', 'Invalid PointSet data: coordinates must be finite', 400
+            )
+        if len(points) < 3:
+            raise ApiError(
+                'INSUFFICIENT_POINTS', f'Need at least 3 points, got {len(points)}', 400
+            )
+
+        empreinte = payload_digest(payload)
+        etag = result_etag(empreinte, method)
+        response = _not_modified(etag)
+        if response is not None:
+            return response
+        resultat = triangulation_flights.do(
+            f'{method}:{empreinte}',
+            lambda: _content_result(payload, empreinte, method, True),
+        )
+    except ApiError as e:
+        return e.to_response()
+
+    return _triangulation_response(*resultat, etag)
+
+
+def _batch_entry(pointset_id: str, method: str) -> BatchResult:
+    """Calcule une entrée de POST /triangulations comme le ferait GET /triangulation.
+
+    Toute erreur devient le statut et le code de l'entrée : une exception qui
+    s'échapperait couperait le flux, déjà commencé, sans aucun résultat d'erreur.
+    """
+    try:
+        if len(pointset_id) != 36:
+            raise ApiError('INVALID_ID', 'Invalid PointSetID format', 400)
+
+        binary_data, empreinte = _cached_triangulation(pointset_id, method)
+        if binary_data is None:
+            binary_data, triangles, _, _ = triangulation_flights.do(
+                f'{method}:{pointset_id}',
+                lambda: _triangulation_result(
+                    pointset_id, method, empreinte is not None, process_pool()
+                ),
+            )
+            # calcul partagé avec un GET dont le résultat dépasse le budget du cache :
+            # seuls les triangles sont connus
+            if binary_data is None:
+                try:
+                    binary_data = serialize_triangles(triangles.vertices, triangles)
+                except Exception as e:
+                    raise serialization_error(e) from e
+        return BatchResult(pointset_id, 200, '', binary_data)
+    except ApiError as e:
+        return BatchResult(pointset_id, e.status, e.code, e.message.encode())
+    except Exception:
+        # pool de processus cassé, erreur réseau ou du moteur : comme internal_error
+        return BatchResult(pointset_id, 500, 'INTERNAL_ERROR', b'Internal server error')
+
+
+@app.route('/triangulations', methods=['POST'])
+def post_triangulations():
+    """Calcule les triangulations d'un lot de PointSets en un appel.
+
+    Les PointSets sont lus en parallèle avec les connexions du client, puis triangulés
+    dans le pool de processus ; le cache et le regroupement des requêtes sont les
+    mêmes que pour GET /triangulation.
+
+    parametres:
+        corps JSON: {"ids": [pointset_id, ...]}, au plus BATCH_MAX_IDS identifiants.
+        method (query string, optionnel): algorithme de triangulation, pour tout le lot.
+
+    Retourne:
+        Le lot de résultats au format de serialize_batch, envoyé par morceaux au
+        fil des calculs et dans l'ordre de la demande ; chaque entrée a son
+        propre statut et code d'erreur.
+    """
+    method = request.args.get('method', INCREMENTAL)
+    if method not in METHODS:
+        return jsonify({
+            'code': 'INVALID_METHOD',
+            'message': f'Unknown triangulation method: {method}'
+        }), 400
+
+    corps = request.get_json(silent=True)
+    ids = corps.get('ids') if isinstance(corps, dict) else None
+    if not isinstance(ids, list) or not all(
+        isinstance(pointset_id, str) for pointset_id in ids
+    ):
+        return jsonify({
+            'code': 'INVALID_REQUEST',
+            'message': 'Expected a JSON body {"ids": [pointset_id, ...]}'
+        }), 400
+    if len(ids) > BATCH_MAX_IDS:
+        return jsonify({
+            'code': 'INVALID_REQUEST',
+            'message': f'Too many PointSet IDs: {len(ids)} > {BATCH_MAX_IDS}'
+        }), 400
+
+    # autant de lectures simultanées que de connexions dans le pool du client
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(len(ids), POINTSET_MANAGER_POOL_SIZE))
+    )
+    futures = [
+        executor.submit(_batch_entry, pointset_id, method) for pointset_id in ids
+    ]
+
+    def chunks():
+        try:
+            yield serialize_batch_header(len(ids))
+            for future in futures:
+                yield serialize_batch_entry(future.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return Response(chunks(), mimetype='application/octet-stream')
+
+
+def compute_delta(base_data: bytes | memoryview, payload: bytes) -> bytes:
+    """Calcule la différence entre une triangulation de base et un PointSet sérialisé.
+
+    parametres:
+        base_data: Triangulation de base au format de serialize_triangles.
+        payload: Nouvelle version du PointSet, au format de serialize_pointset.
+
+    Retourne:
+        La différence au format de serialize_delta.
+
+    Raises:
+        ApiError: Comme compute_triangulation, ou SERIALIZATION_FAILED.
+
+    """
+    try:
+        points = deserialize_pointset(payload)
+    except ValueError as e:
+        raise ApiError('INVALID_DATA', f'Invalid PointSet data: {str(e)}', 500) from e
+
     if len(points) < 3:
+        raise ApiError(
+            'INSUFFICIENT_POINTS', f'Need at least 3 points, got {len(points)}', 400
+        )
+
+    try:
+        delta = triangulation_delta(deserialize_triangles(base_data)[1], points)
+    except ValueError as e:
+        raise ApiError(
+            'TRIANGULATION_FAILED', f'Triangulation failed: {str(e)}', 500
+        ) from e
+    try:
+        return serialize_delta(delta)
+    except Exception as e:
+        raise serialization_error(e) from e
+
+
+def delta_etag(base_empreinte: str, empreinte: str, method: str) -> str:
+    """Retourne l'ETag fort, sans guillemets, de la différence entre deux contenus."""
+    return f'{base_empreinte}-{result_etag(empreinte, method)}'
+
+
+def _triangulation_data(
+    pointset_id: str, method: str
+) -> tuple[bytes | memoryview, str]:
+    """Retourne le résultat de GET /triangulation/<id> et l'empreinte du PointSet.
+
+    Le résultat est calculé s'il n'est pas en cache.
+
+    Raises:
+        ApiError: Comme get_triangulation.
+
+    """
+    binary_data, empreinte = _cached_triangulation(pointset_id, method)
+    if binary_data is None:
+        binary_data, triangles, _, empreinte = triangulation_flights.do(
+            f'{method}:{pointset_id}',
+            lambda: _triangulation_result(pointset_id, method, empreinte is not None),
+        )
+        if binary_data is None:
+            try:
+                binary_data = serialize_triangles(triangles.vertices, triangles)
+            except Exception as e:
+                raise serialization_error(e) from e
+    return binary_data, empreinte
+
+
+def _delta_result(
+    base_id: str, pointset_id: str, method: str
+) -> tuple[bytes | memoryview, str, str]:
+    """Calcul partagé entre les requêtes concurrentes de get_triangulation_delta.
+
+    Retourne:
+        La différence sérialisée, l'état du cache ('HIT' ou 'MISS') et son ETag.
+
+    Raises:
+        ApiError: Pour toute erreur, qui est alors renvoyée à chaque requête en attente.
+
+    """
+    base_data, base_empreinte = _triangulation_data(base_id, method)
+    payload = fetch_pointset(pointset_id)
+    empreinte = payload_digest(payload)
+    triangulation_cache.put(f'pointset:{pointset_id}', empreinte.encode())
+
+    etag = delta_etag(base_empreinte, empreinte, method)
+    cle = f'delta:{etag}'
+    delta = triangulation_cache.get(cle, count=False)
+    if delta is not None:
+        return delta, 'HIT', etag
+    delta = compute_delta(base_data, payload)
+    triangulation_cache.put(cle, delta)
+    return delta, 'MISS', etag
+
+
+def _derived_response(
+    binary_data: bytes | memoryview | None, etat: str, etag: str
+) -> Response:
+    """Retourne la réponse binaire d'un résultat dérivé d'une triangulation.
+
+    Le résultat est une différence ou un diagramme de Voronoi ; la réponse est 304 si
+    l'en-tête If-None-Match désigne etag.
+
+    Ces formats ne sont pas ceux d'une triangulation : ils ne sont
+    jamais codés avec DELTA_ENCODING.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(
+            _binary_body(binary_data),
+            mimetype='application/octet-stream',
+            headers={'X-Cache': etat},
+        )
+        response.content_length = len(binary_data)
+    response.set_etag(etag)
+    return response
+
+
+@app.route('/triangulation/<pointset_id>/delta', methods=['GET'])
+def get_triangulation_delta(pointset_id: str):
+    """Retourne seulement ce qui change depuis la triangulation d'un PointSet de base.
+
+    Le client détient déjà la triangulation de base ; la différence mène à celle de la
+    nouvelle version.
+
+    La nouvelle triangulation est calculée à partir de celle de base (voir
+    triangulation_delta), qui est reprise du cache. Les sommets conservés gardent leurs
+    indices de base et les sommets ajoutés les suivent : apply_delta(base, différence)
+    donne une triangulation de la nouvelle version au format de serialize_triangles, où
+    les sommets supprimés restent présents sans être utilisés.
+
+    parametres:
+        pointset_id: UUID de la nouvelle version de l'ensemble de points.
+        base (query string): UUID de l'ensemble de points de base.
+        method (query string, optionnel): algorithme de triangulation de la base.
+
+    Retourne:
+        La différence au format de serialize_delta avec son ETag, 304
+        sans corps, ou une erreur JSON.
+    """
+    base_id = request.args.get('base', '')
+    if not pointset_id or len(pointset_id) != 36 or len(base_id) != 36:
         return jsonify({
-            'code': 'INSUFFICIENT_POINTS',
-            'message': f'Need at least 3 points, got {len(points)}'
+            'code': 'INVALID_ID',
+            'message': 'Invalid PointSetID format'
         }), 400
-    
-    # Calculer la triangulation
+
+    method = request.args.get('method', INCREMENTAL)
+    if method not in METHODS:
+        return jsonify({
+            'code': 'INVALID_METHOD',
+            'message': f'Unknown triangulation method: {method}'
+        }), 400
+
+    # empreintes connues : ETag et différence en cache sans
+    # aucun appel au PointSetManager
+    base_empreinte = triangulation_cache.get(f'pointset:{base_id}', count=False)
+    empreinte = triangulation_cache.get(f'pointset:{pointset_id}', count=False)
+    if base_empreinte is not None and empreinte is not None:
+        etag = delta_etag(base_empreinte.decode(), empreinte.decode(), method)
+        delta = triangulation_cache.get(f'delta:{etag}', count=False)
+        if delta is not None or request.if_none_match.contains_weak(etag):
+            return _derived_response(delta, 'HIT', etag)
+
     try:
-        triangles = triangulate(points)
+        delta, etat, etag = triangulation_flights.do(
+            f'delta:{method}:{base_id}:{pointset_id}',
+            lambda: _delta_result(base_id, pointset_id, method),
+        )
+    except ApiError as e:
+        return e.to_response()
+    return _derived_response(delta, etat, etag)
+
+
+def _locator(pointset_id: str, method: str) -> MeshLocator:
+    """Retourne l'index de requêtes spatiales de la triangulation d'un PointSet.
+
+    L'index est construit sur le résultat de GET
+    /triangulation/<pointset_id>, repris du cache ou calculé une fois, et
+    gardé dans triangulation_locators sous l'ETag de ce résultat.
+
+    Raises:
+        ApiError: Comme get_triangulation.
+
+    """
+    binary_data, empreinte = _triangulation_data(pointset_id, method)
+    cle = result_etag(empreinte, method)
+    locator = triangulation_locators.get(cle)
+    if locator is not None:
+        return locator
+
+    def construire() -> MeshLocator:
+        try:
+            locator = MeshLocator(deserialize_triangles(binary_data)[1])
+        except ValueError as e:
+            raise ApiError(
+                'TRIANGULATION_FAILED', f'Invalid triangulation: {str(e)}', 500
+            ) from e
+        triangulation_locators.put(cle, locator)
+        return locator
+
+    return triangulation_flights.do(f'locator:{cle}', construire)
+
+
+def _locate_request(pointset_id: str) -> str:
+    """Valide l'identifiant et l'algorithme d'une requête de localisation.
+
+    Retourne:
+        L'algorithme demandé.
+
+    Raises:
+        ApiError: INVALID_ID ou INVALID_METHOD.
+
+    """
+    if not pointset_id or len(pointset_id) != 36:
+        raise ApiError('INVALID_ID', 'Invalid PointSetID format', 400)
+    method = request.args.get('method', INCREMENTAL)
+    if method not in METHODS:
+        raise ApiError('INVALID_METHOD', f'Unknown triangulation method: {method}', 400)
+    return method
+
+
+@app.route('/triangulation/<pointset_id>/locate', methods=['GET'])
+def get_locate(pointset_id: str):
+    """Cherche le triangle qui contient un point et le sommet le plus proche.
+
+    La recherche se fait dans la triangulation d'un PointSet. La triangulation
+    n'est pas recalculée : la requête utilise le résultat en cache et un index
+    gardé en mémoire (voir MeshLocator).
+
+    parametres:
+        pointset_id: UUID de l'ensemble de points.
+        x, y (query string): coordonnées du point.
+        method (query string, optionnel): algorithme de triangulation.
+
+    Retourne:
+        JSON {"x", "y", "triangle", "vertices", "nearest"} : position du
+        triangle dans le résultat de GET /triangulation/<pointset_id> et indices
+        de ses sommets (null hors de l'enveloppe convexe), indice du sommet le
+        plus proche ; ou une erreur JSON.
+    """
+    try:
+        method = _locate_request(pointset_id)
+        try:
+            x = float(request.args['x'])
+            y = float(request.args['y'])
+        except (KeyError, ValueError):
+            raise ApiError(
+                'INVALID_QUERY',
+                'Expected finite numbers x and y in the query string',
+                400,
+            ) from None
+        # mêmes bornes que les points d'un corps POST, en float32 ; exclut inf et NaN
+        if not (abs(x) <= FLOAT32_MAX and abs(y) <= FLOAT32_MAX):
+            raise ApiError(
+                'INVALID_QUERY',
+                'Expected finite numbers x and y in the query string',
+                400,
+            )
+        locator = _locator(pointset_id, method)
+    except ApiError as e:
+        return e.to_response()
+
+    triangle, sommet = locator.query(x, y)
+    return jsonify({
+        'x': x,
+        'y': y,
+        'triangle': triangle if triangle >= 0 else None,
+        'vertices': list(locator.triangles[triangle]) if triangle >= 0 else None,
+        'nearest': sommet,
+    })
+
+
+@app.route('/triangulation/<pointset_id>/locate', methods=['POST'])
+def post_locate(pointset_id: str):
+    """Variante de GET /triangulation/<pointset_id>/locate pour un lot de points.
+
+    parametres:
+        corps: Points à localiser au format de serialize_pointset,
+            au plus UPLOAD_MAX_BYTES octets.
+        method (query string, optionnel): algorithme de triangulation.
+
+    Retourne:
+        Les réponses au format de serialize_locations, dans l'ordre
+        des points, ou une erreur JSON.
+    """
+    try:
+        method = _locate_request(pointset_id)
+        try:
+            points = deserialize_pointset(_read_body())
+        except ValueError as e:
+            raise ApiError(
+                'INVALID_DATA', f'Invalid PointSet data: {str(e)}', 400
+            ) from e
+        if not all(math.isfinite(c) for c in points.coords):
+            raise ApiError(
+                'INVALID_DATA', 'Invalid PointSet data: coordinates must be finite', 400
+            )
+        locator = _locator(pointset_id, method)
+    except ApiError as e:
+        return e.to_response()
+
+    return Response(
+        serialize_locations(*locator.query_all(points)),
+        mimetype='application/octet-stream',
+    )
+
+
+def voronoi_etag(empreinte: str, method: str) -> str:
+    """Retourne l'ETag fort, sans guillemets, du diagramme de Voronoi d'un contenu."""
+    return f'voronoi-{result_etag(empreinte, method)}'
+
+
+def _voronoi_result(
+    pointset_id: str, method: str
+) -> tuple[bytes | memoryview, str, str]:
+    """Calcul partagé entre les requêtes concurrentes de get_voronoi.
+
+    Retourne:
+        Le diagramme sérialisé, l'état du cache ('HIT' ou 'MISS') et son ETag.
+
+    Raises:
+        ApiError: Comme get_triangulation, ou SERIALIZATION_FAILED.
+
+    """
+    binary_data, empreinte = _triangulation_data(pointset_id, method)
+    etag = voronoi_etag(empreinte, method)
+    cle = f'voronoi:{etag}'
+    voronoi = triangulation_cache.get(cle, count=False)
+    if voronoi is not None:
+        return voronoi, 'HIT', etag
+
+    try:
+        diagramme = voronoi_from_triangles(deserialize_triangles(binary_data)[1])
     except ValueError as e:
+        raise ApiError(
+            'TRIANGULATION_FAILED', f'Invalid triangulation: {str(e)}', 500
+        ) from e
+    try:
+        voronoi = serialize_voronoi(diagramme)
+    except Exception as e:
+        raise serialization_error(e) from e
+    triangulation_cache.put(cle, voronoi)
+    return voronoi, 'MISS', etag
+
+
+@app.route('/voronoi/<pointset_id>', methods=['GET'])
+def get_voronoi(pointset_id: str):
+    """Retourne le diagramme de Voronoi d'un PointSet, dual de sa triangulation.
+
+    Le diagramme est construit à partir du résultat de GET /triangulation/<pointset_id>,
+    repris du cache ou calculé une fois (voir voronoi_from_triangles), et gardé dans
+    triangulation_cache. La réponse porte un ETag ; avec If-None-Match, 304 est renvoyé
+    sans appel au PointSetManager si l'empreinte est en cache.
+
+    parametres:
+        pointset_id: UUID de l'ensemble de points.
+        method (query string, optionnel): algorithme de la triangulation
+            dont le diagramme est le dual.
+
+    Retourne:
+        Le diagramme au format de serialize_voronoi, 304 sans corps, ou une erreur JSON.
+    """
+    if not pointset_id or len(pointset_id) != 36:
+        return jsonify({
+            'code': 'INVALID_ID',
+            'message': 'Invalid PointSetID format'
+        }), 400
+
+    method = request.args.get('method', INCREMENTAL)
+    if method not in METHODS:
         return jsonify({
-            'code': 'TRIANGULATION_FAILED',
-            'message': f'Triangulation failed: {str(e)}'
-        }), 500
-    
-    # Sérialiser et retourner le résultat
-    try:
-        binary_data = serialize_triangles(points, triangles)
-        return Response(binary_data, mimetype='application/octet-stream')
+            'code': 'INVALID_METHOD',
+            'message': f'Unknown triangulation method: {method}'
+        }), 400
+
+    empreinte = triangulation_cache.get(f'pointset:{pointset_id}', count=False)
+    if empreinte is not None:
+        etag = voronoi_etag(empreinte.decode(), method)
+        voronoi = triangulation_cache.get(f'voronoi:{etag}', count=False)
+        if voronoi is not None or request.if_none_match.contains_weak(etag):
+            return _derived_response(voronoi, 'HIT', etag)
+
+    try:
+        voronoi, etat, etag = triangulation_flights.do(
+            f'voronoi:{method}:{pointset_id}',
+            lambda: _voronoi_result(pointset_id, method),
+        )
+    except ApiError as e:
+        return e.to_response()
+    return _derived_response(voronoi, etat, etag)
+
+
+def _run_job(job: Job) -> str:
+    """Calcul d'un job de triangulation, exécuté dans un thread de triangulation_jobs.
+
+    Le résultat passe par le même cache par contenu que GET
+    /triangulation/<pointset_id>. La triangulation est faite dans le thread du job pour
+    pouvoir suivre sa progression et l'annuler.
+
+    Retourne:
+        La clé du résultat dans triangulation_cache : les jobs terminés ne gardent pas
+        les octets, qui restent soumis au budget du cache. Un résultat qui dépasse ce
+        budget sans niveau disque est retourné lui-même, et gardé par le job jusqu'à
+        sa lecture.
+
+    Raises:
+        ApiError: Comme get_triangulation.
+        JobCancelled: Si le job est annulé pendant la triangulation.
+
+    """
+    payload = fetch_pointset(job.pointset_id)
+    empreinte = payload_digest(payload)
+    triangulation_cache.put(f'pointset:{job.pointset_id}', empreinte.encode())
+    cle = f'{job.method}:{empreinte}'
+    if triangulation_cache.get(cle) is not None:
+        return cle
+
+    triangles = compute_triangulation(payload, job.method, progress=job.progress)
+    try:
+        binary_data = serialize_triangles(triangles.vertices, triangles)
     except Exception as e:
+        raise serialization_error(e) from e
+    triangulation_cache.put(cle, binary_data)
+    if (
+        len(binary_data) > triangulation_cache.max_bytes
+        and triangulation_cache.disk is None
+    ):
+        # ni en mémoire ni sur disque : sans le job, le résultat serait perdu
+        return binary_data
+    return cle
+
+
+@app.route('/triangulation/<pointset_id>/jobs', methods=['POST'])
+def post_triangulation_job(pointset_id: str):
+    """Lance la triangulation d'un PointSet en arrière-plan, pour les longs calculs.
+
+    Au plus JOBS_CONCURRENCY jobs s'exécutent en même temps, ce qui laisse la place
+    aux requêtes directes, et au plus JOBS_MAX_PENDING attendent leur tour. À partir
+    de PARALLEL_THRESHOLD points, la triangulation se fait par bandes dans des
+    processus : la progression avance alors bande par bande, et une annulation prend
+    effet à la fin de la bande en cours.
+
+    parametres:
+        pointset_id: UUID de l'ensemble de points.
+        method (query string, optionnel): algorithme de triangulation.
+
+    Retourne:
+        202 avec l'état du job en JSON et son URL de suivi dans l'en-tête Location, ou
+        une erreur JSON (429 TOO_MANY_JOBS si la file est pleine).
+    """
+    if not pointset_id or len(pointset_id) != 36:
         return jsonify({
-            'code': 'SERIALIZATION_FAILED',
-            'message': f'Failed to serialize result: {str(e)}'
-        }), 500
+            'code': 'INVALID_ID',
+            'message': 'Invalid PointSetID format'
+        }), 400
+
+    method = request.args.get('method', INCREMENTAL)
+    if method not in METHODS:
+        return jsonify({
+            'code': 'INVALID_METHOD',
+            'message': f'Unknown triangulation method: {method}'
+        }), 400
+
+    try:
+        job = triangulation_jobs.submit(Job(pointset_id, method), _run_job)
+    except JobQueueFull:
+        return jsonify({
+            'code': 'TOO_MANY_JOBS',
+            'message': 'Too many triangulation jobs queued, retry later'
+        }), 429
+
+    return jsonify(job.to_dict()), 202, {'Location': f'/jobs/{job.id}'}
+
+
+def _unknown_job(job_id: str):
+    """Retourne l'erreur JSON d'un job inconnu ou oublié."""
+    return jsonify({
+        'code': 'JOB_NOT_FOUND',
+        'message': f'Job {job_id} not found'
+    }), 404
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """Suivi d'un job de triangulation.
+
+    parametres:
+        job_id: identifiant retourné par POST /triangulation/<pointset_id>/jobs.
+
+    Retourne:
+        La représentation binaire des triangles si le job est terminé, l'erreur JSON
+        du calcul s'il a échoué, et sinon son état en JSON avec la progression (points
+        insérés / total). Le résultat d'un job terminé est lu dans le cache, ou chez le
+        job s'il dépasse le budget du cache, jusqu'à sa première lecture. Un résultat
+        qui n'est plus disponible donne 410 RESULT_EXPIRED : il n'est pas recalculé
+        pendant la requête.
+    """
+    job = triangulation_jobs.get(job_id)
+    if job is None:
+        return _unknown_job(job_id)
+    if job.state == DONE:
+        if isinstance(job.result, bytes):
+            binary_data, job.result = job.result, None
+        elif job.result is not None:
+            binary_data = triangulation_cache.get(job.result, count=False)
+        else:
+            binary_data = None
+        if binary_data is None:
+            return jsonify({
+                'code': 'RESULT_EXPIRED',
+                'message': f'Result of job {job_id} is no longer available'
+            }), 410
+        response = Response(
+            _binary_body(binary_data), mimetype='application/octet-stream'
+        )
+        response.content_length = len(binary_data)
+        return response
+    if job.state == FAILED:
+        if isinstance(job.error, ApiError):
+            return job.error.to_response()
+        return internal_error(job.error)
+    return jsonify(job.to_dict())
+
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def delete_job(job_id: str):
+    """Annule un job : un job en attente ne démarre pas.
+
+    Un job en cours s'arrête au prochain suivi de progression.
+    Sans effet sur un job terminé.
+
+    Retourne:
+        L'état du job en JSON.
+    """
+    job = triangulation_jobs.cancel(job_id)
+    if job is None:
+        return _unknown_job(job_id)
+    return jsonify(job.to_dict())
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Retourne les compteurs du service en JSON."""
+    return jsonify({
+        'cache': triangulation_cache.stats(),
+        'single_flight': triangulation_flights.stats(),
+        'jobs': triangulation_jobs.stats(),
+        'locators': triangulation_locators.stats(),
+    })
 
 
 @app.errorhandler(404)
@@ -0,0 +1,425 @@
+"""Service de triangulation en ASGI, avec un serveur HTTP/1.1 asyncio minimal."""
+import asyncio
+import json
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, unquote
+
+import requests
+from werkzeug.http import parse_etags
+
+from triangulator.algorithm import INCREMENTAL, METHODS
+from triangulator.app import (
+    CACHE_MAX_BYTES,
+    POINTSET_MANAGER_CONNECT_TIMEOUT,
+    POINTSET_MANAGER_POOL_SIZE,
+    POINTSET_MANAGER_READ_TIMEOUT,
+    POINTSET_MANAGER_URL,
+    TRIANGULATION_WORKERS,
+    ApiError,
+    pointset_error,
+    result_etag,
+    triangulate_payload,
+)
+from triangulator.async_client import AsyncPointSetManagerClient
+from triangulator.cache import TriangulationCache, payload_digest
+
+Scope = dict
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+
+class TriangulatorASGI:
+    """Variante asyncio du service : application ASGI avec le même contrat que app.py.
+
+    Routes : GET /triangulation/{pointSetId} (paramètre method optionnel) et GET
+    /metrics, avec les mêmes codes d'erreur JSON et les mêmes ETags. Le PointSet est lu
+    avec AsyncPointSetManagerClient, la triangulation est faite dans un pool de
+    processus pour ne pas bloquer la boucle d'événements. Les résultats sont gardés dans
+    un TriangulationCache par contenu, et les requêtes simultanées pour un même
+    identifiant partagent un seul calcul.
+    """
+
+    def __init__(
+        self,
+        pointset_client: AsyncPointSetManagerClient,
+        workers: int = TRIANGULATION_WORKERS,
+        cache: TriangulationCache | None = None,
+    ):
+        """Initialise l'application.
+
+        parametres:
+            pointset_client: Client asyncio du PointSetManager.
+            workers: Nombre de processus de triangulation.
+            cache: Cache des résultats sérialisés ; par défaut un cache
+                en mémoire de CACHE_MAX_BYTES.
+        """
+        self.pointset_client = pointset_client
+        self.workers = workers
+        self.cache = cache if cache is not None else TriangulationCache(CACHE_MAX_BYTES)
+        self.executor: ProcessPoolExecutor | None = None
+        self.calls = 0
+        self.shared = 0
+        self._flights: dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Point d'entrée ASGI 3."""
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            commencee = False
+
+            async def envoyer(message: dict) -> None:
+                nonlocal commencee
+                commencee = commencee or message['type'] == 'http.response.start'
+                await send(message)
+
+            try:
+                await self._http(scope, envoyer)
+            except Exception:
+                # une réponse déjà commencée ne peut plus devenir une 500 :
+                # le serveur coupe la connexion
+                if commencee:
+                    raise
+                await _json(
+                    send,
+                    500,
+                    {'code': 'INTERNAL_ERROR', 'message': 'Internal server error'},
+                )
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        """Démarre le pool de processus au lancement, et libère tout à l'arrêt."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._executor()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """Retourne le pool de processus, créé au premier appel."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    async def close(self) -> None:
+        """Arrête le pool de processus et ferme les connexions au PointSetManager."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        await self.pointset_client.close()
+
+    async def _http(self, scope: Scope, send: Send) -> None:
+        """Aiguille une requête HTTP vers sa route."""
+        path = scope['path']
+        if path == '/metrics':
+            if scope['method'] != 'GET':
+                await _json(
+                    send,
+                    405,
+                    {'code': 'METHOD_NOT_ALLOWED', 'message': 'Method not allowed'},
+                )
+                return
+            await _json(
+                send, 200, {'cache': self.cache.stats(), 'single_flight': self.stats()}
+            )
+            return
+
+        prefixe = '/triangulation/'
+        pointset_id = path[len(prefixe):]
+        if not path.startswith(prefixe) or not pointset_id or '/' in pointset_id:
+            await _json(
+                send, 404, {'code': 'NOT_FOUND', 'message': 'Endpoint not found'}
+            )
+            return
+        if scope['method'] != 'GET':
+            await _json(
+                send,
+                405,
+                {'code': 'METHOD_NOT_ALLOWED', 'message': 'Method not allowed'},
+            )
+            return
+
+        method = parse_qs(scope.get('query_string', b'').decode('latin-1')).get(
+            'method', [INCREMENTAL]
+        )[-1]
+        if_none_match = parse_etags(
+            dict(scope.get('headers', [])).get(b'if-none-match', b'').decode('latin-1')
+        )
+        etag = self.etag(pointset_id, method)
+        if etag is not None and if_none_match.contains_weak(etag):
+            await _not_modified(send, [(b'etag', f'"{etag}"'.encode())])
+            return
+        try:
+            binary_data, etat = await self.get_triangulation(pointset_id, method)
+        except ApiError as e:
+            await _json(send, e.status, {'code': e.code, 'message': e.message})
+            return
+        headers = [(b'x-cache', etat.encode())]
+        etag = self.etag(pointset_id, method)
+        if etag is not None:
+            headers.append((b'etag', f'"{etag}"'.encode()))
+            if if_none_match.contains_weak(etag):
+                await _not_modified(send, headers)
+                return
+        await _respond(send, 200, binary_data, 'application/octet-stream', headers)
+
+    def etag(self, pointset_id: str, method: str) -> str | None:
+        """Retourne l'ETag du résultat si l'empreinte est en cache, sinon None."""
+        empreinte = self.cache.get(f'pointset:{pointset_id}', count=False)
+        if empreinte is None or method not in METHODS:
+            return None
+        return result_etag(empreinte.decode(), method)
+
+    async def get_triangulation(
+        self, pointset_id: str, method: str
+    ) -> tuple[bytes, str]:
+        """Calcule la triangulation sérialisée d'un PointSet, ou la retrouve en cache.
+
+        Retourne:
+            Le résultat sérialisé et l'état du cache ('HIT' ou 'MISS').
+
+        Raises:
+            ApiError: Avec les mêmes codes que get_triangulation de app.py.
+
+        """
+        # Valider le format de l'UUID
+        if not pointset_id or len(pointset_id) != 36:
+            raise ApiError('INVALID_ID', 'Invalid PointSetID format', 400)
+        if method not in METHODS:
+            raise ApiError(
+                'INVALID_METHOD', f'Unknown triangulation method: {method}', 400
+            )
+
+        empreinte = self.cache.get(f'pointset:{pointset_id}', count=False)
+        deja_compte = empreinte is not None
+        if deja_compte:
+            binary_data = self.cache.get(f'{method}:{empreinte.decode()}')
+            if binary_data is not None:
+                return binary_data, 'HIT'
+
+        # Les requêtes simultanées pour un même identifiant attendent le même calcul
+        cle_vol = f'{method}:{pointset_id}'
+        self.calls += 1
+        vol = self._flights.get(cle_vol)
+        if vol is not None:
+            self.shared += 1
+            return await asyncio.shield(vol)
+
+        vol = self._flights[cle_vol] = asyncio.get_running_loop().create_future()
+        try:
+            resultat = await self._compute(pointset_id, method, deja_compte)
+            vol.set_result(resultat)
+            return resultat
+        except BaseException as e:
+            vol.set_exception(e)
+            # l'exception est relevée ici : ne pas la signaler comme jamais récupérée
+            vol.exception()
+            raise
+        finally:
+            del self._flights[cle_vol]
+
+    async def _compute(
+        self, pointset_id: str, method: str, deja_compte: bool
+    ) -> tuple[bytes, str]:
+        """Calcul partagé de get_triangulation : lecture, puis triangulation en pool."""
+        try:
+            payload = await self.pointset_client.get_pointset_payload(pointset_id)
+        except requests.HTTPError as e:
+            raise pointset_error(pointset_id, e) from e
+
+        empreinte = payload_digest(payload)
+        self.cache.put(f'pointset:{pointset_id}', empreinte.encode())
+        cle = f'{method}:{empreinte}'
+        binary_data = self.cache.get(cle, count=not deja_compte)
+        if binary_data is not None:
+            return binary_data, 'HIT'
+
+        loop = asyncio.get_running_loop()
+        binary_data = await loop.run_in_executor(
+            self._executor(), triangulate_payload, payload, method
+        )
+        self.cache.put(cle, binary_data)
+        return binary_data, 'MISS'
+
+    def stats(self) -> dict[str, int]:
+        """Retourne les compteurs du regroupement des requêtes simultanées."""
+        return {
+            'calls': self.calls,
+            'shared': self.shared,
+            'in_flight': len(self._flights),
+        }
+
+
+async def _respond(send: Send, status: int, body: bytes, content_type: str,
+                   headers: Iterable[tuple[bytes, bytes]] = ()) -> None:
+    """Envoie une réponse complète avec sa taille dans Content-Length."""
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', content_type.encode()),
+            (b'content-length', str(len(body)).encode()),
+            *headers,
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _not_modified(send: Send, headers: Iterable[tuple[bytes, bytes]]) -> None:
+    """Envoie une réponse 304 Not Modified, sans corps ni Content-Length."""
+    await send({'type': 'http.response.start', 'status': 304, 'headers': list(headers)})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _json(send: Send, status: int, contenu: dict) -> None:
+    """Envoie une réponse JSON."""
+    await _respond(send, status, json.dumps(contenu).encode(), 'application/json')
+
+
+async def serve(asgi_app: Callable, host: str = '127.0.0.1', port: int = 5001,
+                started: Callable[[int], None] | None = None) -> None:
+    """Serveur HTTP/1.1 minimal pour lancer une application ASGI sans dépendance.
+
+    Il gère les connexions persistantes et le protocole lifespan ; en production on
+    préférera un serveur ASGI complet (uvicorn triangulator.asgi:app).
+
+    parametres:
+        asgi_app: Application ASGI 3.
+        host, port: Adresse d'écoute ; le port 0 en choisit un libre.
+        started: Fonction appelée avec le port d'écoute une fois le serveur prêt.
+    """
+    lifespan = asyncio.Queue()
+    reponses_lifespan = asyncio.Queue()
+    tache_lifespan = asyncio.ensure_future(
+        asgi_app(
+            {'type': 'lifespan', 'asgi': {'version': '3.0'}},
+            lifespan.get,
+            reponses_lifespan.put,
+        )
+    )
+    await lifespan.put({'type': 'lifespan.startup'})
+    await reponses_lifespan.get()
+
+    async def connexion(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while await _serve_request(asgi_app, reader, writer):
+                pass
+        except Exception:
+            # client parti, ou application en erreur après le début de sa réponse
+            pass
+        finally:
+            writer.close()
+
+    serveur = await asyncio.start_server(connexion, host, port)
+    if started is not None:
+        started(serveur.sockets[0].getsockname()[1])
+    try:
+        async with serveur:
+            await serveur.serve_forever()
+    finally:
+        await lifespan.put({'type': 'lifespan.shutdown'})
+        await tache_lifespan
+
+
+async def _serve_request(
+    asgi_app: Callable, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> bool:
+    """Lit une requête, la passe à l'application et écrit la réponse.
+
+    Retourne False pour fermer la connexion.
+    """
+    ligne = await reader.readline()
+    if not ligne.strip():
+        return False
+    morceaux = ligne.decode('latin-1').split()
+    if len(morceaux) != 3 or not morceaux[2].startswith('HTTP/'):
+        return await _bad_request(writer)
+    methode, cible, version = morceaux
+    headers = []
+    while True:
+        ligne = await reader.readline()
+        if ligne in (b'\r\n', b'\n', b''):
+            break
+        nom, _, valeur = ligne.partition(b':')
+        headers.append((nom.strip().lower(), valeur.strip()))
+    entetes = dict(headers)
+    try:
+        taille = int(entetes.get(b'content-length', 0))
+    except ValueError:
+        return await _bad_request(writer)
+    if taille < 0:
+        return await _bad_request(writer)
+    body = await reader.readexactly(taille)
+    garder = (
+        version == 'HTTP/1.1' and entetes.get(b'connection', b'').lower() != b'close'
+    )
+
+    cible, _, query = cible.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': version.split('/')[1],
+        'method': methode,
+        'scheme': 'http',
+        'path': unquote(cible),
+        'raw_path': cible.encode('latin-1'),
+        'query_string': query.encode('latin-1'),
+        'root_path': '',
+        'headers': headers,
+        'server': writer.get_extra_info('sockname'),
+        'client': writer.get_extra_info('peername'),
+    }
+
+    async def receive() -> dict:
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message: dict) -> None:
+        nonlocal garder
+        if message['type'] == 'http.response.start':
+            noms = {nom.lower() for nom, _ in message['headers']}
+            garder = garder and (
+                b'content-length' in noms or message['status'] in (204, 304)
+            )
+            lignes = [f"HTTP/1.1 {message['status']} \r\n".encode()]
+            lignes += [
+                nom + b': ' + valeur + b'\r\n' for nom, valeur in message['headers']
+            ]
+            if not garder:
+                lignes.append(b'connection: close\r\n')
+            writer.write(b''.join(lignes) + b'\r\n')
+        elif message['type'] == 'http.response.body':
+            writer.write(message.get('body', b''))
+            await writer.drain()
+
+    await asgi_app(scope, receive, send)
+    return garder
+
+
+async def _bad_request(writer: asyncio.StreamWriter) -> bool:
+    """Répond 400 à une requête illisible.
+
+    Retourne False, la connexion ne pouvant plus être lue.
+    """
+    writer.write(
+        b'HTTP/1.1 400 Bad Request\r\ncontent-length: 0\r\nconnection: close\r\n\r\n'
+    )
+    await writer.drain()
+    return False
+
+
+app = TriangulatorASGI(AsyncPointSetManagerClient(
+    POINTSET_MANAGER_URL,
+    connect_timeout=POINTSET_MANAGER_CONNECT_TIMEOUT,
+    read_timeout=POINTSET_MANAGER_READ_TIMEOUT,
+    pool_size=POINTSET_MANAGER_POOL_SIZE,
+))
+
+
+if __name__ == '__main__':
+    asyncio.run(serve(app, host='0.0.0.0', port=5001))
@@ -0,0 +1,204 @@
+"""Client asyncio du PointSetManager, pour le service ASGI."""
+import asyncio
+from urllib.parse import quote, urlsplit
+
+import requests
+
+from triangulator.models import PointSet
+from triangulator.serialization import deserialize_pointset
+
+
+def _http_error(message: str, status_code: int = None) -> requests.HTTPError:
+    """Construit la même erreur que PointSetManagerClient.
+
+    Le statut est placé dans e.response s'il est connu.
+    """
+    response = None
+    if status_code is not None:
+        response = requests.Response()
+        response.status_code = status_code
+    return requests.HTTPError(message, response=response)
+
+
+class AsyncPointSetManagerClient:
+    """Client asyncio pour l'API PointSetManager.
+
+    Les requêtes HTTP/1.1 sont écrites directement sur des connexions asyncio, gardées
+    ouvertes et réutilisées (au plus pool_size connexions inactives). Une connexion du
+    pool que le serveur a fermée entre deux requêtes est remplacée et la requête
+    renvoyée, comme avec les tentatives de PointSetManagerClient. Les erreurs sont les
+    mêmes que celles de PointSetManagerClient : requests.HTTPError, avec le statut dans
+    e.response quand il y en a un.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 5.0,
+        pool_size: int = 10,
+    ):
+        """Initialise le client.
+
+        parametres:
+            base_url: URL de base du service PointSetManager (http uniquement).
+            connect_timeout: Délai maximal d'établissement d'une connexion, en secondes.
+            read_timeout: Délai maximal d'attente de la réponse, en secondes.
+            pool_size: Nombre maximal de connexions inactives gardées ouvertes.
+        """
+        url = urlsplit(base_url.rstrip('/'))
+        if url.scheme != 'http':
+            raise ValueError(f"unsupported scheme: {url.scheme}")
+        self.base_url = base_url.rstrip('/')
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.path = url.path
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_size = pool_size
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        """Retourne une connexion inactive du pool, ou en ouvre une nouvelle.
+
+        Le dernier élément indique si la connexion vient du pool.
+        """
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.connect_timeout
+        )
+        return reader, writer, False
+
+    def _release(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Rend une connexion au pool, ou la ferme si le pool est plein."""
+        if len(self._idle) < self.pool_size:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def _get(self, path: str) -> tuple[int, bytes]:
+        """Envoie une requête GET et retourne le statut et le corps de la réponse.
+
+        Une connexion du pool coupée par le serveur (keep-alive expiré) échoue sans
+        réponse : la requête, idempotente, est alors renvoyée sur une autre connexion.
+        """
+        while True:
+            reader, writer, reutilisee = await self._connect()
+            try:
+                writer.write(
+                    f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                    f"Accept: application/octet-stream\r\n\r\n".encode('latin-1')
+                )
+                await writer.drain()
+                status, headers, body = await asyncio.wait_for(
+                    self._read_response(reader), self.read_timeout
+                )
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reutilisee:
+                    raise
+            except BaseException:
+                writer.close()
+                raise
+        if headers.get('connection', '').lower() == 'close':
+            writer.close()
+        else:
+            self._release(reader, writer)
+        return status, body
+
+    @staticmethod
+    async def _read_response(
+        reader: asyncio.StreamReader,
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Lit une réponse HTTP/1.1 : statut, en-têtes puis corps.
+
+        Le corps est délimité par Content-Length ou envoyé en chunked.
+        """
+        ligne = await reader.readline()
+        if not ligne:
+            raise ConnectionError("connection closed by PointSetManager")
+        status = int(ligne.split(None, 2)[1])
+
+        headers = {}
+        while True:
+            ligne = await reader.readline()
+            if ligne in (b'\r\n', b'\n', b''):
+                break
+            nom, _, valeur = ligne.decode('latin-1').partition(':')
+            headers[nom.strip().lower()] = valeur.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            morceaux = []
+            while True:
+                taille = int((await reader.readline()).split(b';')[0], 16)
+                if taille == 0:
+                    await reader.readline()
+                    break
+                morceaux.append(await reader.readexactly(taille))
+                await reader.readline()
+            return status, headers, b''.join(morceaux)
+        if 'content-length' in headers:
+            return (
+                status,
+                headers,
+                await reader.readexactly(int(headers['content-length'])),
+            )
+        headers['connection'] = 'close'
+        return status, headers, await reader.read()
+
+    async def get_pointset_payload(self, pointset_id: str) -> bytes:
+        """Récupère la représentation binaire brute d'un PointSet, sans la décoder.
+
+        parametres:
+            pointset_id: UUID de l'ensemble de points.
+
+        Retourne:
+            Les octets reçus du PointSetManager, au format de serialize_pointset.
+
+        Raises:
+            requests.HTTPError: Si la requête échoue (timeout, erreur
+                de connexion, statut d'erreur).
+
+        """
+        # l'identifiant vient du client : encodé, il ne peut ni couper ni
+        # ajouter de ligne à la requête
+        try:
+            status, body = await self._get(
+                f"{self.path}/pointset/{quote(pointset_id, safe='')}"
+            )
+        except asyncio.TimeoutError:
+            raise _http_error("PointSetManager timeout") from None
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            raise _http_error("PointSetManager unreachable") from None
+
+        if status == 200:
+            return body
+        if status >= 400:
+            raise _http_error(
+                f"{status} Error for url: {self.base_url}/pointset/{pointset_id}",
+                status,
+            )
+        raise _http_error(f"Unexpected status: {status}")
+
+    async def get_pointset(self, pointset_id: str) -> PointSet:
+        """Récupère un ensemble de points (PointSet) via son identifiant.
+
+        Raises:
+            requests.HTTPError: Si la requête échoue.
+            ValueError: Si le format de la réponse est invalide.
+
+        """
+        return deserialize_pointset(await self.get_pointset_payload(pointset_id))
+
+    async def close(self) -> None:
+        """Ferme les connexions gardées ouvertes."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
@@ -0,0 +1,326 @@
+"""Caches du service : résultats en mémoire et sur disque, calculs partagés."""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import TypeVar
+
+from triangulator.serialization import map_file, write_file
+
+T = TypeVar('T')
+
+# Au-delà de cette taille, une entrée du niveau disque est
+# projetée en mémoire plutôt que lue
+MMAP_MIN_BYTES = 1024 * 1024
+
+
+def payload_digest(payload: bytes) -> str:
+    """Retourne l'empreinte du contenu d'un PointSet sérialisé.
+
+    Elle permet de retrouver un résultat par contenu.
+
+    blake2b sur 128 bits : rapide, disponible dans hashlib
+    et sans collision en pratique.
+    """
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class DiskTier:
+    """Niveau disque du cache : un fichier par clé dans un répertoire.
+
+    Le répertoire est conservé entre les redémarrages. Les entrées d'au moins
+    MMAP_MIN_BYTES sont retournées comme une vue sur le fichier projeté en mémoire (voir
+    serialization.map_file) : un résultat plus grand que la RAM peut être servi.
+    N'importe quel objet ayant les méthodes get, put et clear peut le remplacer.
+    """
+
+    def __init__(self, directory: str):
+        """Initialise le niveau disque.
+
+        parametres:
+            directory: Répertoire des fichiers du cache, créé s'il n'existe pas.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Retourne le chemin du fichier d'une clé, hachée pour donner un nom sûr."""
+        return os.path.join(
+            self.directory, hashlib.sha256(key.encode()).hexdigest() + '.bin'
+        )
+
+    def get(self, key: str) -> bytes | memoryview | None:
+        """Retourne les octets enregistrés pour key, ou None.
+
+        Une grande entrée est retournée en vue projetée.
+        """
+        try:
+            with open(self._path(key), 'rb') as fichier:
+                if os.fstat(fichier.fileno()).st_size < MMAP_MIN_BYTES:
+                    return fichier.read()
+            return map_file(self._path(key))
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """Enregistre data pour key, de façon atomique (fichier temporaire renommé)."""
+        self.put_chunks(key, (data,))
+
+    def put_chunks(self, key: str, chunks: Iterable[bytes]) -> int:
+        """Enregistre pour key la concaténation de chunks.
+
+        Les morceaux sont écrits au fur et à mesure, sans être assemblés.
+
+        Retourne:
+            Le nombre d'octets écrits.
+        """
+        return write_file(self._path(key), chunks)
+
+    def clear(self) -> None:
+        """Supprime tous les fichiers du cache."""
+        for nom in os.listdir(self.directory):
+            if nom.endswith('.bin'):
+                os.unlink(os.path.join(self.directory, nom))
+
+
+class TriangulationCache:
+    """Cache en mémoire des triangulations sérialisées, avec éviction LRU.
+
+    La mémoire est bornée par un budget en octets. Un niveau disque optionnel (DiskTier
+    ou équivalent) reçoit chaque entrée ajoutée et sert les entrées absentes de la
+    mémoire, qui y sont alors remontées. Le cache est partagé entre les threads du
+    serveur, ses opérations sont protégées par un verrou.
+    """
+
+    def __init__(self, max_bytes: int, disk: DiskTier | None = None):
+        """Initialise le cache.
+
+        parametres:
+            max_bytes: Budget mémoire en octets ; une entrée plus
+                grande n'est gardée que sur disque.
+            disk: Niveau disque optionnel.
+        """
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'entrées en mémoire."""
+        return len(self._entries)
+
+    def get(self, key: str, count: bool = True) -> bytes | None:
+        """Retourne les octets associés à key, ou None.
+
+        None est retourné si la clé n'est ni en mémoire ni sur disque. Une entrée
+        trouvée devient la plus récemment utilisée.
+
+        parametres:
+            key: Clé de l'entrée.
+            count: False pour une recherche interne qui ne compte
+                ni comme succès ni comme échec.
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += count
+                return data
+
+        data = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if data is None:
+                self.misses += count
+                return None
+            self.hits += count
+            self._store(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Ajoute ou remplace l'entrée key, en évinçant les plus anciennes si besoin."""
+        with self._lock:
+            self._store(key, data)
+        if self.disk is not None:
+            self.disk.put(key, data)
+
+    def _store(self, key: str, data: bytes) -> None:
+        """Range data en mémoire puis rétablit le budget ; le verrou doit être tenu."""
+        ancien = self._entries.pop(key, None)
+        if ancien is not None:
+            self.size -= len(ancien)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evincee = self._entries.popitem(last=False)
+            self.size -= len(evincee)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Vide le cache (mémoire et disque) et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = self.evictions = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Retourne les compteurs du cache."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+            }
+
+
+class ObjectCache:
+    """Cache LRU d'objets construits en mémoire, borné en nombre d'entrées.
+
+    Les entrées sont des objets (index de requêtes...) et non des octets, comme dans
+    TriangulationCache : elles ne sont ni mesurées ni écrites sur disque. Le cache est
+    partagé entre les threads du serveur.
+    """
+
+    def __init__(self, max_entries: int):
+        """Initialise le cache.
+
+        parametres:
+            max_entries: Nombre maximal d'entrées gardées.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'entrées."""
+        return len(self._entries)
+
+    def get(self, key: str) -> object | None:
+        """Retourne l'objet associé à key, devenu le plus récemment utilisé, ou None."""
+        with self._lock:
+            objet = self._entries.get(key)
+            if objet is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return objet
+
+    def put(self, key: str, objet: object) -> None:
+        """Ajoute ou remplace l'entrée key, en évinçant les plus anciennes si besoin."""
+        with self._lock:
+            self._entries[key] = objet
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Retourne les compteurs du cache."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+
+class _Flight:
+    """Calcul en cours partagé par SingleFlight.
+
+    Il porte le résultat ou l'erreur du calcul, et l'événement de fin.
+    """
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Regroupe les appels concurrents pour une même clé.
+
+    Un seul calcul est lancé, les autres appelants attendent sa fin et reçoivent le même
+    résultat, ou la même exception.
+    """
+
+    def __init__(self):
+        """Initialise le regroupement, sans calcul en cours."""
+        self.calls = 0
+        self.shared = 0
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Exécute fn pour key, ou attend le calcul déjà en cours pour key.
+
+        parametres:
+            key: Clé du calcul.
+            fn: Fonction sans argument qui fait le calcul.
+
+        Retourne:
+            Le résultat de fn ; l'exception levée par fn est
+            relevée chez tous les appelants.
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            meneur = flight is None
+            if meneur:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.shared += 1
+
+        if not meneur:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def clear(self) -> None:
+        """Remet les compteurs à zéro."""
+        with self._lock:
+            self.calls = self.shared = 0
+
+    def stats(self) -> dict[str, int]:
+        """Retourne les compteurs : appels, calculs partagés et calculs en cours."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'shared': self.shared,
+                'in_flight': len(self._flights),
+            }
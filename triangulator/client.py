@@ -1,37 +1,98 @@
+
 import requests
-from typing import List
-from triangulator.models import Point
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from triangulator.models import PointSet
 from triangulator.serialization import deserialize_pointset
 
 
 class PointSetManagerClient:
-    """Client pour l'API PointSetManager."""
-    
-    def __init__(self, base_url: str):
+    """Client pour l'API PointSetManager.
+
+    Les connexions sont gardées ouvertes et réutilisées d'une requête à l'autre par une
+    session requests ; les erreurs transitoires (connexion refusée, délai dépassé,
+    statuts 502, 503, 504) sont retentées avec un délai croissant.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 5.0,
+        pool_size: int = 10,
+        retries: int = 2,
+        backoff_factor: float = 0.1,
+    ):
         """IInitialise le client.
 
         parametres:
             base_url: URL de base du service PointSetManager.
+            connect_timeout: Délai maximal d'établissement d'une connexion, en secondes.
+            read_timeout: Délai maximal d'attente de la réponse, en secondes.
+            pool_size: Nombre de connexions gardées ouvertes, à régler sur
+                le nombre de threads du serveur.
+            retries: Nombre de nouvelles tentatives après une erreur transitoire.
+            backoff_factor: Base du délai entre deux tentatives
+                (backoff_factor * 2 ** (tentative - 1)).
         """
         self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({'GET'}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
-    def get_pointset(self, pointset_id: str) -> List[Point]:
-        """Récupère un ensemble de points (PointSet) via son identifiant.
+    def get_pointset_payload(self, pointset_id: str) -> bytes:
+        """Récupère la représentation binaire brute d'un PointSet, sans la décoder.
 
         parametres:
             pointset_id: UUID de l'ensemble de points.
 
         Retourne:
-            Une liste de points.
+            Les octets reçus du PointSetManager, au format de serialize_pointset.
+
+        Raises:
+            requests.HTTPError: Si la requête échoue
+                (timeout, erreur de connexion, etc.).
+
+        """
+        return self.get_pointset_payload_if_none_match(pointset_id)[0]
+
+    def get_pointset_payload_if_none_match(
+        self, pointset_id: str, etag: str | None = None
+    ) -> tuple[bytes | None, str | None]:
+        """Récupère le PointSet brut sauf s'il n'a pas changé depuis etag.
+
+        parametres:
+            pointset_id: UUID de l'ensemble de points.
+            etag: ETag d'une réponse précédente, tel que reçu (guillemets compris),
+                envoyé dans If-None-Match ; None pour une requête ordinaire.
+
+        Retourne:
+            Les octets reçus et l'ETag de la réponse (None si le PointSetManager n'en
+            donne pas) ; si le PointSetManager répond 304 Not Modified, None et l'ETag,
+            et la version déjà détenue par l'appelant reste valide.
 
         Raises:
             requests.HTTPError: Si la requête échoue (timeout, erreur de connexion, etc.).
-            ValueError: Si le format de la réponse est invalide.
         """
         url = f"{self.base_url}/pointset/{pointset_id}"
+        options = {'timeout': self.timeout}
+        if etag is not None:
+            options['headers'] = {'If-None-Match': etag}
         
         try:
-            response = requests.get(url, timeout=5)
+            response = self.session.get(url, **options)
             response.raise_for_status()
         except requests.Timeout:
             raise requests.HTTPError("PointSetManager timeout", response=None)
@@ -39,6 +100,25 @@ class PointSetManagerClient:
             raise requests.HTTPError("PointSetManager unreachable", response=None)
         
         if response.status_code == 200:
-            return deserialize_pointset(response.content)
+            return response.content, response.headers.get('ETag')
+        if response.status_code == 304 and etag is not None:
+            return None, response.headers.get('ETag', etag)
         
         raise requests.HTTPError(f"Unexpected status: {response.status_code}")
+
+    def get_pointset(self, pointset_id: str) -> PointSet:
+        """Récupère un ensemble de points (PointSet) via son identifiant.
+
+        parametres:
+            pointset_id: UUID de l'ensemble de points.
+
+        Retourne:
+            Un PointSet (coordonnées stockées dans un tableau compact).
+
+        Raises:
+            requests.HTTPError: Si la requête échoue
+                (timeout, erreur de connexion, etc.).
+            ValueError: Si le format de la réponse est invalide.
+
+        """
+        return deserialize_pointset(self.get_pointset_payload(pointset_id))
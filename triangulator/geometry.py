@@ -1,46 +1,57 @@
 import math
-from typing import Tuple,List
+from collections.abc import Sequence
+
 from triangulator.models import Point
+from triangulator.predicates import incircle, orient2d
+
 
+def sont_colineaires_xy(xs: Sequence[float], ys: Sequence[float]) -> bool:
+    """Version par tableaux de sont_colineaires.
 
+    Les coordonnées sont passées en deux tableaux.
 
-def sont_colineaires(points:List[Point]):
+    :param xs,ys: coordonnées x et y des points
     """
-    Cette fonction détermine si les points sont collinéaires et renvoie True dans ce cas
-    
+    if len(xs) < 3:
+        return True
+
+    x1, y1, x2, y2 = xs[0], ys[0], xs[1], ys[1]
+    return not any(
+        orient2d(x1, y1, x2, y2, xi, yi) for xi, yi in zip(xs[2:], ys[2:], strict=True)
+    )
+
+
+def sont_colineaires(points: list[Point]):
+    """Cette fonction détermine si les points sont collinéaires (renvoie True).
+
     :param points: prends en parametre une liste de Point
     """
-    if len(points) < 3:
-        return True  
+    return sont_colineaires_xy([p[0] for p in points], [p[1] for p in points])
 
-    x1, y1 = points[0]
-    x2, y2 = points[1]
 
-    for (xi, yi) in points[2:]:
-        det = (x2 - x1) * (yi - y1) - (y2 - y1) * (xi - x1)
-        if det != 0:
-            return False
-    return True
+def duplication_point_xy(xs: Sequence[float], ys: Sequence[float]) -> bool:
+    """Version par tableaux de duplication_point.
 
+    Les coordonnées sont passées en deux tableaux.
 
-def duplication_point(points:List[Point]):
+    :param xs,ys: coordonnées x et y des points
     """
-    Cette fonction permet de déterminer si des points sont dupliqués et retourne True dans ce cas.
-    
+    return len(set(zip(xs, ys, strict=True))) < len(xs)
+
+
+def duplication_point(points: list[Point]):
+    """Cette fonction détermine si des points sont dupliqués (retourne True).
+
     :param points: prends en parametre une liste de Point
     """
-    unique_points = set(points)
-    if len(unique_points) < len(points):
-        return True
-    else:
-        return False
-    
+    return duplication_point_xy([p[0] for p in points], [p[1] for p in points])
+
 
 def distance(p1: Point, p2: Point) -> float:
     """
     Cette fonction permet de calculer la distance entre 2 points.
-    
-    :param p1,p2: prend en paramétre 2 points 
+
+    :param p1,p2: prend en paramétre 2 points
     :rtype: retourne float (nombre réel)
     """
     dx = p2[0] - p1[0]
@@ -48,61 +59,58 @@ def distance(p1: Point, p2: Point) -> float:
     return math.sqrt(dx * dx + dy * dy)
 
 
-def circumcircle(p1: Point, p2: Point, p3: Point) -> Tuple[Point, float]:
+def _circumcentre(
+    x0: float, y0: float, x1: float, y1: float, x2: float, y2: float
+) -> tuple[float, float, float]:
+    """Centre et carré du rayon du cercle circonscrit, sans racine carrée.
+
+    Le calcul est fait relativement au premier sommet.
+
+    :return: abscisse et ordonnée du centre, carré du rayon ; (nan, nan, inf)
+        si les sommets sont colinéaires
+    """
+    bdx = x1 - x0
+    bdy = y1 - y0
+    cdx = x2 - x0
+    cdy = y2 - y0
+    d = 2 * (bdx * cdy - bdy * cdx)
+    if d == 0:
+        return math.nan, math.nan, math.inf
+    b2 = bdx * bdx + bdy * bdy
+    c2 = cdx * cdx + cdy * cdy
+    ox = (cdy * b2 - bdy * c2) / d
+    oy = (bdx * c2 - cdx * b2) / d
+    return x0 + ox, y0 + oy, ox * ox + oy * oy
+
+
+def circumcircle(p1: Point, p2: Point, p3: Point) -> tuple[Point, float]:
     """
     Calcule le cercle circonscrit d'un triangle (le cercle qui passe par les trois sommets du triangle).
-    
-    :param p1,p2,p3: prend en paramétre 3 points qui sont les sommets du triangles 
-    :return: retourne le centre et le rayon du cercle 
+
+    :param p1,p2,p3: prend en paramétre 3 points qui sont les sommets du triangles
+    :return: retourne le centre et le rayon du cercle
     """
-    ax, ay = p1
-    bx, by = p2
-    cx, cy = p3
-    
-    d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
-    
-    # if abs(d) < 1e-10:
-    # if abs(d) == 0:
-    #     raise ValueError("Points are collinear")
-    if sont_colineaires((p1,p2,p3)):
+    ux, uy, r2 = _circumcentre(p1[0], p1[1], p2[0], p2[1], p3[0], p3[1])
+    if math.isinf(r2):
         raise ValueError("Points are collinear")
 
-
-    ux = ((ax * ax + ay * ay) * (by - cy) + 
-          (bx * bx + by * by) * (cy - ay) + 
-          (cx * cx + cy * cy) * (ay - by)) / d
-    
-    uy = ((ax * ax + ay * ay) * (cx - bx) + 
-          (bx * bx + by * by) * (ax - cx) + 
-          (cx * cx + cy * cy) * (bx - ax)) / d
-    
-    centre = (ux, uy)
-    rayon = distance(centre, p1)
-    
-    return centre, rayon
+    return (ux, uy), math.sqrt(r2)
 
 
 def point_in_circumcircle(point: Point, p1: Point, p2: Point, p3: Point) -> bool:
     """
     Cette fonction permet de  déterminer si un point se trouve dans le cercle circonscrit d'un triangle.
-    
+
     :param point: Le point à tester pour savoir s'il se trouve dans le cercle ou non
     :param p1,p2,p3: Prend en paramétre 3 points qui sont les sommets du triangles
-    :return: retourne True si le point est dans le cercle et False si le point est a l'exterieur du cercle 
+    :return: retourne True si le point est dans le cercle et False si le
+        point est a l'exterieur du cercle
 
-    Remarque si les points sont collinéaire dans ce cas la fonction retourne False
+    Remarque si les points sont collinéaire dans ce cas la fonction retourne False.
+    Le test utilise les prédicats robustes : un point sur le cercle n'est pas dedans.
     """
-    try:
-        centre, rayon = circumcircle(p1, p2, p3)
-        print(centre, rayon)
-        return distance(point, centre) < rayon - 1e-10
-    except ValueError:
+    orientation = orient2d(p1[0], p1[1], p2[0], p2[1], p3[0], p3[1])
+    if orientation == 0:
         return False
-
-
-
-
-
-points=[(0.5,0.5), (2,0), (0,2), (-2,0)]
-print(point_in_circumcircle(points[0],points[1],points[2],points[3]))
-# print(circumcircle(points[1],points[2],points[3]))
\ No newline at end of file
+    dedans = incircle(p1[0], p1[1], p2[0], p2[1], p3[0], p3[1], point[0], point[1])
+    return dedans * orientation > 0
@@ -0,0 +1,203 @@
+"""Jobs de triangulation exécutés en arrière-plan par un pool de threads."""
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+# États d'un job
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Levée par Job.progress quand l'annulation du job a été demandée."""
+
+
+class JobQueueFull(Exception):
+    """Levée par JobManager.submit quand trop de jobs sont déjà en attente."""
+
+
+class Job:
+    """Triangulation exécutée en arrière-plan.
+
+    L'état, la progression (points insérés / total) et le résultat sont mis à jour par
+    le thread qui exécute le job et lus par les requêtes de suivi. Le résultat est celui
+    que retourne le calcul du job : pour une triangulation, la clé de ses octets dans le
+    cache plutôt que les octets eux-mêmes, sauf s'ils sont trop grands pour le cache.
+    """
+
+    def __init__(self, pointset_id: str, method: str):
+        """Initialise un job en attente.
+
+        parametres:
+            pointset_id: UUID de l'ensemble de points à trianguler.
+            method: algorithme de triangulation.
+        """
+        self.id = str(uuid.uuid4())
+        self.pointset_id = pointset_id
+        self.method = method
+        self.state = PENDING
+        self.inserted = 0
+        self.total = 0
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.future: Future | None = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self) -> bool:
+        """True si l'annulation a été demandée."""
+        return self._cancel.is_set()
+
+    def progress(self, inserted: int, total: int) -> None:
+        """Suivi de progression à passer à triangulate : met à jour l'avancement.
+
+        Raises:
+            JobCancelled: Si l'annulation a été demandée,
+                pour interrompre la triangulation.
+
+        """
+        self.inserted = inserted
+        self.total = total
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def to_dict(self) -> dict:
+        """Retourne l'état du job sous forme sérialisable en JSON."""
+        return {
+            'id': self.id,
+            'pointset_id': self.pointset_id,
+            'method': self.method,
+            'state': self.state,
+            'progress': {'inserted': self.inserted, 'total': self.total},
+            'cancel_requested': self.cancel_requested,
+        }
+
+
+class JobManager:
+    """Exécute les jobs dans un pool de threads borné.
+
+    Au plus max_workers jobs tournent en même temps, ce qui laisse du temps de calcul
+    aux requêtes directes, et au plus max_pending attendent leur tour. Les max_retained
+    derniers jobs terminés restent consultables.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, max_retained: int):
+        """Initialise le gestionnaire.
+
+        parametres:
+            max_workers: Nombre maximal de jobs exécutés simultanément.
+            max_pending: Nombre maximal de jobs en attente d'un thread.
+            max_retained: Nombre de jobs terminés gardés pour consultation.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_retained = max_retained
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='job'
+        )
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, job: Job, fn: Callable[[Job], Any]) -> Job:
+        """Met un job en file d'exécution.
+
+        parametres:
+            job: Job à exécuter.
+            fn: Calcul du job, qui retourne son résultat ; il doit appeler job.progress
+                régulièrement pour que l'annulation soit prise en compte. Les
+                max_retained jobs terminés gardent ce résultat : il doit rester petit,
+                ou être libéré une fois lu.
+
+        Raises:
+            JobQueueFull: Si max_pending jobs attendent déjà.
+
+        """
+        with self._lock:
+            actifs = sum(
+                1 for autre in self._jobs.values() if autre.state not in FINISHED
+            )
+            if actifs >= self.max_workers + self.max_pending:
+                raise JobQueueFull(f"{actifs} jobs already queued or running")
+            self._prune()
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        """Exécute fn et enregistre son résultat, son erreur ou son annulation."""
+        if job.cancel_requested:
+            job.state = CANCELLED
+            return
+        job.state = RUNNING
+        try:
+            result = fn(job)
+        except JobCancelled:
+            job.state = CANCELLED
+        except Exception as e:
+            job.error = e
+            job.state = FAILED
+        else:
+            if job.cancel_requested:
+                job.state = CANCELLED
+            else:
+                job.result = result
+                job.state = DONE
+
+    def _prune(self) -> None:
+        """Oublie les jobs terminés les plus anciens au-delà de max_retained.
+
+        Le verrou doit être tenu.
+        """
+        termines = [
+            job_id for job_id, job in self._jobs.items() if job.state in FINISHED
+        ]
+        for job_id in termines[:max(0, len(termines) - self.max_retained)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Job | None:
+        """Retourne le job job_id, ou None s'il est inconnu."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Demande l'annulation d'un job.
+
+        Un job en attente ne démarrera pas, un job en cours s'arrête au prochain appel
+        de job.progress. Sans effet sur un job terminé.
+
+        Retourne:
+            Le job, ou None s'il est inconnu.
+        """
+        job = self.get(job_id)
+        if job is None or job.state in FINISHED:
+            return job
+        job._cancel.set()
+        if job.future is not None and job.future.cancel():
+            job.state = CANCELLED
+        return job
+
+    def clear(self) -> None:
+        """Annule les jobs en cours et oublie tous les jobs."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            job._cancel.set()
+            if job.future is not None:
+                job.future.cancel()
+
+    def stats(self) -> dict[str, int]:
+        """Retourne le nombre de jobs connus dans chaque état."""
+        with self._lock:
+            etats = [job.state for job in self._jobs.values()]
+        return {
+            etat: etats.count(etat)
+            for etat in (PENDING, RUNNING, DONE, FAILED, CANCELLED)
+        }
@@ -1,29 +1,61 @@
-from typing import List, Tuple
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import Union
 
-Point = Tuple[float, float]
-Triangle = Tuple[int, int, int]
+Point = tuple[float, float]
+Triangle = tuple[int, int, int]
 
 
 class PointSet:
     """
     Représente une collection de points dans un espace 2D.
+
+    Les coordonnées sont stockées à plat dans un tableau compact (x0, y0,
+    x1, y1, ...) : 16 octets par point en double ('d'), 8 octets en float
+    ('f', le format binaire d'échange).
     """
 
-    def __init__(self, points: List[Point]):
+    __slots__ = ('coords',)
+
+    def __init__(self, points: Union[Sequence[Point], "PointSet"] = ()):
         """
         Initialise l'ensemble de points.
 
         parametres:
             points (List[Point]): Une liste de tuples représentant les coordonnées (x, y).
         """
-        self.points = points
-    
+        if isinstance(points, PointSet):
+            self.coords = points.coords
+        else:
+            self.coords = array('d', (c for point in points for c in point))
+
+    @classmethod
+    def from_coords(cls, coords: Sequence[float]) -> "PointSet":
+        """Crée un ensemble de points sans copie à partir de coordonnées déjà à plat.
+
+        parametres:
+            coords: tableau (array, memoryview...) des coordonnées x0, y0, x1, y1, ...
+        """
+        pointset = cls.__new__(cls)
+        pointset.coords = coords
+        return pointset
+
+    @property
+    def xs(self) -> list[float]:
+        """Retourne la liste des abscisses."""
+        return self.coords[0::2].tolist()
+
+    @property
+    def ys(self) -> list[float]:
+        """Retourne la liste des ordonnées."""
+        return self.coords[1::2].tolist()
+
     def __len__(self) -> int:
         """
         Retourne: Le nombre total de points.
         """
-        return len(self.points)
-    
+        return len(self.coords) // 2
+
     def __getitem__(self, index: int) -> Point:
         """
         Permet l'accès à un point par son index.
@@ -34,27 +66,74 @@ class PointSet:
         Retourne:
             Le tuple (x, y) correspondant à l'index.
         """
-        return self.points[index]
+        n = len(self.coords) // 2
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("point index out of range")
+        return (self.coords[2 * index], self.coords[2 * index + 1])
+
+    def __iter__(self) -> Iterator[Point]:
+        """Parcourt les points sous forme de tuples (x, y)."""
+        coords = self.coords
+        return zip(coords[0::2], coords[1::2], strict=True)
 
 
 class Triangles:
     """
     Représente un maillage composé de sommets et de triangles reliant ces sommets.
+
+    Les indices des triangles sont stockés à plat dans un
+    array('I') (12 octets par triangle).
     """
 
-    def __init__(self, vertices: List[Point], triangles: List[Triangle]):
-        """
-        Initialise la structure de triangles.
+    __slots__ = ('vertices', 'indices')
+
+    def __init__(
+        self,
+        vertices: Sequence[Point] | PointSet,
+        triangles: Sequence[Triangle] | array | memoryview,
+    ):
+        """Initialise la structure de triangles.
 
         parametres:
             vertices: La liste des sommets (points 2D).
-            triangles: La liste des triangles, où chaque triangle est défini par 3 indices pointant vers 'vertices'.
+            triangles: La liste des triangles, où chaque triangle est défini par 3
+                indices pointant vers 'vertices', ou directement le tableau à plat i0,
+                j0, k0, i1, ... des indices (array ou memoryview, gardé sans copie).
         """
-        self.vertices = vertices
-        self.triangles = triangles
-    
+        self.vertices = (
+            vertices if isinstance(vertices, PointSet) else PointSet(vertices)
+        )
+        if isinstance(triangles, (array, memoryview)):
+            self.indices = triangles
+        else:
+            self.indices = array('I', (i for triangle in triangles for i in triangle))
+
     def __len__(self) -> int:
         """
         Retourne le nombre de triangles définis.
         """
-        return len(self.triangles)
\ No newline at end of file
+        return len(self.indices) // 3
+
+    def __getitem__(self, index: int) -> Triangle:
+        """Permet l'accès à un triangle par son index.
+
+        parametres:
+            index: La position du triangle.
+
+        Retourne:
+            Le tuple (i, j, k) des indices de ses sommets.
+        """
+        n = len(self.indices) // 3
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("triangle index out of range")
+        b = 3 * index
+        return (self.indices[b], self.indices[b + 1], self.indices[b + 2])
+
+    def __iter__(self) -> Iterator[Triangle]:
+        """Parcourt les triangles sous forme de tuples (i, j, k)."""
+        indices = self.indices
+        return zip(indices[0::3], indices[1::3], indices[2::3], strict=True)
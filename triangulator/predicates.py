@@ -0,0 +1,164 @@
+"""Prédicats géométriques robustes : filtre en flottants, repli en rationnels."""
+from fractions import Fraction
+
+# Demi-epsilon machine des flottants double précision
+EPSILON = 2.0 ** -53
+
+# Bornes d'erreur du calcul flottant (Shewchuk, "Adaptive
+# Precision Floating-Point Arithmetic")
+CCW_ERRBOUND = (3.0 + 16.0 * EPSILON) * EPSILON
+ICC_ERRBOUND = (10.0 + 96.0 * EPSILON) * EPSILON
+
+
+def _signe(valeur) -> float:
+    """Retourne -1.0, 0.0 ou 1.0 selon le signe de valeur."""
+    return float((valeur > 0) - (valeur < 0))
+
+
+def orient2d_fast(
+    ax: float, ay: float, bx: float, by: float, cx: float, cy: float
+) -> float:
+    """Calcule le déterminant d'orientation de a, b, c en flottants, signe non garanti.
+
+    :return: un réel positif si a, b, c tournent dans le sens trigonométrique, négatif
+        dans le sens horaire, nul s'ils sont colinéaires
+    """
+    return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
+
+def _orient2d_exact(
+    ax: float, ay: float, bx: float, by: float, cx: float, cy: float
+) -> float:
+    """Calcule le signe exact du déterminant d'orientation en rationnels."""
+    ax, ay, bx, by, cx, cy = (Fraction(c) for c in (ax, ay, bx, by, cx, cy))
+    return _signe((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def orient2d(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> float:
+    """Test d'orientation robuste des points a, b, c.
+
+    Le déterminant est d'abord évalué en flottants ; si sa valeur absolue dépasse la
+    borne d'erreur d'arrondi, son signe est certain et il est retourné tel quel. Sinon
+    le signe est recalculé en arithmétique exacte.
+
+    :return: un réel dont le signe est exact : positif si a, b, c tournent dans le sens
+        trigonométrique, négatif dans le sens horaire, nul s'ils sont colinéaires
+    """
+    detleft = (ax - cx) * (by - cy)
+    detright = (ay - cy) * (bx - cx)
+    det = detleft - detright
+
+    if detleft > 0:
+        if detright <= 0:
+            return det
+        detsum = detleft + detright
+    elif detleft < 0:
+        if detright >= 0:
+            return det
+        detsum = -detleft - detright
+    else:
+        return det
+
+    errbound = CCW_ERRBOUND * detsum
+    if det >= errbound or -det >= errbound:
+        return det
+    return _orient2d_exact(ax, ay, bx, by, cx, cy)
+
+
+def incircle_fast(
+    ax: float,
+    ay: float,
+    bx: float,
+    by: float,
+    cx: float,
+    cy: float,
+    dx: float,
+    dy: float,
+) -> float:
+    """Calcule le déterminant du test du cercle en flottants, signe non garanti.
+
+    :return: un réel positif si d est dans le cercle circonscrit du triangle a, b, c
+        (orienté dans le sens trigonométrique)
+    """
+    adx = ax - dx
+    ady = ay - dy
+    bdx = bx - dx
+    bdy = by - dy
+    cdx = cx - dx
+    cdy = cy - dy
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+            + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+            + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def _incircle_exact(
+    ax: float,
+    ay: float,
+    bx: float,
+    by: float,
+    cx: float,
+    cy: float,
+    dx: float,
+    dy: float,
+) -> float:
+    """Calcule le signe exact du déterminant du cercle circonscrit en rationnels."""
+    dx, dy = Fraction(dx), Fraction(dy)
+    adx, ady = Fraction(ax) - dx, Fraction(ay) - dy
+    bdx, bdy = Fraction(bx) - dx, Fraction(by) - dy
+    cdx, cdy = Fraction(cx) - dx, Fraction(cy) - dy
+    return _signe((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+                  + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+                  + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def incircle(
+    ax: float,
+    ay: float,
+    bx: float,
+    by: float,
+    cx: float,
+    cy: float,
+    dx: float,
+    dy: float,
+) -> float:
+    """Test robuste du cercle circonscrit : indique si d est dans le cercle de a, b, c.
+
+    Même principe que orient2d : évaluation flottante filtrée par une borne d'erreur,
+    puis arithmétique exacte seulement quand le signe est incertain.
+
+    :return: un réel dont le signe est exact : positif si d est strictement dans le
+        cercle du triangle a, b, c orienté dans le sens trigonométrique, nul si les
+        quatre points sont cocirculaires
+    """
+    adx = ax - dx
+    bdx = bx - dx
+    cdx = cx - dx
+    ady = ay - dy
+    bdy = by - dy
+    cdy = cy - dy
+
+    bdxcdy = bdx * cdy
+    cdxbdy = cdx * bdy
+    alift = adx * adx + ady * ady
+
+    cdxady = cdx * ady
+    adxcdy = adx * cdy
+    blift = bdx * bdx + bdy * bdy
+
+    adxbdy = adx * bdy
+    bdxady = bdx * ady
+    clift = cdx * cdx + cdy * cdy
+
+    det = (
+        alift * (bdxcdy - cdxbdy)
+        + blift * (cdxady - adxcdy)
+        + clift * (adxbdy - bdxady)
+    )
+
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift
+                 + (abs(cdxady) + abs(adxcdy)) * blift
+                 + (abs(adxbdy) + abs(bdxady)) * clift)
+    errbound = ICC_ERRBOUND * permanent
+    if det > errbound or -det > errbound:
+        return det
+    return _incircle_exact(ax, ay, bx, by, cx, cy, dx, dy)
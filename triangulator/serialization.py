@@ -1,131 +1,1009 @@
+import math
+import mmap
+import os
 import struct
-from typing import List, Tuple
-from triangulator.models import Point, Triangle
+import sys
+import tempfile
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import accumulate, chain
+from typing import NamedTuple
+
+from triangulator.models import Point, PointSet, Triangle, Triangles
+
+# Le format binaire est little-endian : sur une machine
+# big-endian les tableaux sont retournés
+LITTLE_ENDIAN = sys.byteorder == 'little'
+
+# Plus grande valeur finie représentable en float 32 bits
+FLOAT32_MAX = 3.4028234663852886e38
+
+# Taille des morceaux produits par serialize_triangles_stream
+CHUNK_SIZE = 64 * 1024
+
+# Codage compressé des formats binaires, négocié par Accept-Encoding /
+# Content-Encoding : coordonnées par plans d'octets compressées avec zlib,
+# indices en écarts zigzag + varint
+DELTA_ENCODING = 'x-delta-varint'
+
+# Indice de sommet de Voronoi désignant l'infini dans les cellules non
+# bornées (voir VoronoiDiagram)
+VORONOI_INFINITY = 0xFFFFFFFF
+
+# Niveau de compression zlib : au-delà le gain est faible et
+# l'encodage beaucoup plus lent
+ZLIB_LEVEL = 6
+
+
+def _float32_coords(points: list[Point] | PointSet) -> array | bytes:
+    """Retourne les coordonnées à plat en float 32 bits little-endian.
+
+    Les coordonnées déjà dans ce format ne sont pas copiées.
+
+    La conversion depuis des doubles est faite en un seul appel à struct, qui vérifie au
+    passage que chaque valeur tient dans un float 32 bits.
+
+    Raises:
+        OverflowError: Si une coordonnée ne tient pas dans un float 32 bits.
 
-def serialize_pointset(points: List[Point]) -> bytes:
     """
-    Convertir les points en format binaires
-    
+    coords = (
+        points.coords
+        if isinstance(points, PointSet)
+        else array('d', (c for point in points for c in point))
+    )
+    if LITTLE_ENDIAN and (isinstance(coords, array) and coords.typecode == 'f'
+                          or isinstance(coords, memoryview) and coords.format == 'f'):
+        return coords
+    return struct.Struct(f'<{len(coords)}f').pack(*coords)
+
+
+def _uint32_indices(triangles: list[Triangle] | Triangles) -> array:
+    """Retourne les indices des triangles à plat en entiers non signés 32 bits."""
+    if isinstance(triangles, Triangles):
+        return triangles.indices
+    return array('I', (i for triangle in triangles for i in triangle))
+
+
+def _little_endian(tableau: array) -> array:
+    """Retourne le tableau dans l'ordre d'octets du format binaire."""
+    if LITTLE_ENDIAN:
+        return tableau
+    tableau = array(tableau.typecode, tableau)
+    tableau.byteswap()
+    return tableau
+
+
+def serialize_pointset(points: list[Point] | PointSet) -> bytes:
+    """Convertir les points en format binaires.
+
+    Les coordonnées sont copiées en une fois depuis le tableau du
+    PointSet, sans objet Python par point.
+
     paramétres:
-        points: liste de points
-    
+        points: liste de points ou PointSet
+
     Retourne:
         Une representation binaire des points
     """
-    num_points = len(points)
-    data = struct.pack('<I', num_points)
-    
-    for x, y in points:
-        data += struct.pack('<ff', x, y)
-    
-    return data
+    coords = _float32_coords(points)
+    return b''.join((struct.pack('<I', len(points)), memoryview(coords)))
 
 
-def deserialize_pointset(data: bytes) -> List[Point]:
+def deserialize_pointset(data: bytes) -> PointSet:
     """
     C'est l'opération inverse de serialize_pointset
-    
+
+    Sur une machine little-endian, le PointSet retourné
+    est une vue sur data, sans copie.
+
     parametres:
-        data: Données binaires représentant des pointss.
-    
+        data: Données binaires représentant des pointss
+            (bytes, bytearray ou memoryview).
+
     Retourne:
-        Une liste de points.
-    
+        Un PointSet dont les coordonnées sont gardées en
+        float, comme dans le format binaire.
+
     """
     if len(data) < 4:
         raise ValueError("Data too short to contain point count")
-    
-    num_points = struct.unpack('<I', data[:4])[0]
+
+    vue = memoryview(data)
+    num_points = struct.unpack_from('<I', vue, 0)[0]
     expected_length = 4 + num_points * 8
-    
-    if len(data) != expected_length:
+
+    if len(vue) != expected_length:
         raise ValueError(
-            f"Invalid data length: expected {expected_length}, got {len(data)}"
+            f"Invalid data length: expected {expected_length}, got {len(vue)}"
         )
-    
-    points = []
-    offset = 4
-    
-    for _ in range(num_points):
-        x, y = struct.unpack('<ff', data[offset:offset + 8])
-        points.append((x, y))
-        offset += 8
-    
-    return points
-
-
-def serialize_triangles(vertices: List[Point], triangles: List[Triangle]) -> bytes:
-    """
-    Convertit une triangulation (sommets + triangles) en format binaire
-    
+
+    if LITTLE_ENDIAN:
+        return PointSet.from_coords(vue[4:].cast('f'))
+    coords = array('f', vue[4:].tobytes())
+    coords.byteswap()
+    return PointSet.from_coords(coords)
+
+
+def serialize_triangles(
+    vertices: list[Point] | PointSet, triangles: list[Triangle] | Triangles
+) -> bytes:
+    """Convertit une triangulation (sommets + triangles) en format binaire.
+
     paramétres:
         vertices: Liste des sommets (points) de la triangulation
         triangles:  Liste des triangles et les indices référencent les sommets dans la liste
-    
+
     Retourne:
         Données binaires représentant la triangulation.
     """
     # Part 1: Vertices (PointSet format)
-    data = serialize_pointset(vertices)
-    
+    coords = _float32_coords(vertices)
+
     # Part 2: Triangles
-    num_triangles = len(triangles)
-    data += struct.pack('<I', num_triangles)
-    
-    for i, j, k in triangles:
-        data += struct.pack('<III', i, j, k)
-    
-    return data
+    indices = _little_endian(_uint32_indices(triangles))
 
+    return b''.join((
+        struct.pack('<I', len(vertices)), memoryview(coords),
+        struct.pack('<I', len(indices) // 3), memoryview(indices),
+    ))
+
+
+def deserialize_triangles(data: bytes) -> tuple[PointSet, Triangles]:
+    """Convertit des données binaires en une triangulation (sommets + triangles).
+
+    C'est l'opération inverse de serialize_triangles.
+
+    Sur une machine little-endian, les sommets et les indices retournés sont
+    des vues sur data, sans copie.
 
-def deserialize_triangles(data: bytes) -> Tuple[List[Point], List[Triangle]]:
-    """
-    Convertit des données binaires en une triangulation (sommets + triangles). C'est l'opération inverse de serialize_triangles.
-    
     paramétres:
         data: Données binaires représentant une triangulation.
-    
+
     Retourne:
-        Un tuple contenant la liste des sommets et la liste des triangles.
-    
+        Un tuple contenant les sommets (PointSet) et les triangles (Triangles).
+
     """
     if len(data) < 4:
         raise ValueError("Data too short")
-    
+
+    vue = memoryview(data)
+
     # Partie 1: lire points
-    num_vertices = struct.unpack('<I', data[:4])[0]
+    num_vertices = struct.unpack_from('<I', vue, 0)[0]
     vertices_end = 4 + num_vertices * 8
-    
-    if len(data) < vertices_end:
+
+    if len(vue) < vertices_end:
         raise ValueError("Data too short for vertices")
-    
-    vertices = deserialize_pointset(data[:vertices_end])
-    
+
+    vertices = deserialize_pointset(vue[:vertices_end])
+
     # Partie 2: lire triangles
-    if len(data) < vertices_end + 4:
+    if len(vue) < vertices_end + 4:
         raise ValueError("Data too short for triangle count")
-    
-    num_triangles = struct.unpack('<I', data[vertices_end:vertices_end + 4])[0]
+
+    num_triangles = struct.unpack_from('<I', vue, vertices_end)[0]
     expected_length = vertices_end + 4 + num_triangles * 12
-    
-    if len(data) != expected_length:
+
+    if len(vue) != expected_length:
         raise ValueError(
-            f"Invalid data length: expected {expected_length}, got {len(data)}"
+            f"Invalid data length: expected {expected_length}, got {len(vue)}"
         )
-    
-    triangles = []
-    offset = vertices_end + 4
-    
-    for _ in range(num_triangles):
-        i, j, k = struct.unpack('<III', data[offset:offset + 12])
-        
-        # Validate indices
-        if i >= num_vertices or j >= num_vertices or k >= num_vertices:
-            raise ValueError(f"Triangle index out of bounds: ({i}, {j}, {k})")
-        
-        triangles.append((i, j, k))
-        offset += 12
-    
-    return vertices, triangles
 
+    if LITTLE_ENDIAN:
+        indices = vue[vertices_end + 4:].cast('I')
+    else:
+        indices = array('I', vue[vertices_end + 4:].tobytes())
+        indices.byteswap()
+
+    # Validate indices
+    if num_triangles and max(indices) >= num_vertices:
+        position = next(p for p, i in enumerate(indices) if i >= num_vertices) // 3 * 3
+        i, j, k = indices[position:position + 3]
+        raise ValueError(f"Triangle index out of bounds: ({i}, {j}, {k})")
+
+    return vertices, Triangles(vertices, indices)
+
+
+def serialized_triangles_size(
+    vertices: list[Point] | PointSet, triangles: list[Triangle] | Triangles
+) -> int:
+    """Calcule la taille en octets d'une triangulation sérialisée, sans la construire.
+
+    paramétres:
+        vertices: Liste des sommets (points) de la triangulation
+        triangles: Liste des triangles
+
+    Retourne:
+        Le nombre d'octets que produiront serialize_triangles
+        et serialize_triangles_stream.
+    """
+    return 4 + len(vertices) * 8 + 4 + len(triangles) * 12
+
+
+def serialize_triangles_stream(
+    vertices: list[Point] | PointSet,
+    triangles: list[Triangle] | Triangles,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Variante de serialize_triangles qui produit la représentation par morceaux.
+
+    Le bloc des sommets puis celui des triangles sont écrits en morceaux d'au plus
+    chunk_size octets : seul le morceau en cours est alloué, jamais le buffer complet.
+    Les coordonnées sont vérifiées avant le premier morceau, pour qu'une erreur soit
+    levée à l'appel et non au milieu de l'envoi.
+
+    paramétres:
+        vertices: Liste des sommets (points) de la triangulation
+        triangles: Liste des triangles et les indices
+            référencent les sommets dans la liste
+        chunk_size: Taille maximale d'un morceau, en octets
+
+    Retourne:
+        Un itérateur sur les morceaux ; leur concaténation est égale à
+        serialize_triangles(vertices, triangles).
+
+    Raises:
+        OverflowError: Si une coordonnée ne tient pas dans un float 32 bits.
+
+    """
+    coords, en_float32 = _checked_coords(vertices)
+    indices = _little_endian(_uint32_indices(triangles))
+    return _chunks(coords, en_float32, indices, max(chunk_size // 4, 2))
+
+
+def serialize_pointset_stream(
+    points: list[Point] | PointSet, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Variante de serialize_pointset qui produit la représentation par morceaux.
+
+    Les morceaux font au plus chunk_size octets.
+
+    Raises:
+        OverflowError: Si une coordonnée ne tient pas dans un
+            float 32 bits, levée à l'appel.
+
+    """
+    coords, en_float32 = _checked_coords(points)
+    return _chunks(coords, en_float32, None, max(chunk_size // 4, 2))
+
+
+def _checked_coords(points: list[Point] | PointSet) -> tuple[Sequence[float], bool]:
+    """Retourne les coordonnées à plat, et True si elles sont en float32 little-endian.
+
+    Raises:
+        OverflowError: Si une coordonnée ne tient pas dans un float 32 bits.
+
+    """
+    coords = (
+        points.coords
+        if isinstance(points, PointSet)
+        else array('d', (c for point in points for c in point))
+    )
+    en_float32 = LITTLE_ENDIAN and (
+        isinstance(coords, array)
+        and coords.typecode == 'f'
+        or isinstance(coords, memoryview)
+        and coords.format == 'f'
+    )
+    if not en_float32 and coords:
+        plus_grand, plus_petit = max(coords), min(coords)
+        if FLOAT32_MAX < plus_grand < math.inf or -math.inf < plus_petit < -FLOAT32_MAX:
+            raise OverflowError("float too large to pack with f format")
+    return coords, en_float32
+
+
+def _chunks(
+    coords, en_float32: bool, indices: array | None, par_morceau: int
+) -> Iterator[bytes]:
+    """Générateur de serialize_triangles_stream.
+
+    par_morceau est le nombre de valeurs 32 bits par morceau.
+
+    Sans indices, seul le bloc des sommets est produit (serialize_pointset_stream).
+    """
+    # Part 1: Vertices (PointSet format)
+    yield struct.pack('<I', len(coords) // 2)
+    par_morceau -= par_morceau % 2
+    if en_float32:
+        octets = memoryview(coords).cast('B')
+        for debut in range(0, len(octets), par_morceau * 4):
+            yield bytes(octets[debut:debut + par_morceau * 4])
+    else:
+        for debut in range(0, len(coords), par_morceau):
+            morceau = coords[debut:debut + par_morceau]
+            yield struct.Struct(f'<{len(morceau)}f').pack(*morceau)
+    if indices is None:
+        return
+
+    # Part 2: Triangles
+    yield struct.pack('<I', len(indices) // 3)
+    octets = memoryview(indices).cast('B')
+    for debut in range(0, len(octets), par_morceau * 4):
+        yield bytes(octets[debut:debut + par_morceau * 4])
+
+
+def write_file(path: str, chunks: Iterable[bytes]) -> int:
+    """Écrit des morceaux dans un fichier, sans jamais les assembler en mémoire.
+
+    L'écriture passe par un fichier temporaire du même répertoire renommé à la fin : un
+    lecteur ne voit jamais de fichier à moitié écrit.
+
+    parametres:
+        path: Chemin du fichier, remplacé s'il existe.
+        chunks: Morceaux à écrire, par exemple
+            serialize_triangles_stream(vertices, triangles).
+
+    Retourne:
+        Le nombre d'octets écrits.
+    """
+    descripteur, temporaire = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp'
+    )
+    taille = 0
+    try:
+        with os.fdopen(descripteur, 'wb') as fichier:
+            for morceau in chunks:
+                taille += fichier.write(morceau)
+        os.replace(temporaire, path)
+    except BaseException:
+        os.unlink(temporaire)
+        raise
+    return taille
+
+
+def map_file(path: str) -> memoryview:
+    """Projette un fichier en mémoire en lecture seule.
+
+    Les pages sont lues par le système à la demande et peuvent être libérées sous
+    pression mémoire : un fichier bien plus grand que la RAM peut être parcouru.
+    La projection reste valide tant qu'une vue sur elle existe, même après
+    suppression ou remplacement du fichier.
+
+    Retourne:
+        Une vue sur le contenu du fichier (vide si le fichier est vide).
+    """
+    with open(path, 'rb') as fichier:
+        if os.fstat(fichier.fileno()).st_size == 0:
+            return memoryview(b'')
+        return memoryview(mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def write_pointset_file(path: str, points: list[Point] | PointSet) -> int:
+    """Écrit un PointSet au format de serialize_pointset dans un fichier, par morceaux.
+
+    Retourne:
+        Le nombre d'octets écrits.
+    """
+    return write_file(path, serialize_pointset_stream(points))
+
+
+def write_triangles_file(path: str, vertices: list[Point] | PointSet,
+                         triangles: list[Triangle] | Triangles) -> int:
+    """Écrit une triangulation au format de serialize_triangles dans un fichier.
+
+    Les octets sont écrits par morceaux.
+
+    Retourne:
+        Le nombre d'octets écrits.
+    """
+    return write_file(path, serialize_triangles_stream(vertices, triangles))
+
+
+def map_pointset_file(path: str) -> PointSet:
+    """Ouvre un fichier écrit par write_pointset_file sans le charger.
+
+    Sur une machine little-endian, les coordonnées du PointSet retourné sont une vue sur
+    la projection du fichier : seules les pages lues sont chargées.
+
+    Raises:
+        ValueError: Comme deserialize_pointset.
+
+    """
+    return deserialize_pointset(map_file(path))
+
+
+def map_triangles_file(path: str) -> tuple[PointSet, Triangles]:
+    """Ouvre un fichier écrit par write_triangles_file sans le charger.
+
+    Comme pour map_pointset_file, les sommets et les indices sont des vues
+    sur la projection ; la vérification des indices parcourt le fichier une
+    fois sans le garder en mémoire.
+
+    Raises:
+        ValueError: Comme deserialize_triangles.
+
+    """
+    return deserialize_triangles(map_file(path))
+
+
+class BatchResult(NamedTuple):
+    """Résultat d'une entrée d'un lot de triangulations.
+
+    status est le statut HTTP qu'aurait eu la requête seule ; en cas de succès
+    code est vide et data contient la triangulation au format de
+    serialize_triangles, sinon code est le code d'erreur (NOT_FOUND,
+    TRIANGULATION_FAILED, ...) et data le message d'erreur en UTF-8.
+    """
+
+    pointset_id: str
+    status: int
+    code: str
+    data: bytes
+
+
+def serialize_batch_header(count: int) -> bytes:
+    """Retourne l'en-tête d'un lot de résultats : le nombre d'entrées (uint32).
+
+    Chaque entrée suit, dans l'ordre de la demande, au format de serialize_batch_entry.
+    """
+    return struct.pack('<I', count)
+
+
+def serialize_batch_entry(result: BatchResult) -> bytes:
+    """Convertit une entrée d'un lot en format binaire.
+
+    Format : statut (uint16), longueur puis octets ASCII de
+    l'identifiant (uint8), longueur puis octets ASCII du code (uint8),
+    longueur puis octets des données (uint32).
+
+    paramétres:
+        result: Entrée à convertir.
+
+    Retourne:
+        Données binaires de l'entrée.
+    """
+    pointset_id = result.pointset_id.encode('ascii', 'replace')[:255]
+    code = result.code.encode('ascii')
+    return b''.join((
+        struct.pack('<HB', result.status, len(pointset_id)), pointset_id,
+        struct.pack('<B', len(code)), code,
+        struct.pack('<I', len(result.data)), result.data,
+    ))
+
+
+def serialize_batch(results: list[BatchResult]) -> bytes:
+    """Convertit un lot complet de résultats en format binaire."""
+    return b''.join(
+        [serialize_batch_header(len(results))]
+        + [serialize_batch_entry(r) for r in results]
+    )
+
+
+def deserialize_batch(data: bytes) -> list[BatchResult]:
+    """Décode un lot de résultats : c'est l'opération inverse de serialize_batch.
+
+    Les données de chaque entrée sont des vues sur data, sans copie.
+
+    paramétres:
+        data: Données binaires d'un lot de résultats.
+
+    Retourne:
+        La liste des entrées, dans l'ordre.
+    """
+    vue = memoryview(data)
+    if len(vue) < 4:
+        raise ValueError("Data too short to contain entry count")
+    count = struct.unpack_from('<I', vue, 0)[0]
 
+    results = []
+    position = 4
+    try:
+        for _ in range(count):
+            status, longueur = struct.unpack_from('<HB', vue, position)
+            position += 3
+            pointset_id = bytes(vue[position:position + longueur]).decode('ascii')
+            position += longueur
+            longueur = struct.unpack_from('<B', vue, position)[0]
+            code = bytes(vue[position + 1:position + 1 + longueur]).decode('ascii')
+            position += 1 + longueur
+            longueur = struct.unpack_from('<I', vue, position)[0]
+            position += 4
+            if position + longueur > len(vue):
+                raise ValueError("Data too short for entry data")
+            results.append(
+                BatchResult(
+                    pointset_id, status, code, vue[position : position + longueur]
+                )
+            )
+            position += longueur
+    except struct.error:
+        raise ValueError("Data too short for entry header") from None
+
+    if position != len(vue):
+        raise ValueError(f"Invalid data length: expected {position}, got {len(vue)}")
+    return results
+
+
+def _shuffle(coords: memoryview) -> bytes:
+    """Regroupe les octets des coordonnées par plan.
+
+    Les plans se suivent : octet 0 de chaque x, ..., octet 3 de chaque y.
+
+    Les octets de poids fort (signe, exposant) se répètent d'un point à l'autre : une
+    fois regroupés, zlib les compresse bien mieux que les floats entrelacés.
+    """
+    octets = coords.tobytes()
+    return b''.join(octets[plan::8] for plan in range(8))
+
+
+def _unshuffle(plans: bytes) -> bytearray:
+    """Opération inverse de _shuffle."""
+    n = len(plans) // 8
+    octets = bytearray(len(plans))
+    for plan in range(8):
+        octets[plan::8] = plans[plan * n:(plan + 1) * n]
+    return octets
+
+
+def _inflate(data: memoryview, taille: int) -> bytes:
+    """Décompresse un bloc zlib dont la taille décompressée attendue est connue.
+
+    La décompression s'arrête à taille + 1 octets : un bloc qui décompresse plus
+    est refusé sans être développé en mémoire. La limite n'est jamais nulle, car
+    zlib lit 0 comme "sans limite".
+
+    Raises:
+        ValueError: Si le bloc est invalide ou n'a pas la taille attendue.
+
+    """
+    decompresseur = zlib.decompressobj()
+    try:
+        octets = decompresseur.decompress(data, taille + 1)
+    except zlib.error as e:
+        raise ValueError(f"Invalid compressed block: {e}") from e
+    if len(octets) != taille or decompresseur.unconsumed_tail or not decompresseur.eof:
+        raise ValueError(f"Invalid compressed block: expected {taille} bytes")
+    return octets
+
+
+def _varints(valeurs: list[int]) -> bytes:
+    """Code des entiers positifs en varint (7 bits par octet, bit fort = suite)."""
+    if not valeurs or max(valeurs) < 0x80:
+        return bytes(valeurs)
+    octets = bytearray()
+    for valeur in valeurs:
+        while valeur >= 0x80:
+            octets.append(valeur & 0x7f | 0x80)
+            valeur >>= 7
+        octets.append(valeur)
+    return bytes(octets)
+
+
+def _unvarints(octets: bytes) -> list[int]:
+    """Opération inverse de _varints.
+
+    Raises:
+        ValueError: Si le dernier entier est tronqué.
+
+    """
+    if not octets or max(octets) < 0x80:
+        return list(octets)
+    valeurs = []
+    valeur = decalage = 0
+    for octet in octets:
+        valeur |= (octet & 0x7f) << decalage
+        if octet & 0x80:
+            decalage += 7
+        else:
+            valeurs.append(valeur)
+            valeur = decalage = 0
+    if decalage:
+        raise ValueError("Truncated varint")
+    return valeurs
+
+
+def compress_pointset(data: bytes) -> bytes:
+    """Code un PointSet sérialisé (format de serialize_pointset) avec DELTA_ENCODING.
+
+    Format : nombre de points (uint32) puis les coordonnées regroupées par plans
+    d'octets et compressées avec zlib.
+
+    paramétres:
+        data: PointSet au format de serialize_pointset.
+
+    Retourne:
+        Données binaires compressées ; decompress_pointset restitue data à l'identique.
+    """
+    vue = memoryview(data)
+    deserialize_pointset(vue)
+    return b''.join((vue[:4], zlib.compress(_shuffle(vue[4:]), ZLIB_LEVEL)))
+
+
+def decompress_pointset(data: bytes, max_size: int | None = None) -> bytes:
+    """C'est l'opération inverse de compress_pointset.
+
+    parametres:
+        data: PointSet compressé.
+        max_size: Taille maximale du résultat, vérifiée avant de décompresser.
+
+    Retourne:
+        Le PointSet au format de serialize_pointset.
+
+    Raises:
+        ValueError: Si les données sont invalides ou si le résultat dépasse max_size.
+
+    """
+    vue = memoryview(data)
+    if len(vue) < 4:
+        raise ValueError("Data too short to contain point count")
+    taille = struct.unpack_from('<I', vue, 0)[0] * 8
+    if max_size is not None and 4 + taille > max_size:
+        raise ValueError(f"Decompressed size {4 + taille} exceeds {max_size} bytes")
+    return b''.join((vue[:4], _unshuffle(_inflate(vue[4:], taille))))
+
+
+def compress_triangles(data: bytes) -> bytes:
+    """Code une triangulation au format de serialize_triangles avec DELTA_ENCODING.
+
+    Les indices des triangles, pris à la suite, sont remplacés par leur écart avec
+    l'indice précédent : quand les points sont ordonnés dans l'espace ces écarts sont
+    petits, et le codage zigzag + varint les écrit le plus souvent sur un octet. Les
+    varints sont ensuite compressés avec zlib.
+
+    Format : nombre de sommets (uint32), taille (uint32) puis bloc zlib des
+    coordonnées par plans d'octets, nombre de triangles (uint32), taille des
+    varints (uint32) puis leur bloc zlib.
+
+    paramétres:
+        data: Triangulation au format de serialize_triangles.
+
+    Retourne:
+        Données binaires compressées ; decompress_triangles restitue data à l'identique.
+    """
+    vertices, triangles = deserialize_triangles(data)
+    vue = memoryview(data)
+    fin_sommets = 4 + len(vertices) * 8
+    sommets = zlib.compress(_shuffle(vue[4:fin_sommets]), ZLIB_LEVEL)
+
+    indices = triangles.indices
+    ecarts = [
+        i - precedent
+        for i, precedent in zip(indices, chain((0,), indices), strict=False)
+    ]
+    varints = _varints([(ecart << 1) ^ (ecart >> 63) for ecart in ecarts])
+
+    return b''.join(
+        (
+            vue[:4],
+            struct.pack('<I', len(sommets)),
+            sommets,
+            vue[fin_sommets : fin_sommets + 4],
+            struct.pack('<I', len(varints)),
+            zlib.compress(varints, ZLIB_LEVEL),
+        )
+    )
+
+
+def decompress_triangles(data: bytes, max_size: int | None = None) -> bytes:
+    """C'est l'opération inverse de compress_triangles.
+
+    parametres:
+        data: Triangulation compressée.
+        max_size: Taille maximale du résultat, vérifiée avant de décompresser.
+
+    Retourne:
+        La triangulation au format de serialize_triangles.
+
+    Raises:
+        ValueError: Si les données sont invalides ou si le résultat dépasse max_size.
+
+    """
+    vue = memoryview(data)
+    try:
+        num_vertices, taille_sommets = struct.unpack_from('<II', vue, 0)
+        fin_sommets = 8 + taille_sommets
+        num_triangles, taille_varints = struct.unpack_from('<II', vue, fin_sommets)
+    except struct.error:
+        raise ValueError("Data too short for compressed header") from None
+    taille = 8 + num_vertices * 8 + num_triangles * 12
+    if max_size is not None and taille > max_size:
+        raise ValueError(f"Decompressed size {taille} exceeds {max_size} bytes")
+    # un écart zigzag entre deux indices uint32 tient en 1 à 5 octets de varint
+    if not num_triangles * 3 <= taille_varints <= num_triangles * 15:
+        raise ValueError(
+            f"Invalid varint size {taille_varints} for {num_triangles} triangles"
+        )
+
+    coords = _unshuffle(_inflate(vue[8:fin_sommets], num_vertices * 8))
+    zigzags = _unvarints(_inflate(vue[fin_sommets + 8:], taille_varints))
+    if len(zigzags) != num_triangles * 3:
+        raise ValueError(
+            f"Invalid index count: expected {num_triangles * 3}, got {len(zigzags)}"
+        )
+    try:
+        indices = array('I', accumulate((z >> 1) ^ -(z & 1) for z in zigzags))
+    except OverflowError:
+        raise ValueError("Triangle index out of range") from None
+
+    resultat = b''.join((
+        struct.pack('<I', num_vertices), coords,
+        struct.pack('<I', num_triangles), memoryview(_little_endian(indices)),
+    ))
+    # mêmes vérifications que pour le format non compressé (indices hors bornes)
+    deserialize_triangles(resultat)
+    return resultat
+
+
+class TriangulationDelta(NamedTuple):
+    """Différence entre les triangulations de deux versions d'un PointSet.
+
+    Les indices de sommets sont ceux de la triangulation de base, complétés par
+    les sommets ajoutés : le sommet vertices[k] a l'indice base_vertices + k. Un
+    sommet de base absent de la nouvelle version garde son indice mais n'est
+    plus utilisé par aucun triangle.
+    """
+
+    base_vertices: int
+    base_triangles: int
+    vertices: PointSet
+    removed: array
+    triangles: array
+
+
+def serialize_delta(delta: TriangulationDelta) -> bytes:
+    """Convertit une différence de triangulations en format binaire.
+
+    Format : nombre de sommets et de triangles de la base (uint32 chacun), sommets
+    ajoutés au format de serialize_pointset, nombre de triangles supprimés (uint32) puis
+    leurs positions croissantes dans la base (uint32), nombre de triangles ajoutés
+    (uint32) puis leurs indices (uint32).
+
+    paramétres:
+        delta: Différence à convertir.
+
+    Retourne:
+        Données binaires de la différence.
+    """
+    removed = _little_endian(delta.removed)
+    triangles = _little_endian(delta.triangles)
+    return b''.join(
+        (
+            struct.pack('<II', delta.base_vertices, delta.base_triangles),
+            serialize_pointset(delta.vertices),
+            struct.pack('<I', len(removed)),
+            memoryview(removed),
+            struct.pack('<I', len(triangles) // 3),
+            memoryview(triangles),
+        )
+    )
+
+
+def deserialize_delta(data: bytes) -> TriangulationDelta:
+    """C'est l'opération inverse de serialize_delta.
+
+    paramétres:
+        data: Données binaires d'une différence.
+
+    Raises:
+        ValueError: Si les données sont tronquées ou incohérentes.
+
+    """
+    vue = memoryview(data)
+    try:
+        base_vertices, base_triangles, num_vertices = struct.unpack_from('<III', vue, 0)
+        fin_sommets = 12 + num_vertices * 8
+        num_removed = struct.unpack_from('<I', vue, fin_sommets)[0]
+        fin_removed = fin_sommets + 4 + num_removed * 4
+        num_triangles = struct.unpack_from('<I', vue, fin_removed)[0]
+    except struct.error:
+        raise ValueError("Data too short for delta header") from None
+    expected_length = fin_removed + 4 + num_triangles * 12
+    if len(vue) != expected_length:
+        raise ValueError(
+            f"Invalid data length: expected {expected_length}, got {len(vue)}"
+        )
+
+    vertices = deserialize_pointset(vue[8:fin_sommets])
+    removed = array('I', vue[fin_sommets + 4:fin_removed].tobytes())
+    triangles = array('I', vue[fin_removed + 4:].tobytes())
+    if not LITTLE_ENDIAN:
+        removed.byteswap()
+        triangles.byteswap()
+
+    if any(
+        suivante <= position
+        for position, suivante in zip(removed, removed[1:], strict=False)
+    ):
+        raise ValueError("Removed triangle positions must be strictly increasing")
+    if removed and removed[-1] >= base_triangles:
+        raise ValueError(f"Removed triangle position out of bounds: {removed[-1]}")
+    if triangles and max(triangles) >= base_vertices + num_vertices:
+        raise ValueError(f"Triangle index out of bounds: {max(triangles)}")
+    return TriangulationDelta(
+        base_vertices, base_triangles, vertices, removed, triangles
+    )
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Applique une différence (format de serialize_delta) à sa triangulation de base.
+
+    Les triangles conservés gardent leur ordre et sont suivis des triangles ajoutés ;
+    les sommets ajoutés suivent les sommets de la base.
+
+    paramétres:
+        base: Triangulation de base au format de serialize_triangles.
+        delta: Différence calculée à partir de cette base.
+
+    Retourne:
+        La nouvelle triangulation au format de serialize_triangles.
+
+    Raises:
+        ValueError: Si les données sont invalides ou si la
+            différence ne correspond pas à la base.
+
+    """
+    vertices, triangles = deserialize_triangles(base)
+    difference = deserialize_delta(delta)
+    if (difference.base_vertices, difference.base_triangles) != (
+        len(vertices),
+        len(triangles),
+    ):
+        raise ValueError(
+            f"Delta computed for {difference.base_triangles} triangles on "
+            f"{difference.base_vertices} vertices, "
+            f"base has {len(triangles)} triangles on {len(vertices)} vertices"
+        )
+
+    # les triangles conservés sont copiés par plages, entre deux triangles supprimés
+    vue = memoryview(base)
+    debut_triangles = 8 + len(vertices) * 8
+    plages = []
+    debut = 0
+    for position in chain(difference.removed, (len(triangles),)):
+        plages.append(vue[debut_triangles + 12 * debut:debut_triangles + 12 * position])
+        debut = position + 1
+    ajoutes = _little_endian(difference.triangles)
+    return b''.join(
+        [
+            struct.pack('<I', len(vertices) + len(difference.vertices)),
+            vue[4 : 4 + len(vertices) * 8],
+            _float32_coords(difference.vertices),
+            struct.pack(
+                '<I', len(triangles) - len(difference.removed) + len(ajoutes) // 3
+            ),
+        ]
+        + plages
+        + [memoryview(ajoutes)]
+    )
+
+
+def serialize_locations(triangles: array, vertices: array) -> bytes:
+    """Convertit les réponses d'un lot de requêtes de localisation en format binaire.
+
+    Format : nombre de requêtes (uint32), position du triangle qui contient chaque
+    point (int32, -1 hors de l'enveloppe convexe), puis indice du sommet le plus
+    proche de chaque point (uint32).
+
+    paramétres:
+        triangles: Positions des triangles, array('i').
+        vertices: Indices des sommets les plus proches,
+            array('I'), autant que de triangles.
+
+    Retourne:
+        Données binaires des réponses.
+    """
+    if len(triangles) != len(vertices):
+        raise ValueError(
+            "Expected as many vertices as triangles, "
+            f"got {len(vertices)} and {len(triangles)}"
+        )
+    return b''.join(
+        (
+            struct.pack('<I', len(triangles)),
+            memoryview(_little_endian(triangles)),
+            memoryview(_little_endian(vertices)),
+        )
+    )
+
+
+def deserialize_locations(data: bytes) -> tuple[array, array]:
+    """C'est l'opération inverse de serialize_locations.
+
+    Retourne:
+        Les positions des triangles (array('i')) et les indices des sommets
+        les plus proches (array('I')).
+
+    Raises:
+        ValueError: Si la longueur des données ne correspond pas au nombre de requêtes.
+
+    """
+    vue = memoryview(data)
+    if len(vue) < 4:
+        raise ValueError("Data too short")
+    count = struct.unpack_from('<I', vue, 0)[0]
+    expected_length = 4 + count * 8
+    if len(vue) != expected_length:
+        raise ValueError(
+            f"Invalid data length: expected {expected_length}, got {len(vue)}"
+        )
+    triangles = array('i', vue[4:4 + count * 4].tobytes())
+    vertices = array('I', vue[4 + count * 4:].tobytes())
+    if not LITTLE_ENDIAN:
+        triangles.byteswap()
+        vertices.byteswap()
+    return triangles, vertices
+
+
+class VoronoiDiagram(NamedTuple):
+    """Diagramme de Voronoi dual d'une triangulation de Delaunay.
+
+    vertices[t] est le centre du cercle circonscrit du triangle t de la triangulation.
+    La cellule du sommet i de la triangulation est cells[offsets[i]:offsets[i + 1]] :
+    les indices de ses sommets de Voronoi dans le sens trigonométrique. Une cellule de
+    l'enveloppe convexe n'est pas bornée : elle contient une fois VORONOI_INFINITY,
+    entre ses deux demi-droites, qui partent de ses voisins dans la liste et sont
+    perpendiculaires aux arêtes de l'enveloppe, vers l'extérieur. Un sommet qu'aucun
+    triangle n'utilise a une cellule vide.
+    """
+
+    vertices: PointSet
+    offsets: array
+    cells: array
+
+
+def serialize_voronoi(voronoi: VoronoiDiagram) -> bytes:
+    """Convertit un diagramme de Voronoi en format binaire.
+
+    Format : sommets de Voronoi au format de serialize_pointset, nombre de cellules
+    (uint32), début de chaque cellule puis fin de la dernière (uint32), puis indices des
+    sommets de toutes les cellules (uint32).
+
+    paramétres:
+        voronoi: Diagramme à convertir.
+
+    Retourne:
+        Données binaires du diagramme.
+    """
+    offsets = _little_endian(voronoi.offsets)
+    return b''.join(
+        (
+            serialize_pointset(voronoi.vertices),
+            struct.pack('<I', len(offsets) - 1),
+            memoryview(offsets),
+            memoryview(_little_endian(voronoi.cells)),
+        )
+    )
+
+
+def deserialize_voronoi(data: bytes) -> VoronoiDiagram:
+    """C'est l'opération inverse de serialize_voronoi.
+
+    paramétres:
+        data: Données binaires d'un diagramme de Voronoi.
+
+    Raises:
+        ValueError: Si les données sont tronquées ou incohérentes.
+
+    """
+    vue = memoryview(data)
+    try:
+        num_vertices = struct.unpack_from('<I', vue, 0)[0]
+        fin_sommets = 4 + num_vertices * 8
+        num_cells = struct.unpack_from('<I', vue, fin_sommets)[0]
+    except struct.error:
+        raise ValueError("Data too short for Voronoi header") from None
+    fin_offsets = fin_sommets + 4 + (num_cells + 1) * 4
+    if len(vue) < fin_offsets:
+        raise ValueError("Data too short for cell offsets")
+
+    vertices = deserialize_pointset(vue[:fin_sommets])
+    offsets = array('I', vue[fin_sommets + 4:fin_offsets].tobytes())
+    cells = array('I', vue[fin_offsets:].tobytes())
+    if not LITTLE_ENDIAN:
+        offsets.byteswap()
+        cells.byteswap()
+
+    if offsets[0] != 0 or any(
+        fin < debut for debut, fin in zip(offsets, offsets[1:], strict=False)
+    ):
+        raise ValueError("Cell offsets must start at 0 and be non-decreasing")
+    if len(vue) != fin_offsets + offsets[-1] * 4:
+        raise ValueError(
+            "Invalid data length: "
+            f"expected {fin_offsets + offsets[-1] * 4}, got {len(vue)}"
+        )
+    if any(i >= num_vertices and i != VORONOI_INFINITY for i in cells):
+        raise ValueError("Voronoi vertex index out of bounds")
+    return VoronoiDiagram(vertices, offsets, cells)